@@ -0,0 +1,81 @@
+"""
+Benchmarks sending several pages per completion request against one page per request on the PDFs of the shared test corpus, with a live model.
+
+    python -m benchmarks.batching --model gpt-4o-mini --pages-per-request 4
+
+Run from the py_zerox directory, with the model provider's environment variables set.
+For every setting it reports the throughput, the input and output tokens per page, the keyword accuracy (as in the node test script)
+and the share of pages that had to fall back to a request of their own because the response couldn't be split.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+# Package Imports
+from pyzerox import zerox
+
+from .utils import count_keywords, load_corpus
+
+
+async def run_setting(pages_per_request: int, args: argparse.Namespace) -> Dict:
+    documents = load_corpus([".pdf"])
+    pages, fallback_pages, input_tokens, output_tokens, keywords_found, keywords_total = 0, 0, 0, 0, 0, 0
+
+    started_at = time.monotonic()
+    for document in documents:
+        output = await zerox(
+            file_path=document.file_path,
+            model=args.model,
+            concurrency=args.concurrency,
+            pages_per_request=pages_per_request,
+        )
+        pages += len(output.pages)
+        fallback_pages += sum(page.batch_size == 1 for page in output.pages) if pages_per_request > 1 else 0
+        input_tokens += output.input_tokens
+        output_tokens += output.output_tokens
+        found, total = count_keywords(output.pages, document.expected_keywords)
+        keywords_found += found
+        keywords_total += total
+    elapsed = time.monotonic() - started_at
+
+    return {
+        "pages_per_request": pages_per_request,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "input_tokens_per_page": input_tokens / pages if pages else 0.0,
+        "output_tokens_per_page": output_tokens / pages if pages else 0.0,
+        "keyword_accuracy": keywords_found / keywords_total if keywords_total else 0.0,
+        "fallback_rate": fallback_pages / pages if pages else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--pages-per-request", type=int, default=4)
+    args = parser.parse_args()
+
+    results = [await run_setting(pages_per_request, args) for pages_per_request in (1, args.pages_per_request)]
+
+    print(f"{'pages/req':<10}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'in/page':>10}{'out/page':>10}{'keywords':>10}{'fallback':>10}")
+    for result in results:
+        print(
+            f"{result['pages_per_request']:<10}{result['pages']:>8}{result['seconds']:>10.1f}{result['pages_per_second']:>10.2f}"
+            f"{result['input_tokens_per_page']:>10.0f}{result['output_tokens_per_page']:>10.0f}"
+            f"{result['keyword_accuracy']:>10.1%}{result['fallback_rate']:>10.1%}"
+        )
+
+    baseline, batched = results
+    if baseline["input_tokens_per_page"] and baseline["seconds"]:
+        print(
+            f"\ninput tokens saved: {1 - batched['input_tokens_per_page'] / baseline['input_tokens_per_page']:.1%}, "
+            f"time saved: {1 - batched['seconds'] / baseline['seconds']:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
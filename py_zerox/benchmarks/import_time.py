@@ -0,0 +1,98 @@
+"""
+Measures the cold start cost of importing pyzerox, with `python -X importtime` in fresh interpreters.
+
+    python -m benchmarks.import_time --runs 10
+
+Run from the py_zerox directory. Every run imports the statement (by default `from pyzerox import zerox`) in a new interpreter,
+and the time of the imports it triggers is summed from the -X importtime report, leaving out the interpreter's own startup.
+It reports the median import time, the slowest top-level packages and whether any of the heavy dependencies, which should only be
+loaded by the code paths that need them, was imported. It exits with an error if the median is above --max-ms or a heavy
+dependency was imported, so it can guard against regressions in CI. The budget defaults to 150 ms, pass --max-ms 0 to only report.
+"""
+
+import argparse
+import collections
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+## dependencies that are slow to import and only needed by some code paths
+HEAVY_MODULES = ["litellm", "aiohttp", "PyPDF2", "pdf2image", "pypdfium2"]
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def run_importtime(statement: str) -> Tuple[List[Tuple[int, int, int, str]], List[str]]:
+    """
+    Runs a statement in a new interpreter with -X importtime.
+    Returns the (self us, cumulative us, depth, module) entries of the report and the modules loaded afterwards.
+    """
+    script = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")]))}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True, env=environment, check=True
+    )
+
+    entries = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_time), int(cumulative_time), depth, name.strip()))
+    return entries, json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def measure(statement: str, startup_modules: Set[str]) -> Tuple[float, Dict[str, float], List[str]]:
+    """Returns the milliseconds spent importing for the statement, the self time by top-level package and the modules loaded."""
+    entries, modules = run_importtime(statement)
+    ## top-level imports that the interpreter makes on its own (site, encodings, ...) are left out
+    total = sum(cumulative for _, cumulative, depth, name in entries if depth == 0 and name not in startup_modules)
+    by_package: Dict[str, float] = collections.defaultdict(float)
+    for self_time, _, _, name in entries:
+        by_package[name.split(".")[0]] += self_time / 1000
+    return total / 1000, by_package, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statement", default="from pyzerox import zerox", help="import statement to measure")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to measure, the median is reported")
+    parser.add_argument("--max-ms", type=float, default=150, help="exit with an error above this median import time, 0 to disable")
+    parser.add_argument("--allow", action="append", default=[], help="heavy dependency that may be imported, may be repeated")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level packages to list")
+    args = parser.parse_args()
+
+    startup_modules = {name for _, _, depth, name in run_importtime("pass")[0] if depth == 0}
+
+    timings, by_package, modules = [], collections.defaultdict(list), []
+    for _ in range(args.runs):
+        total, run_by_package, modules = measure(args.statement, startup_modules)
+        timings.append(total)
+        for package, package_time in run_by_package.items():
+            by_package[package].append(package_time)
+
+    median = statistics.median(timings)
+    print(f"{args.statement}: median {median:.1f} ms, min {min(timings):.1f} ms, max {max(timings):.1f} ms over {args.runs} runs")
+    print(f"\n{'package':<24}{'self ms':>10}")
+    slowest = sorted(by_package.items(), key=lambda item: statistics.median(item[1]), reverse=True)[: args.top]
+    for package, package_timings in slowest:
+        print(f"{package:<24}{statistics.median(package_timings):>10.1f}")
+
+    loaded_heavy = [module for module in HEAVY_MODULES if module in modules and module not in args.allow]
+    print(f"\nheavy dependencies imported: {', '.join(loaded_heavy) or 'none'}")
+
+    failures = []
+    if loaded_heavy:
+        failures.append(f"{', '.join(loaded_heavy)} imported eagerly")
+    if args.max_ms and median > args.max_ms:
+        failures.append(f"median import time {median:.1f} ms is above {args.max_ms:.1f} ms")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmarks the maintain_format modes against each other on the PDFs of the shared test corpus, with a live model.
+
+    python -m benchmarks.maintain_format --model gpt-4o-mini
+
+Run from the py_zerox directory, with the model provider's environment variables set.
+For every mode it reports the throughput, the keyword accuracy (as in the node test script) and the formatting fidelity:
+how closely the markdown structure of each page (headings, tables, lists) matches the serial mode's output for the same page.
+"""
+
+import argparse
+import asyncio
+import difflib
+import re
+import time
+from typing import Dict, List
+
+# Package Imports
+from pyzerox import zerox
+from pyzerox.constants import MaintainFormatMode
+
+from .utils import count_keywords, load_corpus
+
+MODES = [MaintainFormatMode.SERIAL, MaintainFormatMode.SEED, MaintainFormatMode.CHUNKED]
+
+
+def get_structure(markdown: str) -> List[str]:
+    """Reduces markdown to the sequence of its block types, e.g. ["h1", "table:4", "list", "p"]."""
+    structure = []
+    for line in markdown.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if heading := re.match(r"(#{1,6})\s", line):
+            block = f"h{len(heading.group(1))}"
+        elif line.startswith("|"):
+            block = f"table:{line.strip('|').count('|') + 1}"
+        elif re.match(r"([-*+]|\d+[.)])\s", line):
+            block = "list"
+        else:
+            block = "p"
+        if not structure or structure[-1] != block:
+            structure.append(block)
+    return structure
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict:
+    documents = load_corpus([".pdf"])
+    outputs, pages, keywords_found, keywords_total = {}, 0, 0, 0
+
+    started_at = time.monotonic()
+    for document in documents:
+        output = await zerox(
+            file_path=document.file_path,
+            model=args.model,
+            concurrency=args.concurrency,
+            maintain_format=True,
+            maintain_format_mode=mode,
+        )
+        outputs[document.file_path] = [page.content for page in output.pages]
+        pages += len(output.pages)
+        found, total = count_keywords(output.pages, document.expected_keywords)
+        keywords_found += found
+        keywords_total += total
+    elapsed = time.monotonic() - started_at
+
+    return {
+        "mode": mode,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "keyword_accuracy": keywords_found / keywords_total if keywords_total else 0.0,
+        "outputs": outputs,
+    }
+
+
+def format_fidelity(outputs: Dict[str, List[str]], reference: Dict[str, List[str]]) -> float:
+    """Average similarity of the per-page markdown structure to the reference outputs, 1.0 is identical."""
+    ratios = []
+    for file_path, reference_pages in reference.items():
+        for index, reference_page in enumerate(reference_pages):
+            page = outputs.get(file_path, [])[index] if index < len(outputs.get(file_path, [])) else ""
+            ratios.append(difflib.SequenceMatcher(a=get_structure(reference_page), b=get_structure(page)).ratio())
+    return sum(ratios) / len(ratios) if ratios else 0.0
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [await run_mode(mode, args) for mode in MODES]
+    reference = results[0]["outputs"]
+
+    print(f"{'mode':<10}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'keywords':>10}{'fidelity':>10}")
+    for result in results:
+        print(
+            f"{result['mode']:<10}{result['pages']:>8}{result['seconds']:>10.1f}{result['pages_per_second']:>10.2f}"
+            f"{result['keyword_accuracy']:>10.1%}{format_fidelity(result['outputs'], reference):>10.1%}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
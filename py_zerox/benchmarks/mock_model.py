@@ -0,0 +1,129 @@
+import asyncio
+import random
+from typing import Any, List, Optional, Tuple, Union
+
+# Package Imports
+from pyzerox.constants import BatchingDefaultOptions, Prompts
+from pyzerox.models import BaseModel, CompletionResponse
+
+
+class MockRateLimitError(Exception):
+    """Raised by MockVisionModel for injected rate limits, recognized like a provider's 429 (see is_rate_limit_error)."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited, retry after {retry_after}s")
+        self.litellm_response_headers = {"retry-after-ms": str(retry_after * 1000)}
+
+
+class MockVisionModel(BaseModel):
+    """
+    Stand-in for a vision model that answers every page after a simulated latency, without any network access.
+    Latencies, errors and rate limits are drawn from a seeded random generator, so that runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.2,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.1,
+        input_tokens: int = 1000,
+        output_tokens: int = 300,
+        seed: int = 0,
+    ):
+        """
+        :param latency: The median latency of a completion, in seconds.
+        :type latency: float
+        :param jitter: The spread of the latencies, as the sigma of a log-normal distribution around the median.
+        :type jitter: float
+        :param error_rate: The share of completions that fail with a server error.
+        :type error_rate: float
+        :param rate_limit_rate: The share of completions that fail with a 429 rate limit error.
+        :type rate_limit_rate: float
+        :param retry_after: The retry-after hint of the rate limit errors, in seconds.
+        :type retry_after: float
+        :param input_tokens: The input tokens reported per page.
+        :type input_tokens: int
+        :param output_tokens: The output tokens reported per page.
+        :type output_tokens: int
+        :param seed: The seed of the random generator.
+        :type seed: int
+        """
+        super().__init__(model="mock-vision-model")
+        self.system_prompt = Prompts.DEFAULT_SYSTEM_PROMPT
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    def validate_model(self) -> None:
+        pass
+
+    def validate_access(self) -> None:
+        pass
+
+    async def completion(
+        self,
+        image_path: Optional[str],
+        maintain_format: bool,
+        prior_page: str,
+        image_data: Optional[Union[bytes, memoryview, List[bytes]]] = None,
+        mime_type: str = "image/png",
+    ) -> CompletionResponse:
+        await self._respond(image_path, image_data)
+        return CompletionResponse(
+            content=self._page_markdown(self.requests),
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+        )
+
+    async def completion_pages(
+        self, pages: List[Tuple[Optional[str], Optional[Union[bytes, memoryview, List[bytes]]], str]]
+    ) -> CompletionResponse:
+        for image_path, image_data, _ in pages:
+            await self._read_image(image_path, image_data)
+        await self._respond(None, b"")
+        content = "\n\n".join(
+            f"{BatchingDefaultOptions.PAGE_DELIMITER.format(number)}\n\n{self._page_markdown(self.requests)}"
+            for number in range(1, len(pages) + 1)
+        )
+        return CompletionResponse(
+            content=content,
+            input_tokens=self.input_tokens * len(pages),
+            output_tokens=self.output_tokens * len(pages),
+        )
+
+    async def _respond(self, image_path: Optional[str], image_data: Any) -> None:
+        """Reads the image like a real request would, then waits for the simulated latency or raises an injected error."""
+        self.requests += 1
+        await self._read_image(image_path, image_data)
+        latency = self.latency * self.random.lognormvariate(0, self.jitter) if self.jitter else self.latency
+        draw = self.random.random()
+        if draw < self.rate_limit_rate:
+            # Rate limits are returned right away, as providers do
+            raise MockRateLimitError(self.retry_after)
+        await asyncio.sleep(latency)
+        if draw < self.rate_limit_rate + self.error_rate:
+            raise RuntimeError("Injected server error")
+
+    @staticmethod
+    async def _read_image(image_path: Optional[str], image_data: Any) -> None:
+        if image_data is None and image_path:
+            await asyncio.to_thread(_read_file, image_path)
+
+    @staticmethod
+    def _page_markdown(request: int) -> str:
+        return f"# Page\n\nMock completion {request}."
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
@@ -0,0 +1,152 @@
+"""
+Benchmarks rasterization and scheduling on the PDFs and images of the shared test corpus against a mock vision model, without network access.
+
+    python -m benchmarks.offline --latency 0.5 --error-rate 0.02 --rate-limit-rate 0.05
+
+Run from the py_zerox directory, with poppler installed. The model answers every page after a seeded, log-normally distributed latency,
+and fails a share of the requests with server errors or 429 rate limits, so that runs are reproducible and comparable across commits.
+It reports the throughput, the p50 and p99 page latency, the peak RSS of the process and of the poppler subprocesses
+and the peak size of the temporary directory. With --min-pages-per-second it exits with an error below that throughput,
+to catch performance regressions in CI.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict
+
+# Package Imports
+from pyzerox import AdaptiveConcurrencyLimiter, zerox
+from pyzerox.constants import PageStatus
+
+from .mock_model import MockVisionModel
+from .utils import DOCUMENT_EXTENSIONS, load_corpus, percentile
+
+
+def get_directory_size(directory: str) -> int:
+    """Returns the total size in bytes of the files in a directory and its subdirectories."""
+    size = 0
+    for root, _, files in os.walk(directory):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                # Temporary files come and go while the directory is walked
+                pass
+    return size
+
+
+def get_peak_rss(who: int) -> int:
+    """Returns the peak resident set size in bytes of the process (RUSAGE_SELF) or of its largest finished subprocess (RUSAGE_CHILDREN)."""
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict:
+    documents = load_corpus(DOCUMENT_EXTENSIONS)
+    model = MockVisionModel(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    concurrency = AdaptiveConcurrencyLimiter(initial_limit=args.concurrency) if args.adaptive else args.concurrency
+
+    page_latencies, pages, failed_pages = [], 0, 0
+    peak_temp_bytes = 0
+
+    with tempfile.TemporaryDirectory() as temp_root:
+        temp_dir = os.path.join(temp_root, "zerox")
+
+        async def sample_temp_directory():
+            nonlocal peak_temp_bytes
+            while True:
+                peak_temp_bytes = max(peak_temp_bytes, await asyncio.to_thread(get_directory_size, temp_root))
+                await asyncio.sleep(args.sample_interval)
+
+        sampler = asyncio.create_task(sample_temp_directory())
+        started_at = time.monotonic()
+        try:
+            for _ in range(args.runs):
+                for document in documents:
+                    output = await zerox(
+                        file_path=document.file_path,
+                        model=model,
+                        concurrency=concurrency,
+                        in_memory=not args.on_disk,
+                        pages_per_request=args.pages_per_request,
+                        temp_dir=temp_dir,
+                    )
+                    pages += len(output.pages)
+                    failed_pages += sum(page.status == PageStatus.FAILED for page in output.pages)
+                    page_latencies.extend(page.latency for page in output.pages)
+        finally:
+            elapsed = time.monotonic() - started_at
+            sampler.cancel()
+
+    return {
+        "documents": len(documents) * args.runs,
+        "pages": pages,
+        "failed_pages": failed_pages,
+        "requests": model.requests,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "p50_page_latency_ms": percentile(page_latencies, 0.5),
+        "p99_page_latency_ms": percentile(page_latencies, 0.99),
+        "peak_rss_bytes": get_peak_rss(resource.RUSAGE_SELF),
+        "peak_child_rss_bytes": get_peak_rss(resource.RUSAGE_CHILDREN),
+        "peak_temp_bytes": peak_temp_bytes,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="median model latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="sigma of the log-normal latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with a server error")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests failing with a 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="retry-after hint of the 429s in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--adaptive", action="store_true", help="use an AdaptiveConcurrencyLimiter starting at --concurrency")
+    parser.add_argument("--pages-per-request", type=int, default=1)
+    parser.add_argument("--on-disk", action="store_true", help="write page images to the temp directory (in_memory=False)")
+    parser.add_argument("--runs", type=int, default=1, help="how many times the corpus is processed")
+    parser.add_argument("--sample-interval", type=float, default=0.05, help="seconds between temp directory size samples")
+    parser.add_argument("--min-pages-per-second", type=float, default=None, help="exit with an error below this throughput")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    result = await run_benchmark(args)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'documents':<24}{result['documents']:>12}")
+        print(f"{'pages':<24}{result['pages']:>12}")
+        print(f"{'failed pages':<24}{result['failed_pages']:>12}")
+        print(f"{'model requests':<24}{result['requests']:>12}")
+        print(f"{'seconds':<24}{result['seconds']:>12.2f}")
+        print(f"{'pages/s':<24}{result['pages_per_second']:>12.2f}")
+        print(f"{'p50 page latency (ms)':<24}{result['p50_page_latency_ms']:>12.0f}")
+        print(f"{'p99 page latency (ms)':<24}{result['p99_page_latency_ms']:>12.0f}")
+        print(f"{'peak RSS (MiB)':<24}{result['peak_rss_bytes'] / 2**20:>12.1f}")
+        print(f"{'peak poppler RSS (MiB)':<24}{result['peak_child_rss_bytes'] / 2**20:>12.1f}")
+        print(f"{'peak temp disk (MiB)':<24}{result['peak_temp_bytes'] / 2**20:>12.1f}")
+
+    if args.min_pages_per_second is not None and result["pages_per_second"] < args.min_pages_per_second:
+        sys.exit(
+            f"Throughput regression: {result['pages_per_second']:.2f} pages/s is below {args.min_pages_per_second:.2f} pages/s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Benchmarks rasterizing PDFs in parallel worker processes against rendering them in a single worker thread, without a model.
+
+    python -m benchmarks.rasterize --workers 8 --file scan.pdf
+
+Run from the py_zerox directory, with poppler installed. Without --file, the PDFs of the shared test corpus are used.
+Pages are consumed as fast as they are produced, so the results measure rasterization (and encoding) alone.
+The process pool is started before timing, as it is started once and shared by every document in a long-running worker.
+For every setting it reports the throughput and the speedup over a single worker.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# Package Imports
+from pyzerox.constants import PDFConversionDefaultOptions
+from pyzerox.processor import ImageEncoding, iter_pdf_images
+from pyzerox.processor.rasterize import get_process_pool, resolve_rasterize_workers
+
+from .utils import load_corpus
+
+
+async def run_setting(workers: Optional[int], file_paths: List[str], args: argparse.Namespace) -> Dict:
+    encoding = ImageEncoding(format=args.encoding) if args.encoding else None
+    pages = 0
+
+    started_at = time.monotonic()
+    for _ in range(args.runs):
+        for file_path in file_paths:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                async for _ in iter_pdf_images(
+                    image_density=args.dpi,
+                    image_height=PDFConversionDefaultOptions.SIZE,
+                    local_path=file_path,
+                    temp_dir=temp_dir,
+                    in_memory=not args.on_disk,
+                    encoding=encoding,
+                    workers=workers,
+                ):
+                    pages += 1
+    elapsed = time.monotonic() - started_at
+
+    return {
+        "workers": resolve_rasterize_workers(workers),
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", action="append", help="PDF to rasterize, may be repeated (defaults to the shared corpus)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes to compare against 1 (defaults to one per CPU)")
+    parser.add_argument("--dpi", type=int, default=PDFConversionDefaultOptions.DPI)
+    parser.add_argument("--encoding", choices=["png", "jpeg", "webp"], default=None, help="encode pages with ImageEncoding")
+    parser.add_argument("--on-disk", action="store_true", help="write page images to a temp directory (in_memory=False)")
+    parser.add_argument("--runs", type=int, default=1, help="how many times the files are rasterized")
+    args = parser.parse_args()
+
+    file_paths = args.file or [document.file_path for document in load_corpus([".pdf"])]
+    workers = resolve_rasterize_workers(args.workers)
+
+    # Start the worker processes before timing
+    if workers > 1:
+        pool = get_process_pool(workers)
+        await asyncio.gather(*(asyncio.wrap_future(pool.submit(int)) for _ in range(workers)))
+
+    results = [await run_setting(setting, file_paths, args) for setting in (1, workers)]
+
+    print(f"{'workers':<10}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'speedup':>10}")
+    baseline = results[0]["seconds"]
+    for result in results:
+        speedup = baseline / result["seconds"] if result["seconds"] else 0.0
+        print(
+            f"{result['workers']:<10}{result['pages']:>8}{result['seconds']:>10.2f}"
+            f"{result['pages_per_second']:>10.2f}{speedup:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
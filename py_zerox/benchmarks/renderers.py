@@ -0,0 +1,109 @@
+"""
+Benchmarks the PDF renderers against each other on the same files, without a model.
+
+    python -m benchmarks.renderers --renderer poppler --renderer pdfium --file scan.pdf
+
+Run from the py_zerox directory. Without --renderer, poppler and pdfium are compared, and renderers that can't run here
+(poppler not installed, pypdfium2 not installed) are reported as unavailable. Without --file, the PDFs of the shared test corpus are used.
+Pages are consumed as fast as they are produced, so the results measure rasterization (and encoding) alone.
+For every renderer it reports the throughput, the median time to the first page of a file and the output sizes,
+along with the speedup over the first renderer.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+# Package Imports
+from pyzerox.constants import PDFConversionDefaultOptions, PDFRenderer
+from pyzerox.processor import ImageEncoding, get_pdf_page_count, iter_pdf_images
+from pyzerox.processor.rasterize import get_process_pool, resolve_rasterize_workers
+
+from .utils import load_corpus
+
+
+async def run_renderer(renderer: str, file_paths: List[str], args: argparse.Namespace) -> Dict:
+    encoding = ImageEncoding(format=args.encoding) if args.encoding else None
+    pages, image_bytes = 0, 0
+    first_page_times: List[float] = []
+
+    started_at = time.monotonic()
+    for _ in range(args.runs):
+        for file_path in file_paths:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_started_at, first_page = time.monotonic(), True
+                async for image in iter_pdf_images(
+                    image_density=args.dpi,
+                    image_height=PDFConversionDefaultOptions.SIZE,
+                    local_path=file_path,
+                    temp_dir=temp_dir,
+                    in_memory=not args.on_disk,
+                    encoding=encoding,
+                    workers=args.workers,
+                    renderer=renderer,
+                ):
+                    if first_page:
+                        first_page_times.append((time.monotonic() - file_started_at) * 1000)
+                        first_page = False
+                    pages += 1
+                    if isinstance(image, (bytes, memoryview)):
+                        image_bytes += len(image)
+    elapsed = time.monotonic() - started_at
+
+    return {
+        "renderer": renderer,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "first_page_ms": statistics.median(first_page_times) if first_page_times else 0.0,
+        "average_kb": image_bytes / pages / 1024 if pages and image_bytes else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renderer", action="append", help="renderer to compare, may be repeated (defaults to poppler and pdfium)")
+    parser.add_argument("--file", action="append", help="PDF to rasterize, may be repeated (defaults to the shared corpus)")
+    parser.add_argument("--workers", type=int, default=PDFConversionDefaultOptions.RASTERIZE_WORKERS, help="rasterization worker processes")
+    parser.add_argument("--dpi", type=int, default=PDFConversionDefaultOptions.DPI)
+    parser.add_argument("--encoding", choices=["png", "jpeg", "webp"], default=None, help="encode pages with ImageEncoding")
+    parser.add_argument("--on-disk", action="store_true", help="write page images to a temp directory (in_memory=False)")
+    parser.add_argument("--runs", type=int, default=1, help="how many times the files are rasterized")
+    args = parser.parse_args()
+
+    file_paths = args.file or [document.file_path for document in load_corpus([".pdf"])]
+    renderers = args.renderer or [PDFRenderer.POPPLER, PDFRenderer.PDFIUM]
+    workers = resolve_rasterize_workers(args.workers)
+
+    # Start the worker processes before timing
+    if workers > 1:
+        pool = get_process_pool(workers)
+        await asyncio.gather(*(asyncio.wrap_future(pool.submit(int)) for _ in range(workers)))
+
+    results, unavailable = [], {}
+    for renderer in renderers:
+        try:
+            # Also warms up the renderer (imports, page count cache) before timing
+            get_pdf_page_count(file_paths[0], renderer)
+        except Exception as error:
+            unavailable[renderer] = error
+            continue
+        results.append(await run_renderer(renderer, file_paths, args))
+
+    print(f"{'renderer':<12}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'first ms':>10}{'avg KB':>10}{'speedup':>10}")
+    baseline = results[0]["seconds"] if results else 0.0
+    for result in results:
+        speedup = baseline / result["seconds"] if result["seconds"] else 0.0
+        print(
+            f"{result['renderer']:<12}{result['pages']:>8}{result['seconds']:>10.2f}{result['pages_per_second']:>10.2f}"
+            f"{result['first_page_ms']:>10.1f}{result['average_kb']:>10.1f}{speedup:>10.2f}"
+        )
+    for renderer, error in unavailable.items():
+        print(f"{renderer:<12}unavailable: {str(error).strip()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
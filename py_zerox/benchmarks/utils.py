@@ -0,0 +1,57 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Package Imports
+from pyzerox.core.types import Page
+
+SHARED_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "shared")
+INPUT_DIR = os.path.join(SHARED_DIR, "inputs")
+TEST_JSON_PATH = os.path.join(SHARED_DIR, "test.json")
+# Every input zerox reads: PDFs, and images that are sent without PDF conversion
+DOCUMENT_EXTENSIONS = [".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff"]
+
+
+@dataclass
+class CorpusDocument:
+    """
+    Dataclass to store a document of the shared test corpus and the keywords expected on each of its pages.
+    """
+
+    file_path: str
+    expected_keywords: List[List[str]]
+
+
+def load_corpus(extensions: Optional[List[str]] = None) -> List[CorpusDocument]:
+    """Loads the documents of the shared test corpus (shared/test.json) that exist in shared/inputs, optionally filtered by extension."""
+    with open(TEST_JSON_PATH, "r", encoding="utf-8") as test_file:
+        test_inputs = json.load(test_file)
+
+    documents = []
+    for test_input in test_inputs:
+        file_path = os.path.join(INPUT_DIR, test_input["file"])
+        if not os.path.exists(file_path):
+            continue
+        if extensions and os.path.splitext(file_path)[1].lower() not in extensions:
+            continue
+        documents.append(CorpusDocument(file_path=file_path, expected_keywords=test_input["expectedKeywords"]))
+    return documents
+
+
+def count_keywords(pages: List[Page], expected_keywords: List[List[str]]) -> tuple[int, int]:
+    """Counts the expected keywords found in the pages, returns (found, total). Same matching as the node test script."""
+    found, total = 0, 0
+    for index, keywords in enumerate(expected_keywords):
+        content = pages[index].content.lower() if index < len(pages) else ""
+        found += sum(keyword.lower() in content for keyword in keywords)
+        total += len(keywords)
+    return found, total
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the given percentile (0-1) of the values, by the nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
@@ -1,10 +1,39 @@
-from .core import zerox
+import importlib
+
 from .constants.prompts import Prompts
 
 DEFAULT_SYSTEM_PROMPT = Prompts.DEFAULT_SYSTEM_PROMPT
 
+## the API is imported on first use, so that `import pyzerox` (e.g. for the constants) doesn't load the processing pipeline
+_lazy_attributes = {
+    "zerox": ".core",
+    "zerox_stream": ".core",
+    "zerox_batch": ".core",
+    "AdaptiveConcurrencyLimiter": ".processor",
+    "ImageEncoding": ".processor",
+    "PageFilter": ".processor",
+    "HedgingPolicy": ".processor",
+    "MetricsHook": ".metrics",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "zerox",
+    "zerox_stream",
+    "zerox_batch",
     "Prompts",
+    "AdaptiveConcurrencyLimiter",
+    "ImageEncoding",
+    "PageFilter",
+    "HedgingPolicy",
+    "MetricsHook",
     "DEFAULT_SYSTEM_PROMPT",
 ]
@@ -0,0 +1,11 @@
+from .base import BaseCache
+from .directory import DirectoryCache
+from .sqlite import SQLiteCache
+from .utils import make_cache_key
+
+__all__ = [
+    "BaseCache",
+    "DirectoryCache",
+    "SQLiteCache",
+    "make_cache_key",
+]
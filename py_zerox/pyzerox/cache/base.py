@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..models import CompletionResponse
+
+
+class BaseCache(ABC):
+    """
+    Base class for all completion caches.
+    """
+
+    @abstractmethod
+    async def get(
+        self,
+        key: str,
+    ) -> Optional["CompletionResponse"]:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        response: "CompletionResponse",
+    ) -> None:
+        raise NotImplementedError("Subclasses must implement this method")
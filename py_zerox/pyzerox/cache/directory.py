@@ -0,0 +1,111 @@
+import asyncio
+import os
+import threading
+import uuid
+from typing import Optional
+
+# Package Imports
+from .base import BaseCache
+from .utils import encode_response, decode_response
+from ..constants import CacheDefaultOptions
+from ..models import CompletionResponse
+
+
+class DirectoryCache(BaseCache):
+    """
+    Completion cache storing one JSON file per entry under a directory.
+    Least recently used entries (by file modification time) are evicted once the directory grows past max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size_bytes: int = CacheDefaultOptions.MAX_SIZE_BYTES,
+    ):
+        """
+        :param directory: The directory to store cache entries in, created if missing.
+        :type directory: str
+        :param max_size_bytes: The maximum total size of the cache entries, defaults to CacheDefaultOptions.MAX_SIZE_BYTES
+        :type max_size_bytes: int, optional
+        """
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+
+        ## total size of the entries, computed lazily on the first write
+        self._size_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+
+    async def get(self, key: str) -> Optional[CompletionResponse]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, response: CompletionResponse) -> None:
+        await asyncio.to_thread(self._set, key, response)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _get(self, key: str) -> Optional[CompletionResponse]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry:
+                data = entry.read()
+            # bump the modification time to mark the entry as recently used
+            os.utime(entry_path)
+            return decode_response(data)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _set(self, key: str, response: CompletionResponse) -> None:
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # write to a temporary file first so that concurrent readers never see a partial entry
+        data = encode_response(response).encode("utf-8")
+        temp_path = f"{entry_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as entry:
+            entry.write(data)
+
+        with self._lock:
+            # an existing entry for the key is replaced, its size no longer counts
+            try:
+                replaced_size = os.stat(entry_path).st_size
+            except OSError:
+                replaced_size = 0
+            os.replace(temp_path, entry_path)
+
+            if self._size_bytes is None:
+                self._size_bytes = sum(size for _, size, _ in self._list_entries())
+            else:
+                self._size_bytes += len(data) - replaced_size
+
+            if self._size_bytes > self.max_size_bytes:
+                self._evict()
+
+    def _list_entries(self):
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, file_name))
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, os.path.join(root, file_name)
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the cache fits in max_size_bytes."""
+        entries = sorted(self._list_entries())
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, entry_path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(entry_path)
+                total_size -= size
+            except OSError:
+                pass
+
+        self._size_bytes = total_size
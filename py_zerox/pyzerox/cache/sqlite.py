@@ -0,0 +1,95 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Package Imports
+from .base import BaseCache
+from .utils import encode_response, decode_response
+from ..constants import CacheDefaultOptions
+from ..models import CompletionResponse
+
+
+class SQLiteCache(BaseCache):
+    """
+    Completion cache backed by a single SQLite database file.
+    Least recently used entries are evicted once the stored completions grow past max_size_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size_bytes: int = CacheDefaultOptions.MAX_SIZE_BYTES,
+    ):
+        """
+        :param path: Path to the SQLite database file, created if missing.
+        :type path: str
+        :param max_size_bytes: The maximum total size of the cached completions, defaults to CacheDefaultOptions.MAX_SIZE_BYTES
+        :type max_size_bytes: int, optional
+        """
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)"
+            )
+
+    async def get(self, key: str) -> Optional[CompletionResponse]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, response: CompletionResponse) -> None:
+        await asyncio.to_thread(self._set, key, response)
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> Optional[CompletionResponse]:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE completions SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        try:
+            return decode_response(row[0])
+        except (ValueError, KeyError):
+            return None
+
+    def _set(self, key: str, response: CompletionResponse) -> None:
+        value = encode_response(response)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), time.time()),
+            )
+            (total_size,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM completions"
+            ).fetchone()
+            if total_size > self.max_size_bytes:
+                self._evict(total_size)
+
+    def _evict(self, total_size: int) -> None:
+        """Removes least recently used entries until the cache fits in max_size_bytes. Expects the lock to be held."""
+        evicted_keys = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM completions ORDER BY last_access"
+        ):
+            if total_size <= self.max_size_bytes:
+                break
+            evicted_keys.append((key,))
+            total_size -= size
+
+        self._connection.executemany("DELETE FROM completions WHERE key = ?", evicted_keys)
@@ -0,0 +1,72 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Union
+
+# Package Imports
+from ..constants import CacheDefaultOptions
+from ..models import CompletionResponse
+
+
+def make_cache_key(
+    image_data: Union[bytes, List[bytes]],
+    model: str,
+    system_prompt: str,
+    prior_page: str,
+    kwargs: Dict[str, Any],
+) -> str:
+    """
+    Builds a content-addressed cache key for a page completion.
+
+    :param image_data: The rendered page image bytes, or its tiles.
+    :type image_data: bytes or List[bytes]
+    :param model: The model name.
+    :type model: str
+    :param system_prompt: The system prompt sent with the page.
+    :type system_prompt: str
+    :param prior_page: The markdown of the previous page passed as context.
+    :type prior_page: str
+    :param kwargs: The model kwargs, credentials and transport settings are ignored.
+    :type kwargs: Dict[str, Any]
+    :return: Hex digest identifying the completion.
+    """
+    relevant_kwargs = {
+        name: value
+        for name, value in kwargs.items()
+        if name not in CacheDefaultOptions.IGNORED_KWARGS
+    }
+
+    if isinstance(image_data, list):
+        digest = hashlib.sha256()
+        for tile in image_data:
+            digest.update(len(tile).to_bytes(8, "big"))
+            digest.update(tile)
+    else:
+        digest = hashlib.sha256(image_data)
+    for part in (model, system_prompt, prior_page, json.dumps(relevant_kwargs, sort_keys=True, default=str)):
+        # Length prefix each part so that different splits of the same text can't collide
+        encoded = (part or "").encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+def encode_response(response: CompletionResponse) -> str:
+    """Serializes a completion response for storage in a cache backend."""
+    return json.dumps(
+        {
+            "content": response.content,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+        }
+    )
+
+
+def decode_response(data: str) -> CompletionResponse:
+    """Deserializes a completion response stored by encode_response, marking it as a cache hit."""
+    payload = json.loads(data)
+    return CompletionResponse(
+        content=payload["content"],
+        input_tokens=payload["input_tokens"],
+        output_tokens=payload["output_tokens"],
+        cache_hit=True,
+    )
@@ -1,9 +1,46 @@
-from .conversion import PDFConversionDefaultOptions
+from .batching import BatchingDefaultOptions
+from .cache import CacheDefaultOptions
+from .checkpoint import CheckpointDefaultOptions
+from .concurrency import ConcurrencyDefaultOptions
+from .conversion import PDFConversionDefaultOptions, PDFRenderer
+from .download import DownloadDefaultOptions
+from .encoding import ImageEncodingDefaultOptions
+from .filter import PageFilterDefaultOptions
+from .format import MaintainFormatMode, MaintainFormatDefaultOptions
+from .hedging import HedgingDefaultOptions
+from .input import InputFileType, ImageInputDefaultOptions
 from .messages import Messages
+from .metrics import MetricsStage
+from .models import ModelBackend, OpenAICompatibleDefaultOptions
+from .prompt_caching import PromptCachingDefaultOptions
 from .prompts import Prompts
+from .retry import RetryDefaultOptions, PageStatus
+from .text_layer import TextLayerDefaultOptions
+from .validation import ValidationDefaultOptions
 
 __all__ = [
+    "BatchingDefaultOptions",
+    "CacheDefaultOptions",
+    "CheckpointDefaultOptions",
+    "ConcurrencyDefaultOptions",
     "PDFConversionDefaultOptions",
+    "PDFRenderer",
+    "DownloadDefaultOptions",
+    "ImageEncodingDefaultOptions",
+    "PageFilterDefaultOptions",
+    "MaintainFormatMode",
+    "MaintainFormatDefaultOptions",
+    "HedgingDefaultOptions",
+    "InputFileType",
+    "ImageInputDefaultOptions",
     "Messages",
+    "MetricsStage",
+    "ModelBackend",
+    "OpenAICompatibleDefaultOptions",
+    "PromptCachingDefaultOptions",
     "Prompts",
+    "RetryDefaultOptions",
+    "PageStatus",
+    "TextLayerDefaultOptions",
+    "ValidationDefaultOptions",
 ]
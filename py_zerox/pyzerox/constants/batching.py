@@ -0,0 +1,8 @@
+class BatchingDefaultOptions:
+    """Default options for sending several pages in one completion request"""
+
+    # Pages per completion request, 1 sends every page on its own
+    PAGES_PER_REQUEST = 1
+
+    # Precedes every page image of a multi-page request, and the page's markdown in the response
+    PAGE_DELIMITER = "<<<PAGE {0}>>>"
@@ -0,0 +1,25 @@
+class CacheDefaultOptions:
+    """Default options for the completion cache"""
+
+    # Upper bound on the total size of cached completions before least recently used entries are evicted
+    MAX_SIZE_BYTES = 512 * 1024 * 1024
+
+    # Model kwargs that don't affect the completion itself (credentials, endpoints, transport settings) and are left out of the cache key
+    IGNORED_KWARGS = (
+        "api_key",
+        "api_base",
+        "base_url",
+        "api_version",
+        "azure_ad_token",
+        "aws_access_key_id",
+        "aws_secret_access_key",
+        "aws_session_token",
+        "aws_region_name",
+        "vertex_credentials",
+        "vertex_project",
+        "vertex_location",
+        "timeout",
+        "num_retries",
+        "max_retries",
+        "metadata",
+    )
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+
+class CheckpointDefaultOptions:
+    """Default options for resumable jobs"""
+
+    # Where job manifests are kept, outside of the temp_dir that is cleared on every run
+    DIRECTORY = os.path.join(tempfile.gettempdir(), "zerox-checkpoints")
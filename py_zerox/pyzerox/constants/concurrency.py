@@ -0,0 +1,26 @@
+class ConcurrencyDefaultOptions:
+    """Default options for the adaptive concurrency limiter"""
+
+    # Documents downloaded and rasterized at the same time by zerox_batch
+    MAX_DOCUMENTS = 4
+
+    MIN_LIMIT = 1
+    MAX_LIMIT = 64
+
+    # Multiplicative decrease applied to the limit on a rate limit or overload error
+    DECREASE_FACTOR = 0.5
+
+    # A request is considered healthy while its latency stays within this factor of the baseline latency
+    LATENCY_TOLERANCE = 2.0
+
+    # Smoothing factor of the exponentially weighted baseline latency and tokens per request
+    SMOOTHING = 0.1
+
+    # How many times a page is retried after a rate limit or overload error before giving up
+    MAX_RATE_LIMIT_RETRIES = 5
+
+    # Seconds to pause when the provider doesn't send a retry-after hint, doubled on each consecutive retry
+    DEFAULT_RETRY_AFTER = 1.0
+
+    # HTTP status codes treated as rate limit or overload errors
+    RATE_LIMIT_STATUS_CODES = (429, 503, 529)
@@ -1,3 +1,12 @@
+class PDFRenderer:
+    """PDF renderers that can be selected by name with renderer, see register_renderer for custom ones"""
+
+    # poppler's pdftoppm/pdftocairo through pdf2image, a subprocess per conversion
+    POPPLER = "poppler"
+    # PDFium in process through pypdfium2 (the pdfium extra), without a subprocess or temporary files
+    PDFIUM = "pdfium"
+
+
 class PDFConversionDefaultOptions:
     """Default options for converting PDFs to images"""
 
@@ -5,4 +14,22 @@ class PDFConversionDefaultOptions:
     FORMAT = "png"
     SIZE = (None, 1056)
     THREAD_COUNT = 4
+    # Processes rendering pages in parallel, None for one per available CPU. With 1 pages are rendered in a worker thread
+    RASTERIZE_WORKERS = 1
+    # Poppler processes per conversion in a rasterization worker process, the workers themselves render in parallel
+    WORKER_THREAD_COUNT = 1
     USE_PDFTOCAIRO = True
+    # Renderer used to rasterize pages, one of PDFRenderer
+    RENDERER = PDFRenderer.POPPLER
+    # Pages rasterized per pdf2image call when pipelining conversion with model calls.
+    # The first chunk is always a single page so that the first request goes out as early as possible.
+    CHUNK_SIZE = 8
+
+    # Pages rendered ahead of the model calls, bounds memory use when page images are kept in memory
+    PREFETCH_PAGES = 16
+
+    # Keep rendered pages in memory as encoded bytes instead of writing them to the temp directory
+    IN_MEMORY = True
+
+    # Page counts of recently opened PDFs kept in memory, so that a file isn't parsed again for it
+    PAGE_COUNT_CACHE_SIZE = 256
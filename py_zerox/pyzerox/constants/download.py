@@ -0,0 +1,16 @@
+class DownloadDefaultOptions:
+    """Default options for downloading input files"""
+
+    # Bytes read from the response and written to disk at a time
+    CHUNK_SIZE = 1024 * 1024
+
+    # Downloads larger than this are aborted, None for no limit
+    MAX_SIZE_BYTES = 1024 * 1024 * 1024
+
+    # Connection pool of the shared HTTP session
+    CONNECTION_LIMIT = 100
+    CONNECTION_LIMIT_PER_HOST = 10
+
+    # Seconds to wait for a connection and between reads, large files may take longer than this in total
+    CONNECT_TIMEOUT = 30
+    READ_TIMEOUT = 60
@@ -0,0 +1,27 @@
+class ImageEncodingDefaultOptions:
+    """Default options for encoding page images before they are sent to the model"""
+
+    FORMAT = "png"
+    # Quality for the lossy formats (jpeg, webp), 1-100
+    QUALITY = 85
+
+    # Largest image, in pixels, that providers use as is. Larger images are downscaled on their side, so the extra pixels only cost upload time.
+    # Matched against the lowercased model name in order, the first match wins.
+    MAX_PIXELS_BY_MODEL = (
+        ("gpt-4o", 768 * 1024),
+        ("gpt-4.1", 768 * 1024),
+        ("claude", 1_150_000),
+        ("anthropic", 1_150_000),
+    )
+
+    # Rows shared by neighbouring tiles, so that a line of text cut by a tile boundary is complete in one of them
+    TILE_OVERLAP = 32
+    # Pages needing more tiles than this are downscaled to fit
+    MAX_TILES = 4
+
+    MIME_TYPES = {
+        "png": "image/png",
+        "jpeg": "image/jpeg",
+        "jpg": "image/jpeg",
+        "webp": "image/webp",
+    }
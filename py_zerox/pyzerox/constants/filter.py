@@ -0,0 +1,15 @@
+class PageFilterDefaultOptions:
+    """Default options for detecting blank and near-duplicate pages before they are sent to the model"""
+
+    # Pages are compared on a grayscale thumbnail of this size, which also smooths out scanner noise
+    THUMBNAIL_SIZE = (128, 160)
+
+    # Pages whose thumbnail has a pixel standard deviation below this are blank
+    BLANK_STDDEV = 4.0
+
+    # Width and height of the difference hash, giving HASH_SIZE^2 bits
+    HASH_SIZE = 16
+    # Pages whose hashes differ in at most this many bits are compared pixel by pixel
+    MAX_HASH_DISTANCE = 6
+    # Candidates are duplicates when the mean absolute difference of their thumbnails is below this
+    MAX_PIXEL_DIFFERENCE = 1.5
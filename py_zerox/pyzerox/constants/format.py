@@ -0,0 +1,16 @@
+class MaintainFormatMode:
+    """How pages are given the markdown of other pages as formatting context when maintain_format is set"""
+
+    # Every page waits for the page before it
+    SERIAL = "serial"
+    # The first SEED_PAGES pages are processed in order, then all the other pages in parallel against them
+    SEED = "seed"
+    # Pages are processed in parallel chunks of CHUNK_SIZE pages, each against the last page of the chunk before it
+    CHUNKED = "chunked"
+
+
+class MaintainFormatDefaultOptions:
+    """Default options for the parallel maintain_format modes"""
+
+    SEED_PAGES = 1
+    CHUNK_SIZE = 8
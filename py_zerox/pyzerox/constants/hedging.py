@@ -0,0 +1,13 @@
+class HedgingDefaultOptions:
+    """Default options for hedging slow completion requests"""
+
+    # Percentile of the observed completion latencies after which a duplicate request is sent
+    PERCENTILE = 0.95
+    # Largest share of the completion requests that get a duplicate, bounds the extra tokens spent
+    MAX_HEDGE_RATE = 0.05
+    # Completions observed before any request is hedged
+    MIN_SAMPLES = 20
+    # Shortest wait before a duplicate request is sent, in seconds
+    MIN_DELAY = 1.0
+    # Recent latencies the percentile is taken over, so that it follows the provider's current latency
+    WINDOW = 200
@@ -0,0 +1,24 @@
+class InputFileType:
+    """Types of input files, detected from their contents"""
+
+    PDF = "pdf"
+    # PNG, JPEG or TIFF images, sent to the model without PDF conversion
+    IMAGE = "image"
+
+
+class ImageInputDefaultOptions:
+    """Default options for image inputs"""
+
+    # Leading bytes of the image formats that are read directly, anything else is treated as a PDF
+    SIGNATURES = (
+        (b"\x89PNG\r\n\x1a\n", "PNG"),
+        (b"\xff\xd8\xff", "JPEG"),
+        (b"II*\x00", "TIFF"),
+        (b"MM\x00*", "TIFF"),
+    )
+
+    # Formats whose original bytes are sent as is when they need no normalization, resizing or encoding
+    PASSTHROUGH_FORMATS = {
+        "PNG": "image/png",
+        "JPEG": "image/jpeg",
+    }
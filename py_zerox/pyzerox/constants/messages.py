@@ -23,6 +23,10 @@ class Messages:
     The maintain_format flag is set to True in conjunction with select_pages input given. This may result in unexpected behavior.
     """
 
+    INVALID_MAINTAIN_FORMAT_MODE = """
+    Invalid maintain_format_mode: {0}. Use one of "serial", "seed" or "chunked".
+    """
+
     PAGE_NUMBER_OUT_OF_BOUND_ERROR = """
     The page number(s) provided is out of bound. Please provide a valid page number(s).
     """
@@ -33,11 +37,43 @@ class Messages:
     Please check the litellm documentation for more information. https://docs.litellm.ai/docs/exception_mapping.
     """
 
+    MODEL_REQUEST_ERROR = """
+    Model server returned status code {0}: {1}
+    """
+
+    STALE_MODEL_SESSION = """
+    The model's HTTP session belongs to an event loop that is stopped but not closed, so it can't be closed from this one.
+    Call `await model.close()` before its event loop stops to release its connections.
+    """
+
+    INVALID_MODEL_BACKEND = """
+    Unknown model backend: {0}. Use one of {1} or register it with register_model_backend.
+    """
+
+    INVALID_PDF_RENDERER = """
+    Unknown PDF renderer: {0}. Use one of {1} or register it with register_renderer.
+    """
+
+    PDFIUM_NOT_INSTALLED = """
+    The pdfium renderer requires pypdfium2, install it with `pip install pypdfium2` (or the pdfium extra of py-zerox).
+    """
+
     COMPLETION_ERROR = """
     Error in Completion Response. Error: {0}
     Please check the status of your model provider API status.
     """
 
+    RASTERIZE_WORKERS_MAIN_GUARD = """
+    rasterize_workers={0} starts worker processes, which import the main module of the program again.
+    Call zerox from under an `if __name__ == "__main__":` guard in scripts, or use rasterize_workers=1.
+    """
+
+    RASTERIZE_WORKER_DIED = """
+    A rasterization worker process of rasterize_workers={0} stopped unexpectedly, e.g. killed for running out of memory,
+    or unable to start because zerox isn't called from under an `if __name__ == "__main__":` guard in a script.
+    Lower rasterize_workers, add the guard, or use rasterize_workers=1.
+    """
+
     PDF_CONVERSION_FAILED = """
     Error during PDF conversion: {0}
     Please check the PDF file and try again. For more information: https://github.com/Belval/pdf2image
@@ -47,10 +83,32 @@ class Messages:
     File not found or unreachable. Status Code: {0}
     """
 
+    FILE_TOO_LARGE = """
+    File is larger than the maximum allowed size of {0} bytes.
+    """
+
     FILE_PATH_MISSING = """
     File path is invalid or missing.
     """
 
+    JOB_MANIFEST_MISMATCH = """
+    The manifest of job {0} belongs to a different input ({1}), starting the job over.
+    """
+
     FAILED_TO_SAVE_FILE = """Failed to save file to local drive"""
 
+    DUPLICATE_OUTPUT_FILE = """
+    Documents {0} would all be written to {1}.md in output_dir. Rename them or process them in separate batches.
+    """
+
     FAILED_TO_PROCESS_IMAGE = """Failed to process image"""
+
+    FAILED_TO_SPLIT_PAGES = """Failed to split the multi-page response into {0} pages, processing them one by one"""
+
+    PAGES_PER_REQUEST_MAINTAIN_FORMAT_WARNING = """
+    pages_per_request is ignored with maintain_format, pages are sent one per request so that each gets its formatting context.
+    """
+
+    UNSUPPORTED_IMAGE_FORMAT = """
+    Unsupported image format: {0}. Supported formats are png, jpeg and webp.
+    """
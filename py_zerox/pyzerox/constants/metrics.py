@@ -0,0 +1,19 @@
+class MetricsStage:
+    """Stages of processing a document that are timed for metrics hooks"""
+
+    # Downloading the file, or checking the local file
+    DOWNLOAD = "download"
+    # Validating the model, in the background of the download and the first page
+    VALIDATION = "validation"
+    # Rendering pages to images, per conversion
+    RASTERIZE = "rasterize"
+    # Compressing rendered pages to the configured image encoding
+    ENCODE = "encode"
+    # Reading the text layer of pages
+    TEXT_LAYER = "text_layer"
+    # Detecting blank and near-duplicate pages
+    FILTER = "filter"
+    # Waiting for a concurrency slot (or a rate limit back off) before a completion request
+    QUEUE_WAIT = "queue_wait"
+    # A completion request, including preparing (base64 encoding) the page images
+    COMPLETION = "completion"
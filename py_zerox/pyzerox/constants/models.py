@@ -0,0 +1,24 @@
+class ModelBackend:
+    """Model backends that can be selected by name with model_backend, see register_model_backend for custom ones"""
+
+    # LiteLLM, for the hosted model providers it supports
+    LITELLM = "litellm"
+    # Any server exposing the OpenAI chat completions API, e.g. a local vLLM or llama.cpp server
+    OPENAI_COMPATIBLE = "openai_compatible"
+
+
+class OpenAICompatibleDefaultOptions:
+    """Default options for the OpenAI compatible model backend"""
+
+    # Base URL of the server, when neither base_url nor the environment variable is set
+    BASE_URL = "http://localhost:8000/v1"
+    BASE_URL_ENV = "OPENAI_COMPATIBLE_BASE_URL"
+    API_KEY_ENV = "OPENAI_COMPATIBLE_API_KEY"
+
+    # Connection pool of the model's HTTP session, kept open across pages and documents
+    CONNECTION_LIMIT = 100
+    KEEPALIVE_TIMEOUT = 60
+
+    # Seconds to wait for a connection and for a completion, local models can be slow on large pages
+    CONNECT_TIMEOUT = 30
+    READ_TIMEOUT = 600
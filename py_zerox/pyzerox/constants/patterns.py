@@ -4,3 +4,6 @@ class Patterns:
     MATCH_MARKDOWN_BLOCKS = r"^```[a-z]*\n([\s\S]*?)\n```$"
 
     MATCH_CODE_BLOCKS = r"^```\n([\s\S]*?)\n```$"
+
+    # A page delimiter of a multi-page response on a line of its own, tolerating markdown emphasis or headings around it
+    MATCH_PAGE_DELIMITER = r"^[ \t#>*_`]*<{2,3}\s*PAGE\s*(\d+)\s*>{2,3}[ \t*_`]*$"
@@ -0,0 +1,8 @@
+class PromptCachingDefaultOptions:
+    """Default options for provider prompt caching of the system prompt"""
+
+    # Providers that only cache prompts marked with cache_control blocks, matched against the lowercased model name.
+    # Others (e.g. OpenAI) cache long prompt prefixes automatically and only report the cached tokens.
+    EXPLICIT_MARKER_PATTERNS = ("claude", "anthropic")
+
+    CACHE_CONTROL = {"type": "ephemeral"}
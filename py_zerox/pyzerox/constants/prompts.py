@@ -13,4 +13,10 @@ class Prompts:
       - Watermarks should be wrapped in brackets. Ex: <watermark>OFFICIAL COPY<watermark>
       - Page numbers should be wrapped in brackets. Ex: <page_number>14<page_number> or <page_number>9/22<page_number>
       - Prefer using ☐ and ☑ for check boxes.
+    """
+
+    MULTI_PAGE_PROMPT = """
+    The request contains {0} pages, each image preceded by its page delimiter.
+    Convert every page separately, in order. Start the markdown of each page with its page delimiter on a line of its own, exactly as given, e.g. <<<PAGE 1>>>.
+    Do not merge pages, skip pages or add anything between them.
     """
\ No newline at end of file
@@ -0,0 +1,22 @@
+class RetryDefaultOptions:
+    """Default options for retrying failed page completions"""
+
+    # Retries per page after the first attempt, before the page is set aside for the end of the batch
+    MAX_RETRIES = 2
+
+    # Exponential backoff between attempts, in seconds: a random delay up to BASE_DELAY * 2^(attempt - 1), capped at MAX_DELAY
+    BASE_DELAY = 1.0
+    MAX_DELAY = 30.0
+
+
+class PageStatus:
+    """Processing status of a page"""
+
+    OK = "ok"
+    RETRIED = "retried"
+    FAILED = "failed"
+    # Skipped by the page filter, without a completion request
+    BLANK = "blank"
+    DUPLICATE = "duplicate"
+    # Taken from the text layer of the PDF, without a completion request
+    TEXT_LAYER = "text_layer"
@@ -0,0 +1,17 @@
+class TextLayerDefaultOptions:
+    """Default options for judging whether the text layer of a PDF page can be used instead of a model call"""
+
+    # Pages with less text than this (e.g. covers, charts, scans with a few OCR'd words) go to the model
+    MIN_CHARACTERS = 200
+    # Share of the characters that have to be printable, garbled font encodings produce control and replacement characters
+    MIN_PRINTABLE_RATIO = 0.98
+    # Share of the words that have to look like words, i.e. contain a letter or digit and be at most MAX_WORD_LENGTH long
+    MIN_WORD_RATIO = 0.8
+    MAX_WORD_LENGTH = 30
+
+    # Pages with images larger than this in total, in pixels, are scanned or image heavy. Small images such as logos are allowed.
+    MAX_IMAGE_PIXELS = 250_000
+    # Pages drawing more lines and rectangles than this have tables, charts or other layouts the text layer loses
+    MAX_RULING_OPERATIONS = 16
+    # How deep form XObjects are searched for images
+    MAX_XOBJECT_DEPTH = 4
@@ -0,0 +1,19 @@
+class ValidationDefaultOptions:
+    """Default options for caching model validation results"""
+
+    # Seconds a successful validation of a model and set of credentials is reused for
+    TTL = 3600
+
+    # Environment variables whose names end with one of these are treated as credentials for the validation fingerprint
+    CREDENTIAL_ENV_SUFFIXES = (
+        "_API_KEY",
+        "_API_BASE",
+        "_API_VERSION",
+        "_ACCESS_KEY_ID",
+        "_SECRET_ACCESS_KEY",
+        "_SESSION_TOKEN",
+        "_REGION_NAME",
+        "_CREDENTIALS",
+        "_PROJECT",
+        "_LOCATION",
+    )
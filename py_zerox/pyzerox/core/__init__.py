@@ -1,5 +1,7 @@
-from .zerox import zerox
+from .zerox import zerox, zerox_stream, zerox_batch
 
 __all__ = [
     "zerox",
+    "zerox_stream",
+    "zerox_batch",
 ]
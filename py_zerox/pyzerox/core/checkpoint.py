@@ -0,0 +1,99 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+import aiofiles
+import aiofiles.os as async_os
+
+# Package Imports
+from ..constants import Messages
+from .types import Page
+
+
+class JobManifest:
+    """
+    Manifest of the pages a resumable job has completed, so that a re-run with the same job ID only processes the missing pages.
+    The manifest is a JSON lines file: a header identifying the input, then one line per completed page, appended as soon as the page is done.
+    """
+
+    def __init__(self, directory: str, job_id: str, file_path: str, select_pages: Optional[List[int]] = None):
+        """
+        :param directory: The directory the manifest is kept in.
+        :type directory: str
+        :param job_id: The job ID.
+        :type job_id: str
+        :param file_path: The input of the job.
+        :type file_path: str
+        :param select_pages: The pages the job processes, defaults to None (all pages)
+        :type select_pages: List[int], optional
+        """
+        # Use the job ID as the file name when it is safe, a hash of it otherwise
+        if re.fullmatch(r"[\w.-]{1,128}", job_id) and job_id not in (".", ".."):
+            manifest_name = job_id
+        else:
+            manifest_name = hashlib.sha256(job_id.encode("utf-8")).hexdigest()
+
+        self.job_id = job_id
+        self.path = os.path.join(directory, f"{manifest_name}.jsonl")
+        self.header = {"job_id": job_id, "file_path": file_path, "select_pages": select_pages}
+        self._file = None
+
+    async def open(self) -> Dict[int, Page]:
+        """Opens the manifest for appending, returning the pages completed by earlier runs by index."""
+        await async_os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        completed_pages: Dict[int, Page] = {}
+        content = ""
+        if await async_os.path.exists(self.path):
+            async with aiofiles.open(self.path, "r", encoding="utf-8") as manifest_file:
+                content = await manifest_file.read()
+            lines = content.splitlines()
+            header = self._parse(lines[0]) if lines else None
+
+            if header == self.header:
+                page_fields = {field.name for field in dataclasses.fields(Page)}
+                for line in lines[1:]:
+                    entry = self._parse(line)
+                    # A line cut short by a crash is skipped, the page is simply processed again
+                    if entry is None or "index" not in entry:
+                        continue
+                    completed_pages[entry["index"]] = Page(
+                        **{name: value for name, value in entry.items() if name in page_fields}
+                    )
+            elif header is not None:
+                logging.warning(Messages.JOB_MANIFEST_MISMATCH.format(self.job_id, header.get("file_path")))
+
+        if completed_pages:
+            self._file = await aiofiles.open(self.path, "a", encoding="utf-8")
+            # Terminate a line cut short by a crash, so that it doesn't swallow the next page
+            if not content.endswith("\n"):
+                await self._file.write("\n")
+        else:
+            self._file = await aiofiles.open(self.path, "w", encoding="utf-8")
+            await self._write(self.header)
+        return completed_pages
+
+    async def append(self, index: int, page: Page) -> None:
+        """Records a completed page."""
+        await self._write({"index": index, **dataclasses.asdict(page)})
+
+    async def close(self) -> None:
+        if self._file:
+            await self._file.close()
+            self._file = None
+
+    async def _write(self, entry: Dict) -> None:
+        await self._file.write(json.dumps(entry) + "\n")
+        # Flush every line, a worker that dies keeps everything up to its last completed page
+        await self._file.flush()
+
+    @staticmethod
+    def _parse(line: str) -> Optional[Dict]:
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
@@ -1,6 +1,10 @@
 from typing import List, Optional, Dict, Any, Union, Iterable
 from dataclasses import dataclass, field
 
+# Package Imports
+from ..constants import PageStatus
+from ..metrics import StageTiming
+
 
 @dataclass
 class ZeroxArgs:
@@ -28,6 +32,21 @@ class Page:
     content: str
     content_length: int
     page: int
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_hit: bool = False
+    status: str = PageStatus.OK
+    attempts: int = 0
+    latency: float = 0.0
+    queue_wait: float = 0.0
+    error: Optional[str] = None
+    image_bytes: int = 0
+    duplicate_of: Optional[int] = None
+    batch_size: int = 1
+    hedged: bool = False
+    hedge_input_tokens: int = 0
+    hedge_output_tokens: int = 0
 
 
 @dataclass
@@ -41,3 +60,15 @@ class ZeroxOutput:
     input_tokens: int
     output_tokens: int
     pages: List[Page]
+    cached_input_tokens: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    image_bytes: int = 0
+    blank_pages: int = 0
+    duplicate_pages: int = 0
+    text_layer_pages: int = 0
+    hedged_pages: int = 0
+    ## tokens spent on the duplicate requests of hedged pages, not included in input_tokens and output_tokens
+    hedge_input_tokens: int = 0
+    hedge_output_tokens: int = 0
+    stage_timings: Dict[str, StageTiming] = field(default_factory=dict)
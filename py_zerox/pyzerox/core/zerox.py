@@ -1,40 +1,94 @@
+import collections
 import os
 import aioshutil as async_shutil
 import tempfile
 import warnings
-from typing import List, Optional, Union, Iterable
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union, Iterable, TYPE_CHECKING
 from datetime import datetime
 import aiofiles
 import aiofiles.os as async_os
 import asyncio
-from ..constants import PDFConversionDefaultOptions
+from ..constants import (
+    PDFConversionDefaultOptions,
+    RetryDefaultOptions,
+    ConcurrencyDefaultOptions,
+    DownloadDefaultOptions,
+    CheckpointDefaultOptions,
+    MaintainFormatMode,
+    PageStatus,
+    BatchingDefaultOptions,
+    MetricsStage,
+    ModelBackend,
+    InputFileType,
+)
 
 # Package Imports
 from ..processor import (
-    convert_pdf_to_images,
+    iter_pdf_images,
+    iter_image_pages,
+    detect_file_type,
+    get_image_frame_count,
     download_file,
-    process_page,
-    process_pages_in_batches,
-    create_selected_pages_pdf,
+    create_http_session,
+    process_pages_as_completed,
+    process_pages_in_order,
+    get_context_pages,
+    get_pdf_page_count,
+    validate_page_numbers,
+    iterate_after,
+    fill_skipped,
+    ImageEncoding,
+    PageFilter,
+    AdaptiveConcurrencyLimiter,
+    FairSemaphore,
+    FairSemaphoreShare,
+    BasePDFRenderer,
+    HedgingPolicy,
+    RequestHedger,
 )
-from ..errors import FileUnavailable
+from ..errors import DuplicateOutputFile, FileUnavailable
 from ..constants.messages import Messages
-from ..models import litellmmodel
+from ..models import BaseModel, create_model
+from ..cache import BaseCache
+from ..metrics import MetricsHook, MetricsRecorder, StageTiming, StageTimingsHook, create_recorder, get_hooks, timed
+from .checkpoint import JobManifest
 from .types import Page, ZeroxOutput
 
+if TYPE_CHECKING:
+    import aiohttp
+
 
 async def zerox(
     cleanup: bool = True,
-    concurrency: int = 10,
+    concurrency: Union[int, AdaptiveConcurrencyLimiter] = 10,
     file_path: Optional[str] = "",
     image_density: int = PDFConversionDefaultOptions.DPI,
     image_height: tuple[Optional[int], int] = PDFConversionDefaultOptions.SIZE,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    rasterize_workers: Optional[int] = PDFConversionDefaultOptions.RASTERIZE_WORKERS,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+    image_encoding: Optional[ImageEncoding] = None,
+    page_filter: Optional[PageFilter] = None,
+    text_layer: bool = False,
+    pages_per_request: int = BatchingDefaultOptions.PAGES_PER_REQUEST,
     maintain_format: bool = False,
-    model: str = "gpt-4o-mini",
+    maintain_format_mode: str = MaintainFormatMode.SERIAL,
+    model: Union[str, BaseModel] = "gpt-4o-mini",
+    model_backend: str = ModelBackend.LITELLM,
     output_dir: Optional[str] = None,
     temp_dir: Optional[str] = None,
     custom_system_prompt: Optional[str] = None,
     select_pages: Optional[Union[int, Iterable[int]]] = None,
+    cache: Optional[BaseCache] = None,
+    max_page_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    hedging: Optional[Union[HedgingPolicy, RequestHedger]] = None,
+    job_id: Optional[str] = None,
+    checkpoint_dir: str = CheckpointDefaultOptions.DIRECTORY,
+    max_file_size: Optional[int] = DownloadDefaultOptions.MAX_SIZE_BYTES,
+    http_session: Optional["aiohttp.ClientSession"] = None,
+    check_access: bool = True,
+    prompt_caching: Optional[bool] = None,
+    metrics: Optional[Union[MetricsHook, Sequence[MetricsHook]]] = None,
     **kwargs
 ) -> ZeroxOutput:
     """
@@ -43,14 +97,33 @@ async def zerox(
 
     :param cleanup: Whether to cleanup the temporary files after processing, defaults to True
     :type cleanup: bool, optional
-    :param concurrency: The number of concurrent processes to run, defaults to 10
-    :type concurrency: int, optional
-    :param file_path: The path or URL to the PDF file to process.
+    :param concurrency: The number of concurrent processes to run, or an AdaptiveConcurrencyLimiter to adapt it to the provider's rate limits, defaults to 10
+    :type concurrency: int or AdaptiveConcurrencyLimiter, optional
+    :param file_path: The path or URL to the PDF file to process, or to a PNG, JPEG or TIFF image (one page per TIFF frame), which is read directly without PDF conversion.
     :type file_path: str, optional
+    :param in_memory: Whether to keep rendered page images in memory from rasterization to the model request instead of writing them to the temp directory, defaults to True
+    :type in_memory: bool, optional
+    :param rasterize_workers: How many processes render pages in parallel, defaults to 1 (rendered in a worker thread). None for one per available CPU. Worth it for long documents, where rasterization rather than the model limits throughput. The process pool is started on first use and shared by all documents. Worker processes are spawned and import the main module again, so scripts must call zerox from under an `if __name__ == "__main__":` guard
+    :type rasterize_workers: int, optional
+    :param renderer: The renderer rasterizing the pages, "poppler" (pdf2image) or "pdfium" (in process with pypdfium2, faster for short documents and without temporary files), or a BasePDFRenderer, defaults to "poppler"
+    :type renderer: str or BasePDFRenderer, optional
+    :param image_encoding: How page images are encoded for the model (format, quality, grayscale, pixel budget, tiling), defaults to None, which sends the rendered PNG as is
+    :type image_encoding: ImageEncoding, optional
+    :param page_filter: Detects blank pages, which are skipped, and near-duplicate pages, which reuse the completion of the earlier page, before any completion is requested. Skipped pages are reported with status "blank" or "duplicate", defaults to None
+    :type page_filter: PageFilter, optional
+    :param text_layer: Whether to take pages with a clean text layer from the PDF itself, without rasterizing them or requesting a completion. Pages with little or garbled text, large images or tables are still sent to the model. Such pages are reported with status "text_layer", defaults to False
+    :type text_layer: bool, optional
+    :param pages_per_request: How many pages are sent to the model in one completion request, to share the system prompt between them. The response is split back into pages by page delimiters, pages whose response can't be split are requested again one by one. Not combined with maintain_format, defaults to 1
+    :type pages_per_request: int, optional
     :param maintain_format: Whether to maintain the format from the previous page, defaults to False
     :type maintain_format: bool, optional
+    :param maintain_format_mode: How maintain_format passes formatting context, defaults to "serial" (each page waits for the one before it). "seed" processes the first page, then all other pages in parallel against it. "chunked" processes chunks of pages in parallel, each chunk against the last page of the chunk before it
+    :type maintain_format_mode: str, optional
     :param model: The model to use for generating completions, defaults to "gpt-4o-mini". Note - Refer: https://docs.litellm.ai/docs/providers to pass correct model name as according to provider it might be different from actual name.
-    :type model: str, optional
+        An already validated model instance (e.g. litellmmodel or OpenAICompatibleModel) may be passed instead, in which case kwargs are not used.
+    :type model: str or BaseModel, optional
+    :param model_backend: The backend the model is created with when given by name, defaults to "litellm". "openai_compatible" sends requests straight to an OpenAI compatible server, e.g. a local vLLM or llama.cpp server, with its base_url and api_key passed as kwargs. Other backends can be added with register_model_backend
+    :type model_backend: str, optional
     :param output_dir: The directory to save the markdown output, defaults to None
     :type output_dir: str, optional
     :param temp_dir: The directory to store temporary files, defaults to some named folder in system's temp directory. If already exists, the contents will be deleted for zerox uses it.
@@ -59,33 +132,167 @@ async def zerox(
     :type custom_system_prompt: str, optional
     :param select_pages: Pages to process, can be a single page number or an iterable of page numbers, defaults to None
     :type select_pages: int or Iterable[int], optional
+    :param cache: Cache backend (e.g. DirectoryCache or SQLiteCache) to reuse completions of identical pages across runs, defaults to None
+    :type cache: BaseCache, optional
+    :param max_page_retries: How many times a failed page completion is retried, with exponential backoff, before the page is re-queued at the end of the batch and finally reported as failed, defaults to 2
+    :type max_page_retries: int, optional
+    :param job_id: Makes the run resumable: every completed page is recorded in a manifest under this ID as soon as it is done, and a re-run with the same ID only processes the pages that are missing, defaults to None
+    :type job_id: str, optional
+    :param checkpoint_dir: The directory job manifests are kept in, defaults to a zerox-checkpoints folder in the system temp directory
+    :type checkpoint_dir: str, optional
+    :param max_file_size: Downloads larger than this many bytes are aborted, None for no limit, defaults to 1 GiB
+    :type max_file_size: int, optional
+    :param http_session: The aiohttp session to download with, to reuse its connection pool across calls, defaults to None (a session is created for the download)
+    :type http_session: aiohttp.ClientSession, optional
+    :param check_access: Whether to validate access to the model with a test request before processing, defaults to True. Validation results are cached per model and credentials for ValidationDefaultOptions.TTL seconds
+    :type check_access: bool, optional
+    :param prompt_caching: Whether to mark the system prompt for provider prompt caching, defaults to None (marked for models that support prompt caching and need explicit cache_control markers, such as Claude). Input tokens read from the prompt cache are reported in cached_input_tokens
+    :type prompt_caching: bool, optional
+    :param hedging: Sends a duplicate of page completion requests that take longer than a percentile of the recent latencies, the first response wins and the other request is cancelled, defaults to None (no hedging). The share of hedged requests is capped, hedged pages and the extra tokens spent on the duplicates are reported in hedged_pages, hedge_input_tokens and hedge_output_tokens
+    :type hedging: HedgingPolicy, optional
+    :param metrics: Metrics hooks (see MetricsHook) to call with the timing of every processing stage, every finished page and the document, defaults to None. The aggregated stage timings are reported in stage_timings either way
+    :type metrics: Union[MetricsHook, Sequence[MetricsHook]], optional
 
-    :param kwargs: Additional keyword arguments to pass to the model.completion -> litellm.completion method. Refer: https://docs.litellm.ai/docs/providers and https://docs.litellm.ai/docs/completion/input
+    :param kwargs: Additional keyword arguments to pass to the model backend, e.g. to the model.completion -> litellm.completion method. Refer: https://docs.litellm.ai/docs/providers and https://docs.litellm.ai/docs/completion/input
     :return: The markdown content generated by the model.
     """
 
-
-    input_token_count = 0
-    output_token_count = 0
-    prior_page = ""
-    aggregated_markdown: List[str] = []
     start_time = datetime.now()
-    
+
+    stage_timings = StageTimingsHook()
+    recorder = MetricsRecorder([*get_hooks(metrics), stage_timings])
+
+    formatted_pages: List[Page] = []
+    async for page in zerox_stream(
+        cleanup=cleanup,
+        concurrency=concurrency,
+        file_path=file_path,
+        image_density=image_density,
+        image_height=image_height,
+        in_memory=in_memory,
+        rasterize_workers=rasterize_workers,
+        renderer=renderer,
+        image_encoding=image_encoding,
+        page_filter=page_filter,
+        text_layer=text_layer,
+        pages_per_request=pages_per_request,
+        maintain_format=maintain_format,
+        maintain_format_mode=maintain_format_mode,
+        model=model,
+        model_backend=model_backend,
+        output_dir=output_dir,
+        temp_dir=temp_dir,
+        custom_system_prompt=custom_system_prompt,
+        select_pages=select_pages,
+        cache=cache,
+        max_page_retries=max_page_retries,
+        hedging=hedging,
+        job_id=job_id,
+        checkpoint_dir=checkpoint_dir,
+        max_file_size=max_file_size,
+        http_session=http_session,
+        check_access=check_access,
+        prompt_caching=prompt_caching,
+        metrics=recorder.hooks,
+        ordered=True,
+        **kwargs,
+    ):
+        formatted_pages.append(page)
+
+    output = build_zerox_output(file_path, formatted_pages, start_time, cache, stage_timings.timings)
+    recorder.document(output)
+    return output
+
+
+async def zerox_stream(
+    cleanup: bool = True,
+    concurrency: Union[int, AdaptiveConcurrencyLimiter, FairSemaphoreShare] = 10,
+    file_path: Optional[str] = "",
+    image_density: int = PDFConversionDefaultOptions.DPI,
+    image_height: tuple[Optional[int], int] = PDFConversionDefaultOptions.SIZE,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    rasterize_workers: Optional[int] = PDFConversionDefaultOptions.RASTERIZE_WORKERS,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+    image_encoding: Optional[ImageEncoding] = None,
+    page_filter: Optional[PageFilter] = None,
+    text_layer: bool = False,
+    pages_per_request: int = BatchingDefaultOptions.PAGES_PER_REQUEST,
+    maintain_format: bool = False,
+    maintain_format_mode: str = MaintainFormatMode.SERIAL,
+    model: Union[str, BaseModel] = "gpt-4o-mini",
+    model_backend: str = ModelBackend.LITELLM,
+    output_dir: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+    custom_system_prompt: Optional[str] = None,
+    select_pages: Optional[Union[int, Iterable[int]]] = None,
+    cache: Optional[BaseCache] = None,
+    max_page_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    hedging: Optional[Union[HedgingPolicy, RequestHedger]] = None,
+    job_id: Optional[str] = None,
+    checkpoint_dir: str = CheckpointDefaultOptions.DIRECTORY,
+    max_file_size: Optional[int] = DownloadDefaultOptions.MAX_SIZE_BYTES,
+    http_session: Optional["aiohttp.ClientSession"] = None,
+    check_access: bool = True,
+    prompt_caching: Optional[bool] = None,
+    metrics: Optional[Union[MetricsHook, Sequence[MetricsHook]]] = None,
+    ordered: bool = True,
+    **kwargs
+) -> AsyncIterator[Page]:
+    """
+    Streaming variant of zerox. Yields each Page, along with its token usage, as soon as its completion lands instead of waiting for the whole document.
+    Accepts the same arguments as zerox, plus:
+
+    :param ordered: Whether to yield pages in strict page order (True) or in completion order (False), defaults to True
+    :type ordered: bool, optional
+
+    When output_dir is set, the markdown file is written incrementally in page order as pages become available.
+    """
+
     # File Path Validators
     if not file_path:
         raise FileUnavailable()
-    
-    # Create an instance of the litellm model interface
-    vision_model = litellmmodel(model=model,**kwargs)
+
+    # Time the processing stages for the metrics hooks, if any
+    recorder = create_recorder(metrics)
+
+    # Create an instance of the model backend, unless one was provided
+    if isinstance(model, BaseModel):
+        vision_model = model
+        validation = None
+    else:
+        vision_model = create_model(
+            model,
+            model_backend,
+            check_access=check_access,
+            defer_validation=True,
+            prompt_caching=prompt_caching,
+            **kwargs,
+        )
+        ## validate the model in the background while the file is downloaded and the first page is rasterized
+        validation = asyncio.create_task(validate_model(vision_model, recorder))
 
     # override the system prompt if a custom prompt is provided
     if custom_system_prompt:
         vision_model.system_prompt = custom_system_prompt
 
+    # Hedge slow completion requests, with the hedger of the batch if there is one so that it learns from all documents
+    hedger = RequestHedger(hedging) if isinstance(hedging, HedgingPolicy) else hedging
+
+    # Resolve the pixel budget of the model for the page images
+    if image_encoding:
+        image_encoding = image_encoding.for_model(vision_model.model)
+
     # Check if both maintain_format and select_pages are provided
     if maintain_format and select_pages is not None:
         warnings.warn(Messages.MAINTAIN_FORMAT_SELECTED_PAGES_WARNING)
 
+    # Pages are sent one per request when they get other pages' markdown as context
+    if maintain_format and pages_per_request > 1:
+        warnings.warn(Messages.PAGES_PER_REQUEST_MAINTAIN_FORMAT_WARNING)
+
+    # Pages that get other pages' markdown as context, unless maintain_format is serial
+    context_pages = get_context_pages(maintain_format_mode) if maintain_format else None
+
     # If select_pages is a single integer, convert it to a list for consistency
     if isinstance(select_pages, int):
         select_pages = [select_pages]
@@ -115,88 +322,418 @@ async def zerox(
             ## use the system temp directory
             temp_directory = temp_dir_
 
-        # Download the PDF. Get file name.
-        local_path = await download_file(file_path=file_path, temp_dir=temp_directory)
-        if not local_path:
-            raise FileUnavailable()
-        
-        raw_file_name = os.path.splitext(os.path.basename(local_path))[0]
-        file_name = "".join(c.lower() if c.isalnum() else "_" for c in raw_file_name)
-        # Truncate file name to 255 characters to prevent ENAMETOOLONG errors
-        file_name = file_name[:255]
-
-        # create a subset pdf in temp dir with only the requested pages if select_pages is provided
-        if select_pages is not None:
-            subset_pdf_create_kwargs = {"original_pdf_path":local_path, "select_pages":select_pages, 
-                                    "save_directory":temp_directory, "suffix":"_selected_pages"}
-            local_path = await asyncio.to_thread(create_selected_pages_pdf, 
-                                                 **subset_pdf_create_kwargs)
-
-        # Convert the file to a series of images, below function returns a list of image paths in page order
-        images = await convert_pdf_to_images(image_density=image_density, image_height=image_height, local_path=local_path, temp_dir=temp_directory)
-
-        if maintain_format:
-            for image in images:
-                result, input_token_count, output_token_count, prior_page = await process_page(
-                    image,
+        try:
+            # Download the PDF. Get file name.
+            with timed(recorder, MetricsStage.DOWNLOAD):
+                local_path = await download_file(
+                    file_path=file_path, temp_dir=temp_directory, session=http_session, max_size_bytes=max_file_size
+                )
+            if not local_path:
+                raise FileUnavailable()
+
+            file_name = get_file_name(local_path)
+
+            # Images (PNG, JPEG, TIFF) are read directly, without PDF conversion
+            file_type = await asyncio.to_thread(detect_file_type, local_path)
+
+            # validate select_pages up front, only the requested pages are rasterized from the original file
+            if select_pages is not None:
+                if file_type == InputFileType.IMAGE:
+                    page_count = await asyncio.to_thread(get_image_frame_count, local_path)
+                else:
+                    page_count = await asyncio.to_thread(get_pdf_page_count, local_path, renderer)
+                validate_page_numbers(select_pages, page_count)
+        except BaseException:
+            if validation:
+                validation.cancel()
+            if not isinstance(model, BaseModel):
+                await vision_model.close()
+            raise
+
+        output_file = None
+        manifest = None
+        results = None
+        try:
+            # Pick up the pages an earlier run of the job has completed
+            completed_pages: Dict[int, Page] = {}
+            if job_id:
+                manifest = JobManifest(checkpoint_dir, job_id, file_path, select_pages)
+                completed_pages = await manifest.open()
+            completed_markdown = {index: page.content for index, page in completed_pages.items()}
+
+            # Only the pages the earlier runs haven't completed are rendered
+            render_pages = select_pages
+            if completed_pages:
+                if select_pages is None:
+                    if file_type == InputFileType.IMAGE:
+                        page_count = await asyncio.to_thread(get_image_frame_count, local_path)
+                    else:
+                        page_count = await asyncio.to_thread(get_pdf_page_count, local_path, renderer)
+                    document_pages = list(range(1, page_count + 1))
+                else:
+                    document_pages = select_pages
+                render_pages = [page for index, page in enumerate(document_pages) if index not in completed_pages]
+
+            # Convert the file to a series of images in the background, pages are handed to the model as soon as they are rasterized
+            # No page is handed to the model before it has been validated
+            if file_type == InputFileType.IMAGE:
+                page_images = iter_image_pages(
+                    image_height=image_height,
+                    local_path=local_path,
+                    temp_dir=temp_directory,
+                    in_memory=in_memory,
+                    encoding=image_encoding,
+                    select_pages=render_pages,
+                    recorder=recorder,
+                )
+            else:
+                page_images = iter_pdf_images(
+                    image_density=image_density,
+                    image_height=image_height,
+                    local_path=local_path,
+                    temp_dir=temp_directory,
+                    in_memory=in_memory,
+                    encoding=image_encoding,
+                    text_layer=text_layer,
+                    select_pages=render_pages,
+                    recorder=recorder,
+                    workers=rasterize_workers,
+                    renderer=renderer,
+                )
+            if completed_pages:
+                # Completed pages get a placeholder, so that page indices still match the whole document
+                page_images = fill_skipped(page_images, completed_pages, len(document_pages))
+            images = iterate_after(page_images, validation)
+
+            if maintain_format and maintain_format_mode == MaintainFormatMode.SERIAL:
+                # One page at a time, but still within the limiter or the batch's shared budget if there is one
+                limiter = concurrency if isinstance(concurrency, (AdaptiveConcurrencyLimiter, FairSemaphoreShare)) else None
+                results = process_pages_in_order(
+                    images,
                     vision_model,
                     temp_directory,
-                    input_token_count,
-                    output_token_count,
-                    prior_page,
+                    cache,
+                    limiter,
+                    max_page_retries,
+                    completed_markdown,
+                    page_filter,
+                    recorder,
+                    hedger,
+                )
+            else:
+                results = process_pages_as_completed(
+                    images,
+                    concurrency,
+                    vision_model,
+                    temp_directory,
+                    cache,
+                    max_page_retries,
+                    completed_markdown,
+                    context_pages,
+                    page_filter,
+                    pages_per_request,
+                    recorder,
+                    hedger,
                 )
 
-                if result:
-                    aggregated_markdown.append(result)
-        else:
-            results = await process_pages_in_batches(
-                images,
-                concurrency,
-                vision_model,
-                temp_directory,
-                input_token_count,
-                output_token_count,
-                prior_page,
-            )
-
-            aggregated_markdown = [result[0] for result in results if isinstance(result[0], str)]
-
-            ## add token usage
-            input_token_count += sum([result[1] for result in results])
-            output_token_count += sum([result[2] for result in results])
-
-        # Write the aggregated markdown to a file
-        if output_dir:
-            result_file_path = os.path.join(output_dir, f"{file_name}.md")
-            async with aiofiles.open(result_file_path, "w", encoding="utf-8") as f:
-                await f.write("\n\n".join(aggregated_markdown))
-
-        # Cleanup the downloaded PDF file
-        if cleanup and os.path.exists(temp_directory):
-            await async_shutil.rmtree(temp_directory)
-
-        # Format JSON response
-        end_time = datetime.now()
-        completion_time = (end_time - start_time).total_seconds() * 1000
-
-        # Adjusting the formatted_pages logic to account for select_pages to output the correct page numbers
-        if select_pages is not None:
-            # Map aggregated markdown to the selected pages
-            formatted_pages = [
-                        Page(content=content, page=select_pages[i], content_length=len(content))
-                        for i, content in enumerate(aggregated_markdown)
-                    ]
-        else:
-            # Default behavior when no select_pages is provided
-            formatted_pages = [
-                        Page(content=content, page=i + 1, content_length=len(content))
-                        for i, content in enumerate(aggregated_markdown)
-                    ]
-
-        return ZeroxOutput(
-            completion_time=completion_time,
-            file_name=file_name,
-            input_tokens=input_token_count,
-            output_tokens=output_token_count,
-            pages=formatted_pages,
-        )
\ No newline at end of file
+            # Open the markdown file up front so that pages can be appended as they become available
+            if output_dir:
+                result_file_path = os.path.join(output_dir, f"{file_name}.md")
+                output_file = await aiofiles.open(result_file_path, "w", encoding="utf-8")
+
+            # Pages completed out of order wait here until every page before them is done
+            pending_pages: Dict[int, Page] = dict(completed_pages)
+            next_index = 0
+
+            async def flush_ready_pages() -> List[Page]:
+                """Writes every page that is now contiguous with the ones already written, returning them in order."""
+                nonlocal next_index
+                ready_pages = []
+                while next_index in pending_pages:
+                    ready_page = pending_pages.pop(next_index)
+                    if output_file:
+                        separator = "\n\n" if next_index else ""
+                        await output_file.write(separator + ready_page.content)
+                        await output_file.flush()
+                    ready_pages.append(ready_page)
+                    next_index += 1
+                return ready_pages
+
+            def get_page_number(index: int) -> int:
+                # Map image indices to the actual page numbers to account for select_pages
+                return select_pages[index] if select_pages is not None else index + 1
+
+            if not ordered:
+                for index in sorted(completed_pages):
+                    yield completed_pages[index]
+            for ready_page in await flush_ready_pages():
+                if ordered:
+                    yield ready_page
+
+            async for index, result in results:
+                page = Page(
+                    content=result.content,
+                    content_length=len(result.content),
+                    page=get_page_number(index),
+                    input_tokens=result.input_tokens,
+                    output_tokens=result.output_tokens,
+                    cached_input_tokens=result.cached_input_tokens,
+                    cache_hit=result.cache_hit,
+                    status=result.status,
+                    attempts=result.attempts,
+                    latency=result.latency,
+                    queue_wait=result.queue_wait,
+                    error=result.error,
+                    image_bytes=result.image_bytes,
+                    duplicate_of=get_page_number(result.duplicate_of) if result.duplicate_of is not None else None,
+                    batch_size=result.batch_size,
+                    hedged=result.hedged,
+                    hedge_input_tokens=result.hedge_input_tokens,
+                    hedge_output_tokens=result.hedge_output_tokens,
+                )
+                pending_pages[index] = page
+                if recorder:
+                    recorder.page(page)
+
+                # Record the page before handing it out, failed pages are left for the next run
+                if manifest and page.status != PageStatus.FAILED:
+                    await manifest.append(index, page)
+
+                if not ordered:
+                    yield page
+
+                for ready_page in await flush_ready_pages():
+                    if ordered:
+                        yield ready_page
+        finally:
+            if results:
+                await results.aclose()
+            if validation:
+                validation.cancel()
+            if output_file:
+                await output_file.close()
+            if manifest:
+                await manifest.close()
+            # Close the connections of a model created for this document
+            if not isinstance(model, BaseModel):
+                await vision_model.close()
+
+            # Cleanup the downloaded PDF file
+            if cleanup and os.path.exists(temp_directory):
+                await async_shutil.rmtree(temp_directory)
+
+
+async def zerox_batch(
+    file_paths: Iterable[str],
+    cleanup: bool = True,
+    concurrency: Union[int, AdaptiveConcurrencyLimiter] = 10,
+    max_documents: int = ConcurrencyDefaultOptions.MAX_DOCUMENTS,
+    image_density: int = PDFConversionDefaultOptions.DPI,
+    image_height: tuple[Optional[int], int] = PDFConversionDefaultOptions.SIZE,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    rasterize_workers: Optional[int] = PDFConversionDefaultOptions.RASTERIZE_WORKERS,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+    image_encoding: Optional[ImageEncoding] = None,
+    page_filter: Optional[PageFilter] = None,
+    text_layer: bool = False,
+    pages_per_request: int = BatchingDefaultOptions.PAGES_PER_REQUEST,
+    maintain_format: bool = False,
+    maintain_format_mode: str = MaintainFormatMode.SERIAL,
+    model: Union[str, BaseModel] = "gpt-4o-mini",
+    model_backend: str = ModelBackend.LITELLM,
+    output_dir: Optional[str] = None,
+    temp_dir: Optional[str] = None,
+    custom_system_prompt: Optional[str] = None,
+    cache: Optional[BaseCache] = None,
+    max_page_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    hedging: Optional[Union[HedgingPolicy, RequestHedger]] = None,
+    job_id: Optional[str] = None,
+    checkpoint_dir: str = CheckpointDefaultOptions.DIRECTORY,
+    max_file_size: Optional[int] = DownloadDefaultOptions.MAX_SIZE_BYTES,
+    http_session: Optional["aiohttp.ClientSession"] = None,
+    check_access: bool = True,
+    prompt_caching: Optional[bool] = None,
+    metrics: Optional[Union[MetricsHook, Sequence[MetricsHook]]] = None,
+    return_exceptions: bool = False,
+    **kwargs
+) -> AsyncIterator[Tuple[str, ZeroxOutput]]:
+    """
+    API to perform OCR to markdown on many documents with a single model instance and a single concurrency budget.
+    Pages of all open documents share the concurrency limit, with free slots handed out round-robin across documents.
+    Yields (file_path, ZeroxOutput) tuples as each document finishes.
+    Accepts the same arguments as zerox, except file_path and select_pages, plus:
+
+    :param file_paths: The paths or URLs of the PDF files to process.
+    :type file_paths: Iterable[str]
+    :param max_documents: How many documents are downloaded and rasterized at the same time, defaults to 4
+    :type max_documents: int, optional
+    :param return_exceptions: Whether to yield (file_path, exception) for documents that fail instead of raising, defaults to False
+    :type return_exceptions: bool, optional
+    :raises DuplicateOutputFile: With output_dir, if several documents would write the same markdown file (e.g. a/report.pdf and b/report.pdf)
+    """
+    file_paths = list(file_paths)
+
+    # Documents with the same name would overwrite each other's markdown, refuse them before any work is done
+    if output_dir:
+        documents_by_name: Dict[str, List[str]] = collections.defaultdict(list)
+        for file_path in file_paths:
+            documents_by_name[get_file_name(file_path)].append(file_path)
+        for file_name, documents in documents_by_name.items():
+            if len(documents) > 1:
+                raise DuplicateOutputFile(Messages.DUPLICATE_OUTPUT_FILE.format(", ".join(documents), file_name))
+
+    # Create and validate the model once for all documents
+    if isinstance(model, BaseModel):
+        vision_model = model
+    else:
+        vision_model = create_model(
+            model,
+            model_backend,
+            check_access=check_access,
+            defer_validation=True,
+            prompt_caching=prompt_caching,
+            **kwargs,
+        )
+        try:
+            await validate_model(vision_model, create_recorder(metrics))
+        except BaseException:
+            await vision_model.close()
+            raise
+
+    if custom_system_prompt:
+        vision_model.system_prompt = custom_system_prompt
+
+    # One concurrency budget for all the documents
+    if isinstance(concurrency, int):
+        fair_semaphore = FairSemaphore(concurrency)
+    else:
+        fair_semaphore = None
+
+    # One latency history and hedge budget for all the documents
+    hedger = RequestHedger(hedging) if isinstance(hedging, HedgingPolicy) else hedging
+
+    # One connection pool for all the downloads
+    session = http_session or create_http_session()
+
+    document_slots = asyncio.Semaphore(max_documents)
+    finished_documents: asyncio.Queue = asyncio.Queue()
+
+    async def process_document(index: int, file_path: str):
+        async with document_slots:
+            start_time = datetime.now()
+            ## stage timings are aggregated per document
+            stage_timings = StageTimingsHook()
+            recorder = MetricsRecorder([*get_hooks(metrics), stage_timings])
+            try:
+                formatted_pages = [
+                    page
+                    async for page in zerox_stream(
+                        cleanup=cleanup,
+                        concurrency=fair_semaphore.share() if fair_semaphore else concurrency,
+                        file_path=file_path,
+                        image_density=image_density,
+                        image_height=image_height,
+                        in_memory=in_memory,
+                        rasterize_workers=rasterize_workers,
+                        renderer=renderer,
+                        image_encoding=image_encoding,
+                        page_filter=page_filter,
+                        text_layer=text_layer,
+                        pages_per_request=pages_per_request,
+                        maintain_format=maintain_format,
+                        maintain_format_mode=maintain_format_mode,
+                        model=vision_model,
+                        output_dir=output_dir,
+                        ## each document gets its own subdirectory, as zerox clears the temp directory it is given
+                        temp_dir=os.path.join(temp_dir, str(index)) if temp_dir else None,
+                        cache=cache,
+                        max_page_retries=max_page_retries,
+                        hedging=hedger,
+                        ## each document is its own job, identified by the batch's job ID and its path
+                        job_id=f"{job_id}:{file_path}" if job_id else None,
+                        checkpoint_dir=checkpoint_dir,
+                        max_file_size=max_file_size,
+                        http_session=session,
+                        metrics=recorder.hooks,
+                    )
+                ]
+                result = build_zerox_output(file_path, formatted_pages, start_time, cache, stage_timings.timings)
+                recorder.document(result)
+            except Exception as error:
+                result = error
+        finished_documents.put_nowait((file_path, result))
+
+    tasks = [
+        asyncio.create_task(process_document(index, file_path))
+        for index, file_path in enumerate(file_paths)
+    ]
+
+    try:
+        for _ in range(len(tasks)):
+            file_path, result = await finished_documents.get()
+            if isinstance(result, Exception) and not return_exceptions:
+                raise result
+            yield file_path, result
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait for the cancelled documents to stop before their session and model are closed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if not http_session:
+            await session.close()
+        if not isinstance(model, BaseModel):
+            await vision_model.close()
+
+
+def build_zerox_output(
+    file_path: str,
+    formatted_pages: List[Page],
+    start_time: datetime,
+    cache: Optional[BaseCache] = None,
+    stage_timings: Optional[Dict[str, StageTiming]] = None,
+) -> ZeroxOutput:
+    """Aggregates the processed pages of a document, and the timings of its processing stages, into a ZeroxOutput."""
+
+    # Format JSON response
+    end_time = datetime.now()
+    completion_time = (end_time - start_time).total_seconds() * 1000
+
+    cache_hits = sum(page.cache_hit for page in formatted_pages)
+    blank_pages = sum(page.status == PageStatus.BLANK for page in formatted_pages)
+    duplicate_pages = sum(page.status == PageStatus.DUPLICATE for page in formatted_pages)
+    text_layer_pages = sum(page.status == PageStatus.TEXT_LAYER for page in formatted_pages)
+    hedged_pages = sum(page.hedged for page in formatted_pages)
+
+    return ZeroxOutput(
+        completion_time=completion_time,
+        file_name=get_file_name(file_path),
+        input_tokens=sum(page.input_tokens for page in formatted_pages),
+        output_tokens=sum(page.output_tokens for page in formatted_pages),
+        pages=formatted_pages,
+        cached_input_tokens=sum(page.cached_input_tokens for page in formatted_pages),
+        cache_hits=cache_hits,
+        ## pages skipped by the page filter or taken from the text layer never reach the cache
+        cache_misses=len(formatted_pages) - cache_hits - blank_pages - duplicate_pages - text_layer_pages if cache else 0,
+        image_bytes=sum(page.image_bytes for page in formatted_pages),
+        blank_pages=blank_pages,
+        duplicate_pages=duplicate_pages,
+        text_layer_pages=text_layer_pages,
+        hedged_pages=hedged_pages,
+        hedge_input_tokens=sum(page.hedge_input_tokens for page in formatted_pages),
+        hedge_output_tokens=sum(page.hedge_output_tokens for page in formatted_pages),
+        stage_timings=stage_timings or {},
+    )
+
+
+async def validate_model(vision_model: BaseModel, recorder: Optional[MetricsRecorder] = None) -> None:
+    """Validates the model in a worker thread, timed as the validation stage."""
+    with timed(recorder, MetricsStage.VALIDATION):
+        await asyncio.to_thread(vision_model.validate)
+
+
+def get_file_name(file_path: str) -> str:
+    """Returns a filesystem-safe name for the output markdown derived from the input file path."""
+    raw_file_name = os.path.splitext(os.path.basename(file_path))[0]
+    file_name = "".join(c.lower() if c.isalnum() else "_" for c in raw_file_name)
+    # Truncate file name to 255 characters to prevent ENAMETOOLONG errors
+    return file_name[:255]
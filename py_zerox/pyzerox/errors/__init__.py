@@ -1,21 +1,37 @@
 from .exceptions import (
     NotAVisionModel,
     ModelAccessError,
+    InvalidMaintainFormatMode,
+    InvalidModelBackend,
+    InvalidPDFRenderer,
+    RasterizeWorkerError,
+    ModelRequestError,
     PageNumberOutOfBoundError,
     MissingEnvironmentVariables,
     ResourceUnreachableException,
     FileUnavailable,
+    FileTooLarge,
     FailedToSaveFile,
+    DuplicateOutputFile,
     FailedToProcessFile,
+    UnsupportedImageFormat,
 )
 
 __all__ = [
     "NotAVisionModel",
     "ModelAccessError",
+    "InvalidMaintainFormatMode",
+    "InvalidModelBackend",
+    "InvalidPDFRenderer",
+    "RasterizeWorkerError",
+    "ModelRequestError",
     "PageNumberOutOfBoundError",
     "MissingEnvironmentVariables",
     "ResourceUnreachableException",
     "FileUnavailable",
+    "FileTooLarge",
     "FailedToSaveFile",
+    "DuplicateOutputFile",
     "FailedToProcessFile",
+    "UnsupportedImageFormat",
 ]
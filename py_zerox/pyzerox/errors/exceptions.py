@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Mapping, Optional
 
 # Package Imports
 from ..constants import Messages
@@ -35,6 +35,60 @@ class ModelAccessError(CustomException):
     ):
         super().__init__(message, extra_info)
 
+class InvalidMaintainFormatMode(CustomException):
+    """Exception raised when an unknown maintain_format_mode is provided."""
+
+    def __init__(
+        self,
+        message: str = Messages.INVALID_MAINTAIN_FORMAT_MODE,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+class InvalidModelBackend(CustomException):
+    """Exception raised when an unknown model_backend is provided."""
+
+    def __init__(
+        self,
+        message: str = Messages.INVALID_MODEL_BACKEND,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+class InvalidPDFRenderer(CustomException):
+    """Exception raised when an unknown renderer is provided."""
+
+    def __init__(
+        self,
+        message: str = Messages.INVALID_PDF_RENDERER,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+class RasterizeWorkerError(CustomException):
+    """Exception raised when the rasterization worker processes can't be started or stop unexpectedly."""
+
+    def __init__(
+        self,
+        message: str = Messages.RASTERIZE_WORKER_DIED,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+class ModelRequestError(CustomException):
+    """Exception raised when a model server responds with an error status, carrying the status code and headers for the retry and rate limit handling."""
+
+    def __init__(
+        self,
+        message: str = Messages.MODEL_REQUEST_ERROR,
+        extra_info: Optional[Dict] = None,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        super().__init__(message, extra_info)
+        self.status_code = status_code
+        self.headers = headers or {}
+
 class PageNumberOutOfBoundError(CustomException):
     """Exception invalid page number(s) provided."""
 
@@ -56,6 +110,17 @@ class ResourceUnreachableException(CustomException):
         super().__init__(message, extra_info)
 
 
+class FileTooLarge(CustomException):
+    """Exception raised when a file exceeds the maximum allowed size."""
+
+    def __init__(
+        self,
+        message: str = Messages.FILE_TOO_LARGE,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+
 class FileUnavailable(CustomException):
     """Exception raised when a file is unavailable."""
 
@@ -78,6 +143,17 @@ class FailedToSaveFile(CustomException):
         super().__init__(message, extra_info)
 
 
+class DuplicateOutputFile(CustomException):
+    """Exception raised when several documents of a batch would write the same markdown file."""
+
+    def __init__(
+        self,
+        message: str = Messages.DUPLICATE_OUTPUT_FILE,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
+
+
 class FailedToProcessFile(CustomException):
     """Exception raised when a file fails to process."""
 
@@ -87,3 +163,14 @@ class FailedToProcessFile(CustomException):
         extra_info: Optional[Dict] = None,
     ):
         super().__init__(message, extra_info)
+
+
+class UnsupportedImageFormat(CustomException):
+    """Exception raised when an unsupported page image format is requested."""
+
+    def __init__(
+        self,
+        message: str = Messages.UNSUPPORTED_IMAGE_FORMAT,
+        extra_info: Optional[Dict] = None,
+    ):
+        super().__init__(message, extra_info)
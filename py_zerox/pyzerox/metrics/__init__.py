@@ -0,0 +1,14 @@
+from .base import MetricsHook
+from .recorder import MetricsRecorder, create_recorder, get_hooks, timed
+from .timings import StageTimingsHook
+from .types import StageTiming
+
+__all__ = [
+    "MetricsHook",
+    "MetricsRecorder",
+    "StageTimingsHook",
+    "StageTiming",
+    "create_recorder",
+    "get_hooks",
+    "timed",
+]
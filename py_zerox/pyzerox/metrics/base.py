@@ -0,0 +1,38 @@
+from typing import Any, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..core.types import Page, ZeroxOutput
+
+
+class MetricsHook:
+    """
+    Base class for metrics hooks, e.g. exporters to Prometheus style counters or OpenTelemetry spans.
+    Every method is a no-op, so subclasses only implement what they need. Hooks are called from the event loop
+    and, for the rasterization stages, from worker threads, so they should be quick and thread safe.
+    """
+
+    def on_stage(
+        self,
+        stage: str,
+        start_time: float,
+        duration: float,
+        attributes: Dict[str, Any],
+    ) -> None:
+        """
+        Called when a stage (one of MetricsStage) finishes.
+
+        :param stage: The stage.
+        :type stage: str
+        :param start_time: When the stage started, in seconds since the epoch (time.time()).
+        :type start_time: float
+        :param duration: How long the stage took, in milliseconds.
+        :type duration: float
+        :param attributes: Details of the stage, e.g. the number of pages rasterized.
+        :type attributes: Dict[str, Any]
+        """
+
+    def on_page(self, page: "Page") -> None:
+        """Called when a page is done, with its status, tokens and timings."""
+
+    def on_document(self, output: "ZeroxOutput") -> None:
+        """Called when a document is done, by zerox and zerox_batch."""
@@ -0,0 +1,73 @@
+import contextlib
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union, TYPE_CHECKING
+
+# Package Imports
+from .base import MetricsHook
+
+if TYPE_CHECKING:
+    from ..core.types import Page, ZeroxOutput
+
+## shared by every stage timed without a recorder
+_NO_OP = contextlib.nullcontext()
+
+
+class MetricsRecorder:
+    """
+    Times the stages of processing a document and hands them, along with the finished pages, to the metrics hooks.
+    """
+
+    def __init__(self, hooks: Sequence[MetricsHook]):
+        self.hooks: List[MetricsHook] = list(hooks)
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, **attributes: Any) -> Iterator[None]:
+        """Times the enclosed block as the stage."""
+        start_time, started_at = time.time(), time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, start_time, (time.perf_counter() - started_at) * 1000, attributes)
+
+    def record(self, stage: str, start_time: float, duration: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Records a stage that started at start_time (time.time()) and took duration milliseconds."""
+        for hook in self.hooks:
+            try:
+                hook.on_stage(stage, start_time, duration, attributes or {})
+            except Exception as error:
+                logging.warning(f"Metrics hook failed on stage {stage}. Error:{error}")
+
+    def page(self, page: "Page") -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_page(page)
+            except Exception as error:
+                logging.warning(f"Metrics hook failed on page {page.page}. Error:{error}")
+
+    def document(self, output: "ZeroxOutput") -> None:
+        for hook in self.hooks:
+            try:
+                hook.on_document(output)
+            except Exception as error:
+                logging.warning(f"Metrics hook failed on document {output.file_name}. Error:{error}")
+
+
+def get_hooks(metrics: Optional[Union[MetricsHook, Sequence[MetricsHook]]]) -> List[MetricsHook]:
+    """Returns the metrics hooks as a list, whether a single hook, several or None were given."""
+    if metrics is None:
+        return []
+    return [metrics] if isinstance(metrics, MetricsHook) else list(metrics)
+
+
+def create_recorder(metrics: Optional[Union[MetricsHook, Sequence[MetricsHook]]]) -> Optional[MetricsRecorder]:
+    """Returns a recorder for the metrics hooks, or None without hooks so that nothing is timed."""
+    hooks = get_hooks(metrics)
+    return MetricsRecorder(hooks) if hooks else None
+
+
+def timed(recorder: Optional[MetricsRecorder], stage: str, **attributes: Any) -> contextlib.AbstractContextManager:
+    """Times the stage with the recorder, a shared no-op context manager without one."""
+    if recorder is None:
+        return _NO_OP
+    return recorder.stage(stage, **attributes)
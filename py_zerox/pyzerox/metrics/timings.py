@@ -0,0 +1,23 @@
+import threading
+from typing import Any, Dict
+
+# Package Imports
+from .base import MetricsHook
+from .types import StageTiming
+
+
+class StageTimingsHook(MetricsHook):
+    """
+    Metrics hook aggregating the count, total and maximum duration of every stage, as reported in ZeroxOutput.stage_timings.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, StageTiming] = {}
+        self._lock = threading.Lock()
+
+    def on_stage(self, stage: str, start_time: float, duration: float, attributes: Dict[str, Any]) -> None:
+        with self._lock:
+            timing = self.timings.setdefault(stage, StageTiming())
+            timing.count += 1
+            timing.total += duration
+            timing.max = max(timing.max, duration)
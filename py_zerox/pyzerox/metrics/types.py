@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class StageTiming:
+    """
+    Dataclass to store the aggregated timings of a processing stage, in milliseconds.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
@@ -1,7 +1,32 @@
-from .modellitellm import litellmmodel
+import importlib
+
+from .base import BaseModel
+from .chat import ChatModel
+from .registry import create_model, get_model_backend, register_model_backend
 from .types import CompletionResponse
 
+## backends whose dependencies are slow to import (litellm, aiohttp), imported when they are first used
+_lazy_attributes = {
+    "litellmmodel": ".modellitellm",
+    "OpenAICompatibleModel": ".openai_compatible",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
+    "BaseModel",
+    "ChatModel",
     "litellmmodel",
+    "OpenAICompatibleModel",
     "CompletionResponse",
+    "create_model",
+    "get_model_backend",
+    "register_model_backend",
 ]
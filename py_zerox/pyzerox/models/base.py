@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Type, TypeVar, TYPE_CHECKING
+from typing import List, Optional, Tuple, TypeVar, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..models import CompletionResponse
@@ -9,26 +9,67 @@ T = TypeVar("T", bound="BaseModel")
 class BaseModel(ABC):
     """
     Base class for all models.
+    Backends can be passed to zerox as instances, or registered by name with register_model_backend and selected with model_backend.
     """
 
+    ## the system prompt sent with every page, overridden by custom_system_prompt
+    system_prompt: str = ""
+
     @abstractmethod
     async def completion(
         self,
+        image_path: Optional[str],
+        maintain_format: bool,
+        prior_page: str,
+        image_data: Optional[Union[bytes, memoryview, List[bytes]]] = None,
+        mime_type: str = "image/png",
     ) -> "CompletionResponse":
+        """
+        Converts a page image to markdown.
+
+        :param image_path: Path to the image file, ignored when image_data is given.
+        :type image_path: str
+        :param maintain_format: Whether to maintain the format from the previous page.
+        :type maintain_format: bool
+        :param prior_page: The markdown content of the previous page.
+        :type prior_page: str
+        :param image_data: The encoded image bytes, or its tiles in page order, to skip reading the image from disk, defaults to None
+        :type image_data: bytes, memoryview or List[bytes], optional
+        :param mime_type: The MIME type of the image, defaults to "image/png"
+        :type mime_type: str, optional
+        """
         raise NotImplementedError("Subclasses must implement this method")
-    
+
+    async def completion_pages(
+        self,
+        pages: List[Tuple[Optional[str], Optional[Union[bytes, memoryview, List[bytes]]], str]],
+    ) -> "CompletionResponse":
+        """
+        Converts several page images to markdown with one request, for pages_per_request.
+        Models that don't implement it get their pages one by one.
+        """
+        raise NotImplementedError("This model doesn't support several pages per request")
+
     @abstractmethod
     def validate_access(
         self,
     ) -> None:
         raise NotImplementedError("Subclasses must implement this method")
-    
+
     @abstractmethod
     def validate_model(
         self,
     ) -> None:
         raise NotImplementedError("Subclasses must implement this method")
 
+    def validate(self) -> None:
+        """Validates the model and access to it, called in a worker thread for models created by name."""
+        self.validate_model()
+        self.validate_access()
+
+    async def close(self) -> None:
+        """Releases the resources of the model, e.g. its HTTP connections. zerox closes the models it creates by name."""
+
     def __init__(
         self,
         model: Optional[str] = None,
@@ -40,5 +81,3 @@ class BaseModel(ABC):
         ## validations
         # self.validate_model()
         # self.validate_access()
-
-
@@ -0,0 +1,197 @@
+from abc import abstractmethod
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+# Package Imports
+from .base import BaseModel
+from .types import CompletionResponse
+from ..constants.prompts import Prompts
+from ..constants.batching import BatchingDefaultOptions
+from ..constants.prompt_caching import PromptCachingDefaultOptions
+
+DEFAULT_SYSTEM_PROMPT = Prompts.DEFAULT_SYSTEM_PROMPT
+
+
+class ChatModel(BaseModel):
+    """
+    Base class for models taking OpenAI style chat completion messages, such as litellmmodel and OpenAICompatibleModel.
+    Prepares the system prompt, the formatting context and the page images of each request, subclasses send them in _request_completion.
+    """
+
+    ## setting the default system prompt
+    _system_prompt = DEFAULT_SYSTEM_PROMPT
+
+    ## whether the system prompt is marked for provider prompt caching
+    prompt_caching: bool = False
+
+    @property
+    def system_prompt(self) -> str:
+        '''Returns the system prompt for the model.'''
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, prompt: str) -> None:
+        '''
+        Sets/overrides the system prompt for the model.
+        '''
+        self._system_prompt = prompt
+
+    async def completion(
+        self,
+        image_path: Optional[str],
+        maintain_format: bool,
+        prior_page: str,
+        image_data: Optional[Union[bytes, memoryview, List[bytes]]] = None,
+        mime_type: str = "image/png",
+    ) -> CompletionResponse:
+        """Completion for image to markdown conversion.
+
+        :param image_path: Path to the image file, ignored when image_data is given.
+        :type image_path: str
+        :param maintain_format: Whether to maintain the format from the previous page.
+        :type maintain_format: bool
+        :param prior_page: The markdown content of the previous page.
+        :type prior_page: str
+        :param image_data: The encoded image bytes, or its tiles in page order, to skip reading the image from disk, defaults to None
+        :type image_data: bytes, memoryview or List[bytes], optional
+        :param mime_type: The MIME type of the image, defaults to "image/png"
+        :type mime_type: str, optional
+
+        :return: The markdown content generated by the model.
+        """
+        messages = await self._prepare_messages(
+            image_path=image_path,
+            maintain_format=maintain_format,
+            prior_page=prior_page,
+            image_data=image_data,
+            mime_type=mime_type,
+        )
+
+        return await self._request_completion(messages)
+
+    async def completion_pages(
+        self,
+        pages: List[Tuple[Optional[str], Optional[Union[bytes, memoryview, List[bytes]]], str]],
+    ) -> CompletionResponse:
+        """Completion converting several pages to markdown with one request.
+        Every page image is preceded by its page delimiter (BatchingDefaultOptions.PAGE_DELIMITER), and the model is asked to start the markdown of each page with it.
+
+        :param pages: (image_path, image_data, mime_type) of each page in order, as for completion.
+        :type pages: List[Tuple[Optional[str], Optional[Union[bytes, memoryview, List[bytes]]], str]]
+
+        :return: The markdown content of all the pages, delimited per page.
+        """
+        messages: List[Dict[str, Any]] = [
+            self._prepare_system_message(),
+            {
+                "role": "system",
+                "content": Prompts.MULTI_PAGE_PROMPT.format(len(pages)),
+            },
+        ]
+
+        content: List[Dict[str, Any]] = []
+        for page_number, (image_path, image_data, mime_type) in enumerate(pages, start=1):
+            content.append({"type": "text", "text": BatchingDefaultOptions.PAGE_DELIMITER.format(page_number)})
+            content.extend(await self._prepare_image_content(image_path, image_data, mime_type))
+        messages.append({"role": "user", "content": content})
+
+        return await self._request_completion(messages)
+
+    @abstractmethod
+    async def _request_completion(self, messages: List[Dict[str, Any]]) -> CompletionResponse:
+        """Sends the messages to the model and returns its completion."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    async def _prepare_messages(
+        self,
+        image_path: Optional[str],
+        maintain_format: bool,
+        prior_page: str,
+        image_data: Optional[Union[bytes, memoryview, List[bytes]]] = None,
+        mime_type: str = "image/png",
+    ) -> List[Dict[str, Any]]:
+        """Prepares the messages to send to the chat completions API.
+
+        :param image_path: Path to the image file, ignored when image_data is given.
+        :type image_path: str
+        :param maintain_format: Whether to maintain the format from the previous page.
+        :type maintain_format: bool
+        :param prior_page: The markdown content of the previous page.
+        :type prior_page: str
+        :param image_data: The encoded image bytes, or its tiles in page order, defaults to None
+        :type image_data: bytes, memoryview or List[bytes], optional
+        :param mime_type: The MIME type of the image, defaults to "image/png"
+        :type mime_type: str, optional
+        """
+        # Default system message
+        messages: List[Dict[str, Any]] = [self._prepare_system_message()]
+
+        # If content has already been generated, add it to context.
+        # This helps maintain the same format across pages.
+        if maintain_format and prior_page:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f'Markdown must maintain consistent formatting with the following page: \n\n """{prior_page}"""',
+                },
+            )
+
+        # Add Image to request
+        messages.append(
+            {
+                "role": "user",
+                "content": await self._prepare_image_content(image_path, image_data, mime_type),
+            }
+        )
+
+        return messages
+
+    def _prepare_system_message(self) -> Dict[str, Any]:
+        """Prepares the system prompt message, marked for provider prompt caching when enabled as it is the same for every page."""
+        if not self.prompt_caching:
+            return {"role": "system", "content": self._system_prompt}
+        return {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": self._system_prompt,
+                    "cache_control": PromptCachingDefaultOptions.CACHE_CONTROL,
+                }
+            ],
+        }
+
+    @staticmethod
+    def _get_cached_tokens(usage: Any) -> int:
+        """Returns the input tokens read from the prompt cache, from OpenAI style (prompt_tokens_details) or Anthropic style (cache_read_input_tokens) usage."""
+
+        def get_field(value: Any, name: str) -> Any:
+            if isinstance(value, dict):
+                return value.get(name)
+            return getattr(value, name, None)
+
+        cached_tokens = get_field(get_field(usage, "prompt_tokens_details"), "cached_tokens")
+        return cached_tokens or get_field(usage, "cache_read_input_tokens") or 0
+
+    async def _prepare_image_content(
+        self,
+        image_path: Optional[str],
+        image_data: Optional[Union[bytes, memoryview, List[bytes]]],
+        mime_type: str,
+    ) -> List[Dict[str, Any]]:
+        """Prepares the message content of a page image, a tiled page is sent as one image per tile."""
+        ## imported here, as the processor imports the models
+        from ..processor.image import encode_image_to_base64, encode_image_data_to_base64
+
+        if image_data is None:
+            base64_images = [await encode_image_to_base64(image_path)]
+        elif isinstance(image_data, list):
+            base64_images = [encode_image_data_to_base64(tile) for tile in image_data]
+        else:
+            base64_images = [encode_image_data_to_base64(image_data)]
+        return [
+            {
+                "type": "image_url",
+                "image_url": {"url": f"data:{mime_type};base64,{base64_image}"},
+            }
+            for base64_image in base64_images
+        ]
@@ -1,55 +1,93 @@
 import os
-import aiohttp
+import hashlib
+import json
+import time
 import litellm
 from typing import List, Dict, Any, Optional
 
 # Package Imports
-from .base import BaseModel
+from .chat import ChatModel
 from .types import CompletionResponse
 from ..errors import ModelAccessError, NotAVisionModel, MissingEnvironmentVariables
 from ..constants.messages import Messages
-from ..constants.prompts import Prompts
-from ..processor.image import encode_image_to_base64
+from ..constants.validation import ValidationDefaultOptions
+from ..constants.prompt_caching import PromptCachingDefaultOptions
 
-DEFAULT_SYSTEM_PROMPT = Prompts.DEFAULT_SYSTEM_PROMPT
+## expiry (time.monotonic) of successful validations, by validation fingerprint
+_validated_until: Dict[str, float] = {}
 
 
-class litellmmodel(BaseModel):
-    ## setting the default system prompt
-    _system_prompt = DEFAULT_SYSTEM_PROMPT
-
+class litellmmodel(ChatModel):
     def __init__(
         self,
         model: Optional[str] = None,
+        check_access: bool = True,
+        defer_validation: bool = False,
+        prompt_caching: Optional[bool] = None,
         **kwargs,
     ):
         """
         Initializes the Litellm model interface.
         :param model: The model to use for generating completions, defaults to "gpt-4o-mini". Refer: https://docs.litellm.ai/docs/providers
         :type model: str, optional
-        
+        :param check_access: Whether to validate access to the model with a request to the provider, defaults to True
+        :type check_access: bool, optional
+        :param defer_validation: Whether to skip validation on construction so that the caller can run validate() later, e.g. in a thread alongside other work, defaults to False
+        :type defer_validation: bool, optional
+        :param prompt_caching: Whether to mark the system prompt for provider prompt caching with a cache_control block, defaults to None (marked for models that support prompt caching and need explicit markers, such as Claude)
+        :type prompt_caching: bool, optional
+
         :param kwargs: Additional keyword arguments to pass to self.completion -> litellm.completion. Refer: https://docs.litellm.ai/docs/providers and https://docs.litellm.ai/docs/completion/input
         """
         super().__init__(model=model, **kwargs)
+        self.check_access = check_access
+        self.prompt_caching = self.supports_prompt_caching() if prompt_caching is None else prompt_caching
+
+        if not defer_validation:
+            self.validate()
+
+    ## custom methods on top of BaseModel
+    def validate(self) -> None:
+        """
+        Validates the environment, the model and (with check_access) access to the model.
+        Successful validations are cached process wide for ValidationDefaultOptions.TTL seconds, keyed by the model and a fingerprint of its credentials.
+        """
+        fingerprint = self._validation_fingerprint()
+        if _validated_until.get(fingerprint, 0) > time.monotonic():
+            return
 
         ## calling custom methods to validate the environment and model
         self.validate_environment()
         self.validate_model()
-        self.validate_access()
+        if self.check_access:
+            self.validate_access()
+
+        _validated_until[fingerprint] = time.monotonic() + ValidationDefaultOptions.TTL
+
+    def _validation_fingerprint(self) -> str:
+        """Hashes the model together with the credentials passed as kwargs or found in the environment."""
+        credentials = {
+            name: value
+            for name, value in os.environ.items()
+            if name.endswith(ValidationDefaultOptions.CREDENTIAL_ENV_SUFFIXES)
+        }
+        credentials.update(self.kwargs)
+        payload = json.dumps(
+            [self.model, self.check_access, credentials], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    @property
-    def system_prompt(self) -> str:
-        '''Returns the system prompt for the model.'''
-        return self._system_prompt
-    
-    @system_prompt.setter
-    def system_prompt(self, prompt: str) -> None:
-        '''
-        Sets/overrides the system prompt for the model.
-        '''
-        self._system_prompt = prompt
+    def supports_prompt_caching(self) -> bool:
+        """Whether the model supports prompt caching and only caches prompts marked with cache_control blocks."""
+        model_name = (self.model or "").lower()
+        if not any(pattern in model_name for pattern in PromptCachingDefaultOptions.EXPLICIT_MARKER_PATTERNS):
+            return False
+        try:
+            return litellm.utils.supports_prompt_caching(model=self.model)
+        except Exception:
+            ## unknown models, or a litellm version without prompt caching support
+            return False
 
-    ## custom method on top of BaseModel
     def validate_environment(self) -> None:
         """Validates the environment variables required for the model."""
         env_config = litellm.validate_environment(model=self.model)
@@ -68,29 +106,8 @@ class litellmmodel(BaseModel):
             raise ModelAccessError(extra_info={"model": self.model})
         
 
-    async def completion(
-        self,
-        image_path: str,
-        maintain_format: bool,
-        prior_page: str,
-    ) -> CompletionResponse:
-        """LitellM completion for image to markdown conversion.
-
-        :param image_path: Path to the image file.
-        :type image_path: str
-        :param maintain_format: Whether to maintain the format from the previous page.
-        :type maintain_format: bool
-        :param prior_page: The markdown content of the previous page.
-        :type prior_page: str
-
-        :return: The markdown content generated by the model.
-        """
-        messages = await self._prepare_messages(
-            image_path=image_path,
-            maintain_format=maintain_format,
-            prior_page=prior_page,
-        )
-
+    async def _request_completion(self, messages: List[Dict[str, Any]]) -> CompletionResponse:
+        """Sends the messages to the LiteLLM Completion API."""
         try:
             response = await litellm.acompletion(model=self.model, messages=messages, **self.kwargs)
 
@@ -99,57 +116,9 @@ class litellmmodel(BaseModel):
                     content=response["choices"][0]["message"]["content"],
                     input_tokens=response["usage"]["prompt_tokens"],
                     output_tokens=response["usage"]["completion_tokens"],
+                    cached_input_tokens=self._get_cached_tokens(response["usage"]),
                 )
             return response
         
         except Exception as err:
-            raise Exception(Messages.COMPLETION_ERROR.format(err))
-
-    async def _prepare_messages(
-        self,
-        image_path: str,
-        maintain_format: bool,
-        prior_page: str,
-    ) -> List[Dict[str, Any]]:
-        """Prepares the messages to send to the LiteLLM Completion API.
-
-        :param image_path: Path to the image file.
-        :type image_path: str
-        :param maintain_format: Whether to maintain the format from the previous page.
-        :type maintain_format: bool
-        :param prior_page: The markdown content of the previous page.
-        :type prior_page: str
-        """
-        # Default system message
-        messages: List[Dict[str, Any]] = [
-            {
-                "role": "system",
-                "content": self._system_prompt,
-            },
-        ]
-
-        # If content has already been generated, add it to context.
-        # This helps maintain the same format across pages.
-        if maintain_format and prior_page:
-            messages.append(
-                {
-                    "role": "system",
-                    "content": f'Markdown must maintain consistent formatting with the following page: \n\n """{prior_page}"""',
-                },
-            )
-
-        # Add Image to request
-        base64_image = await encode_image_to_base64(image_path)
-        messages.append(
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{base64_image}"},
-                    },
-                ],
-            }
-        )
-
-        return messages
+            raise Exception(Messages.COMPLETION_ERROR.format(err)) from err
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import urllib.error
+import urllib.request
+import warnings
+import aiohttp
+from typing import List, Dict, Any, Optional
+
+# Package Imports
+from .chat import ChatModel
+from .types import CompletionResponse
+from ..constants import OpenAICompatibleDefaultOptions
+from ..constants.messages import Messages
+from ..errors import ModelAccessError, ModelRequestError
+
+
+class OpenAICompatibleModel(ChatModel):
+    """
+    Model backend for servers exposing the OpenAI chat completions API, e.g. a local vLLM or llama.cpp server, without going through litellm.
+    Requests share one pooled aiohttp session, kept open across pages and documents until close().
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        check_access: bool = True,
+        defer_validation: bool = False,
+        prompt_caching: Optional[bool] = None,
+        **kwargs,
+    ):
+        """
+        Initializes the OpenAI compatible model interface.
+        :param model: The model name the server serves, as listed by its /models endpoint.
+        :type model: str, optional
+        :param base_url: The base URL of the API, defaults to the OPENAI_COMPATIBLE_BASE_URL environment variable or "http://localhost:8000/v1"
+        :type base_url: str, optional
+        :param api_key: The API key sent as a bearer token, defaults to the OPENAI_COMPATIBLE_API_KEY environment variable (none for local servers without authentication)
+        :type api_key: str, optional
+        :param check_access: Whether to validate that the server serves the model with a request to its /models endpoint, defaults to True
+        :type check_access: bool, optional
+        :param defer_validation: Whether to skip validation on construction so that the caller can run validate() later, defaults to False
+        :type defer_validation: bool, optional
+        :param prompt_caching: Whether to mark the system prompt with a cache_control block, defaults to None (not marked, local servers cache prompt prefixes automatically)
+        :type prompt_caching: bool, optional
+
+        :param kwargs: Additional parameters of the chat completions request, e.g. temperature or max_tokens.
+        """
+        super().__init__(model=model, **kwargs)
+        self.base_url = (
+            base_url or os.environ.get(OpenAICompatibleDefaultOptions.BASE_URL_ENV) or OpenAICompatibleDefaultOptions.BASE_URL
+        ).rstrip("/")
+        self.api_key = api_key or os.environ.get(OpenAICompatibleDefaultOptions.API_KEY_ENV)
+        self.check_access = check_access
+        self.prompt_caching = bool(prompt_caching)
+
+        ## created on the first request, in the event loop it is used from
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        if not defer_validation:
+            self.validate()
+
+    def validate_model(self) -> None:
+        """Vision support can't be checked on a generic server, the model is trusted to be a vision model."""
+
+    def validate_access(self) -> None:
+        """Validates that the server is reachable and serves the model, from its /models endpoint."""
+        if not self.check_access:
+            return
+        request = urllib.request.Request(f"{self.base_url}/models", headers=self._get_headers())
+        try:
+            with urllib.request.urlopen(request, timeout=OpenAICompatibleDefaultOptions.CONNECT_TIMEOUT) as response:
+                served_models = [served_model["id"] for served_model in json.load(response).get("data", [])]
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as error:
+            raise ModelAccessError(extra_info={"model": self.model, "base_url": self.base_url, "error": str(error)})
+        if served_models and self.model not in served_models:
+            raise ModelAccessError(extra_info={"model": self.model, "base_url": self.base_url, "served_models": served_models})
+
+    async def close(self) -> None:
+        """Closes the HTTP session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled HTTP session, creating it on first use or when the model is used from another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is not loop:
+            await self._close_stale_session()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=OpenAICompatibleDefaultOptions.CONNECTION_LIMIT,
+                    keepalive_timeout=OpenAICompatibleDefaultOptions.KEEPALIVE_TIMEOUT,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=OpenAICompatibleDefaultOptions.CONNECT_TIMEOUT,
+                    sock_read=OpenAICompatibleDefaultOptions.READ_TIMEOUT,
+                ),
+                headers=self._get_headers(),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _close_stale_session(self) -> None:
+        """Closes the session of another event loop (e.g. of an earlier asyncio.run) before it is replaced."""
+        session, session_loop = self._session, self._session_loop
+        self._session = None
+        if session_loop is None or session_loop.is_closed():
+            # The connections went with their loop, closing only marks the session and its connector closed
+            await session.close()
+        elif session_loop.is_running():
+            # The loop runs in another thread, the session is closed there
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), session_loop))
+        else:
+            warnings.warn(Messages.STALE_MODEL_SESSION, ResourceWarning)
+
+    def _get_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def _request_completion(self, messages: List[Dict[str, Any]]) -> CompletionResponse:
+        """Sends the messages to the chat completions endpoint of the server."""
+        try:
+            payload = {"model": self.model, "messages": messages, **self.kwargs}
+            session = await self._get_session()
+            async with session.post(f"{self.base_url}/chat/completions", json=payload) as response:
+                if response.status != 200:
+                    raise ModelRequestError(
+                        Messages.MODEL_REQUEST_ERROR.format(response.status, await response.text()),
+                        status_code=response.status,
+                        headers=response.headers,
+                    )
+                data = await response.json()
+
+            usage = data.get("usage") or {}
+            return CompletionResponse(
+                content=data["choices"][0]["message"]["content"],
+                input_tokens=usage.get("prompt_tokens", 0),
+                output_tokens=usage.get("completion_tokens", 0),
+                cached_input_tokens=self._get_cached_tokens(usage),
+            )
+
+        except Exception as err:
+            raise Exception(Messages.COMPLETION_ERROR.format(err)) from err
@@ -0,0 +1,39 @@
+import importlib
+from typing import Dict, Type, Union
+
+# Package Imports
+from .base import BaseModel
+from ..constants import ModelBackend
+from ..constants.messages import Messages
+from ..errors import InvalidModelBackend
+
+## model backends by name, as classes or as "module:class" paths imported on first use, so that unused backends (and litellm) are never imported
+_model_backends: Dict[str, Union[str, Type[BaseModel]]] = {
+    ModelBackend.LITELLM: ".modellitellm:litellmmodel",
+    ModelBackend.OPENAI_COMPATIBLE: ".openai_compatible:OpenAICompatibleModel",
+}
+
+
+def register_model_backend(name: str, backend: Union[str, Type[BaseModel]]) -> None:
+    """
+    Registers a model backend under a name, to be selected with model_backend.
+    The backend is a BaseModel subclass, or a "module:class" path to import it from when it is first selected.
+    It is created as backend(model=model, check_access=..., defer_validation=True, prompt_caching=..., **kwargs), then validated with validate().
+    """
+    _model_backends[name] = backend
+
+
+def get_model_backend(name: str) -> Type[BaseModel]:
+    """Returns the model backend registered under a name, importing it if needed."""
+    if name not in _model_backends:
+        raise InvalidModelBackend(Messages.INVALID_MODEL_BACKEND.format(name, ", ".join(_model_backends)))
+    backend = _model_backends[name]
+    if isinstance(backend, str):
+        module_name, class_name = backend.split(":")
+        backend = _model_backends[name] = getattr(importlib.import_module(module_name, __package__), class_name)
+    return backend
+
+
+def create_model(model: str, model_backend: str = ModelBackend.LITELLM, **kwargs) -> BaseModel:
+    """Creates a model of the named backend, see register_model_backend."""
+    return get_model_backend(model_backend)(model=model, **kwargs)
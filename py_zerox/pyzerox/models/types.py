@@ -10,3 +10,6 @@ class CompletionResponse:
     content: str
     input_tokens: int
     output_tokens: int
+    cache_hit: bool = False
+    ## input tokens read from the provider's prompt cache, included in input_tokens
+    cached_input_tokens: int = 0
@@ -1,19 +1,85 @@
-from .image import save_image, encode_image_to_base64
+from .image import save_image, encode_image, encode_image_to_base64, encode_image_data_to_base64, image_to_bytes
 from .pdf import (
     convert_pdf_to_images,
+    render_page_range,
+    iter_pdf_images,
+    get_pdf_page_count,
+    validate_page_numbers,
     process_page,
+    process_page_batch,
     process_pages_in_batches,
+    process_pages_as_completed,
+    process_pages_in_order,
 )
+from .batching import split_pages
+from .context import get_context_pages
+from .filter import PageClassifier, difference_hash, load_page_thumbnail
+from .image_input import detect_file_type, get_image_frame_count, iter_image_pages, load_image_frame
+from .renderers import BasePDFRenderer, PopplerRenderer, PdfiumRenderer, get_renderer, register_renderer
+from .hedging import HedgedCompletionResponse, RequestHedger
+from .limiter import AdaptiveConcurrencyLimiter, FairSemaphore, FairSemaphoreShare, TokenBudget
 from .text import format_markdown
-from .utils import download_file, create_selected_pages_pdf
+from .text_layer import extract_text_layer
+from .types import PageResult, ImageEncoding, EncodedImage, PageFilter, TextLayerPage, HedgingPolicy
+from .utils import (
+    download_file,
+    create_http_session,
+    create_selected_pages_pdf,
+    get_page_runs,
+    iterate_async,
+    iterate_after,
+    fill_skipped,
+)
 
 __all__ = [
     "save_image",
+    "encode_image",
     "encode_image_to_base64",
+    "encode_image_data_to_base64",
+    "image_to_bytes",
     "convert_pdf_to_images",
+    "render_page_range",
+    "iter_pdf_images",
+    "get_pdf_page_count",
+    "validate_page_numbers",
+    "detect_file_type",
+    "get_image_frame_count",
+    "iter_image_pages",
+    "load_image_frame",
+    "BasePDFRenderer",
+    "PopplerRenderer",
+    "PdfiumRenderer",
+    "get_renderer",
+    "register_renderer",
+    "AdaptiveConcurrencyLimiter",
+    "FairSemaphore",
+    "FairSemaphoreShare",
+    "TokenBudget",
+    "HedgingPolicy",
+    "RequestHedger",
+    "HedgedCompletionResponse",
     "format_markdown",
+    "PageResult",
+    "ImageEncoding",
+    "EncodedImage",
+    "PageFilter",
+    "PageClassifier",
+    "difference_hash",
+    "load_page_thumbnail",
+    "TextLayerPage",
+    "extract_text_layer",
     "download_file",
+    "create_http_session",
     "process_page",
+    "process_page_batch",
+    "split_pages",
     "process_pages_in_batches",
+    "process_pages_as_completed",
+    "process_pages_in_order",
+    "get_context_pages",
     "create_selected_pages_pdf",
+    "get_page_runs",
+    "iterate_async",
+    "iterate_after",
+    "fill_skipped",
 ]
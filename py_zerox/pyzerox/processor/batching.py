@@ -0,0 +1,27 @@
+import re
+from typing import List, Optional
+
+# Package Imports
+from ..constants.patterns import Patterns
+
+
+def split_pages(content: str, page_count: int) -> Optional[List[str]]:
+    """
+    Splits the response to a multi-page request into the markdown of each page, by its page delimiters.
+    Returns None unless the response has exactly the delimiters of pages 1 to page_count, in order, so that pages are never misattributed.
+    """
+    delimiters = list(re.finditer(Patterns.MATCH_PAGE_DELIMITER, content, flags=re.IGNORECASE | re.MULTILINE))
+    if [int(delimiter.group(1)) for delimiter in delimiters] != list(range(1, page_count + 1)):
+        return None
+
+    # Anything before the first delimiter is preamble and dropped
+    pages = []
+    for delimiter, next_delimiter in zip(delimiters, delimiters[1:] + [None]):
+        end = next_delimiter.start() if next_delimiter else len(content)
+        pages.append(content[delimiter.end() : end].strip())
+    return pages
+
+
+def split_evenly(total: int, parts: int, index: int) -> int:
+    """Returns the share of part index when total is split into parts as evenly as possible."""
+    return total // parts + (index < total % parts)
@@ -0,0 +1,49 @@
+from typing import Callable, List
+
+# Package Imports
+from ..constants import MaintainFormatMode, MaintainFormatDefaultOptions, Messages
+from ..errors import InvalidMaintainFormatMode
+
+
+def get_context_pages(
+    mode: str,
+    seed_pages: int = MaintainFormatDefaultOptions.SEED_PAGES,
+    chunk_size: int = MaintainFormatDefaultOptions.CHUNK_SIZE,
+) -> Callable[[int], List[int]]:
+    """
+    Returns a function mapping a page index to the indices of the pages whose markdown is passed to it as formatting context.
+    Context pages always come before the page, so pages can be scheduled in order without deadlocks.
+
+    :param mode: One of the MaintainFormatMode values.
+    :type mode: str
+    :param seed_pages: Number of pages processed in order at the start in seed mode, defaults to MaintainFormatDefaultOptions.SEED_PAGES
+    :type seed_pages: int, optional
+    :param chunk_size: Number of pages processed in parallel per chunk in chunked mode, defaults to MaintainFormatDefaultOptions.CHUNK_SIZE
+    :type chunk_size: int, optional
+    """
+    seed_pages, chunk_size = max(1, seed_pages), max(1, chunk_size)
+
+    def serial(index: int) -> List[int]:
+        return [index - 1] if index > 0 else []
+
+    def seed(index: int) -> List[int]:
+        if index < seed_pages:
+            return serial(index)
+        return list(range(seed_pages))
+
+    def chunked(index: int) -> List[int]:
+        # The first chunk is formatted after the first page, every other chunk after the last page of the chunk before it
+        if index == 0:
+            return []
+        if index < chunk_size:
+            return [0]
+        return [index // chunk_size * chunk_size - 1]
+
+    context_pages = {
+        MaintainFormatMode.SERIAL: serial,
+        MaintainFormatMode.SEED: seed,
+        MaintainFormatMode.CHUNKED: chunked,
+    }.get(mode)
+    if context_pages is None:
+        raise InvalidMaintainFormatMode(Messages.INVALID_MAINTAIN_FORMAT_MODE.format(mode))
+    return context_pages
@@ -0,0 +1,82 @@
+import io
+import os
+from typing import List, Optional, Tuple, Union
+from PIL import Image, ImageChops, ImageStat
+
+# Package Imports
+from .types import EncodedImage, PageFilter
+from ..constants import PageFilterDefaultOptions, PageStatus
+
+
+def load_page_thumbnail(image: Union[str, bytes, EncodedImage], temp_directory: str = "") -> Image.Image:
+    """Decodes a page image (a path relative to temp_directory, the encoded image bytes or an EncodedImage) to a small grayscale thumbnail."""
+    if isinstance(image, str):
+        sources = [os.path.join(temp_directory, image)]
+    elif isinstance(image, EncodedImage):
+        sources = [io.BytesIO(tile) for tile in image.tiles]
+    else:
+        sources = [io.BytesIO(image)]
+
+    # Tiles are stacked back into the full page
+    tiles = []
+    for source in sources:
+        with Image.open(source) as tile:
+            tiles.append(tile.convert("L"))
+    page = tiles[0]
+    if len(tiles) > 1:
+        page = Image.new("L", (max(tile.width for tile in tiles), sum(tile.height for tile in tiles)), 255)
+        top = 0
+        for tile in tiles:
+            page.paste(tile, (0, top))
+            top += tile.height
+
+    return page.resize(PageFilterDefaultOptions.THUMBNAIL_SIZE, Image.Resampling.BOX)
+
+
+def difference_hash(thumbnail: Image.Image, hash_size: int = PageFilterDefaultOptions.HASH_SIZE) -> int:
+    """Perceptual difference hash of a page: one bit per pixel of a small grayscale image, set when it is brighter than its right neighbour."""
+    pixels = thumbnail.resize((hash_size + 1, hash_size), Image.Resampling.BOX).tobytes()
+    page_hash = 0
+    for row in range(hash_size):
+        for column in range(hash_size):
+            offset = row * (hash_size + 1) + column
+            page_hash = page_hash << 1 | (pixels[offset] > pixels[offset + 1])
+    return page_hash
+
+
+class PageClassifier:
+    """
+    Classifies the pages of a document as blank or as near-duplicates of an earlier page, before any completion is requested.
+    Pages are first matched on their perceptual hash, then confirmed by comparing their thumbnails pixel by pixel,
+    so that pages sharing a layout but not their text are not mistaken for duplicates.
+    """
+
+    def __init__(self, page_filter: PageFilter, temp_directory: str = ""):
+        self.page_filter = page_filter
+        self.temp_directory = temp_directory
+        ## (index, hash, thumbnail) of every page that was sent to the model
+        self._pages: List[Tuple[int, int, Image.Image]] = []
+
+    def classify(self, index: int, image: Union[str, bytes, EncodedImage]) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Returns (PageStatus.BLANK, None) for blank pages, (PageStatus.DUPLICATE, original index) for duplicates of an earlier page
+        and (None, None) for pages to send to the model. Pages have to be classified in page order.
+        """
+        thumbnail = load_page_thumbnail(image, self.temp_directory)
+
+        if self.page_filter.skip_blank and ImageStat.Stat(thumbnail).stddev[0] < self.page_filter.blank_stddev:
+            return PageStatus.BLANK, None
+
+        if not self.page_filter.dedupe:
+            return None, None
+
+        page_hash = difference_hash(thumbnail)
+        for original_index, original_hash, original_thumbnail in self._pages:
+            if (page_hash ^ original_hash).bit_count() > self.page_filter.max_hash_distance:
+                continue
+            difference = ImageStat.Stat(ImageChops.difference(thumbnail, original_thumbnail)).mean[0]
+            if difference < self.page_filter.max_pixel_difference:
+                return PageStatus.DUPLICATE, original_index
+
+        self._pages.append((index, page_hash, thumbnail))
+        return None, None
@@ -0,0 +1,103 @@
+import asyncio
+import collections
+import dataclasses
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Optional
+
+# Package Imports
+from .types import HedgingPolicy
+from ..models import CompletionResponse
+
+
+@dataclass
+class HedgedCompletionResponse(CompletionResponse):
+    """
+    The winning response of a hedged completion request.
+    """
+
+    ## tokens of the duplicate request that lost the race, the winner's tokens if it was cancelled before it finished (an upper bound)
+    hedge_input_tokens: int = 0
+    hedge_output_tokens: int = 0
+
+
+class RequestHedger:
+    """
+    Sends a duplicate of a completion request that takes longer than a percentile of the recently observed latencies,
+    returns the first response and cancels the other request. Shared by all the pages (and documents) of a model,
+    so that the percentile follows the provider's latency.
+
+    The duplicate runs in the concurrency slot of the original request, the share of requests that are hedged is capped by the policy.
+    """
+
+    def __init__(self, policy: Optional[HedgingPolicy] = None):
+        self.policy = policy or HedgingPolicy()
+        ## recent completion latencies in seconds
+        self._latencies: Deque[float] = collections.deque(maxlen=self.policy.window)
+        self.requests = 0
+        self.hedged_requests = 0
+
+    def get_delay(self) -> Optional[float]:
+        """Returns the seconds to wait for a response before a duplicate request is sent, None until enough latencies are observed."""
+        if len(self._latencies) < max(1, self.policy.min_samples):
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(self.policy.percentile * len(latencies)))
+        return max(self.policy.min_delay, latencies[index])
+
+    def _can_hedge(self) -> bool:
+        return self.hedged_requests + 1 <= self.policy.max_hedge_rate * self.requests
+
+    async def _timed(self, request: Callable[[], Awaitable[CompletionResponse]]) -> CompletionResponse:
+        started_at = time.monotonic()
+        response = await request()
+        self._latencies.append(time.monotonic() - started_at)
+        return response
+
+    async def run(self, request: Callable[[], Awaitable[CompletionResponse]]) -> CompletionResponse:
+        """
+        Runs a completion request, hedged with a duplicate if it is slow. Returns a HedgedCompletionResponse if a duplicate was sent.
+        Errors are raised if the request fails before it is hedged, or if both requests fail.
+        """
+        self.requests += 1
+        delay = self.get_delay()
+        started_at = time.monotonic()
+        primary = asyncio.ensure_future(self._timed(request))
+        hedge: Optional[asyncio.Future] = None
+        try:
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if delay is None or primary.done() or not self._can_hedge():
+                return await primary
+
+            self.hedged_requests += 1
+            hedge = asyncio.ensure_future(self._timed(request))
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # The original request wins a tie
+                for winner in sorted(done, key=lambda future: future is not primary):
+                    if winner.exception() is not None:
+                        error = error or winner.exception()
+                        continue
+                    loser = hedge if winner is primary else primary
+                    response = winner.result()
+                    if loser.done():
+                        loser_response = None if loser.cancelled() or loser.exception() else loser.result()
+                    else:
+                        loser_response = response
+                        if loser is primary:
+                            # The slow latency of the original request is known to be at least this long
+                            self._latencies.append(time.monotonic() - started_at)
+                    return HedgedCompletionResponse(
+                        **dataclasses.asdict(response),
+                        hedge_input_tokens=loser_response.input_tokens if loser_response else 0,
+                        hedge_output_tokens=loser_response.output_tokens if loser_response else 0,
+                    )
+            raise error
+        finally:
+            # Cancel the request that lost the race, or both if the caller was cancelled
+            for future in (primary, hedge):
+                if future is not None and not future.done():
+                    future.cancel()
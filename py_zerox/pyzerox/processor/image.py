@@ -1,6 +1,13 @@
 import aiofiles
 import base64
 import io
+import math
+from typing import Union
+from PIL import Image
+
+# Package Imports
+from .types import EncodedImage, ImageEncoding
+from ..constants import ImageEncodingDefaultOptions
 
 
 async def encode_image_to_base64(image_path: str) -> str:
@@ -10,6 +17,65 @@ async def encode_image_to_base64(image_path: str) -> str:
     return base64.b64encode(image_data).decode("utf-8")
 
 
+def encode_image_data_to_base64(image_data: Union[bytes, memoryview]) -> str:
+    """Encode in-memory image bytes to base64."""
+    return base64.b64encode(image_data).decode("utf-8")
+
+
+def image_to_bytes(image, fmt: str) -> bytes:
+    """Encode a PIL Image to bytes in the given format, in memory."""
+    with io.BytesIO() as buffer:
+        image.save(buffer, format=fmt)
+        return buffer.getvalue()
+
+
+def encode_image(image: Union[str, Image.Image], encoding: ImageEncoding) -> EncodedImage:
+    """
+    Encode a page image (a PIL Image or an image path) for the model: grayscale conversion, downscaling or tiling to the
+    pixel budget, and compression to the configured format.
+    """
+    if isinstance(image, str):
+        with Image.open(image) as opened_image:
+            opened_image.load()
+            image = opened_image.copy()
+
+    if encoding.grayscale:
+        image = image.convert("L")
+    elif image.mode not in ("RGB", "L"):
+        # jpeg can't store alpha or palettes, and pages don't need them
+        image = image.convert("RGB")
+
+    width, height = image.size
+    max_pixels = encoding.max_pixels
+    tile_count = 1
+    if max_pixels and width * height > max_pixels:
+        if encoding.tile:
+            tile_count = min(math.ceil(width * height / max_pixels), ImageEncodingDefaultOptions.MAX_TILES)
+        # Downscale whatever doesn't fit in the tiles
+        scale = math.sqrt(max_pixels * tile_count / (width * height))
+        if scale < 1:
+            width, height = max(1, int(width * scale)), max(1, int(height * scale))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+    save_options = {"format": "JPEG" if encoding.format == "jpg" else encoding.format.upper()}
+    if encoding.format != "png":
+        save_options["quality"] = encoding.quality
+    if encoding.format in ("jpeg", "jpg"):
+        save_options["optimize"] = True
+
+    tiles = []
+    tile_height = math.ceil(height / tile_count)
+    for index in range(tile_count):
+        top = max(0, index * tile_height - ImageEncodingDefaultOptions.TILE_OVERLAP)
+        bottom = min(height, (index + 1) * tile_height)
+        tile = image if tile_count == 1 else image.crop((0, top, width, bottom))
+        with io.BytesIO() as buffer:
+            tile.save(buffer, **save_options)
+            tiles.append(buffer.getvalue())
+
+    return EncodedImage(tiles=tiles, mime_type=encoding.mime_type)
+
+
 async def save_image(image, image_path: str):
     """Save an image to a file asynchronously."""
     # Convert PIL Image to BytesIO object
@@ -0,0 +1,149 @@
+import asyncio
+import math
+import os
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from PIL import ExifTags, Image, ImageOps
+
+# Package Imports
+from .image import encode_image, image_to_bytes
+from .pdf import validate_page_numbers
+from .types import EncodedImage, ImageEncoding
+from ..constants import ImageInputDefaultOptions, InputFileType, MetricsStage, PDFConversionDefaultOptions
+from ..metrics import MetricsRecorder, timed
+
+## EXIF orientations that swap the width and height of the stored image
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def detect_file_type(local_path: str) -> str:
+    """Returns the InputFileType of a file from its leading bytes, files that aren't a known image format are treated as PDFs."""
+    with open(local_path, "rb") as file:
+        header = file.read(16)
+    if any(header.startswith(signature) for signature, _ in ImageInputDefaultOptions.SIGNATURES):
+        return InputFileType.IMAGE
+    return InputFileType.PDF
+
+
+def get_image_frame_count(local_path: str) -> int:
+    """Returns the number of pages of an image file, the frames of a multi-page TIFF or 1."""
+    with Image.open(local_path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def get_resize_scale(width: int, height: int, image_height: Optional[Union[int, Tuple[Optional[int], Optional[int]]]]) -> float:
+    """
+    Returns the scale that fits an image in image_height, as (width, height) with either side None, or as the size of the longer side.
+    Images are only ever scaled down, upscaling adds pixels for the model to pay for but no detail.
+    """
+    if isinstance(image_height, int):
+        return min(1.0, image_height / max(width, height))
+    target_width, target_height = image_height if image_height else (None, None)
+    scales = [target / size for target, size in ((target_width, width), (target_height, height)) if target]
+    return min([1.0, *scales])
+
+
+def normalize_image(image: Image.Image) -> Image.Image:
+    """Converts an image to RGB or grayscale, with transparent areas on a white background like a rendered page."""
+    if image.mode in ("RGB", "L"):
+        return image
+    if image.mode in ("1", "I;16", "I", "F"):
+        # fax bitmaps and 16-bit scans
+        return image.convert("L")
+    if image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, "white")
+        return Image.alpha_composite(background, image).convert("RGB")
+    return image.convert("RGB")
+
+
+def load_image_frame(local_path: str, frame: int, image_height: Tuple[Optional[int], Optional[int]]) -> Image.Image:
+    """
+    Decodes a frame of an image file as a page: upright according to its EXIF orientation (phone photos), in RGB or grayscale,
+    and scaled down to fit image_height. JPEGs are decoded at a reduced size straight away when they are scaled down.
+    """
+    with Image.open(local_path) as image:
+        image.seek(frame)
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation, 1) in _TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        scale = get_resize_scale(width, height, image_height)
+        target_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+        if scale < 1 and image.format == "JPEG":
+            # The JPEG decoder can scale down by powers of two, it picks the smallest that is still at least the requested size
+            image.draft(image.mode, (math.ceil(image.size[0] * scale), math.ceil(image.size[1] * scale)))
+        ## returns a loaded copy, so the file can be closed
+        page = ImageOps.exif_transpose(image)
+
+    page = normalize_image(page)
+    if page.size != target_size:
+        page = page.resize(target_size, Image.Resampling.LANCZOS)
+    return page
+
+
+def read_original_image(local_path: str, image_height: Tuple[Optional[int], Optional[int]]) -> Optional[EncodedImage]:
+    """
+    Returns the original bytes of a single page PNG or JPEG if it can be sent to the model as is, i.e. it is upright,
+    in RGB or grayscale and already fits image_height. Returns None if the image has to be decoded.
+    """
+    with Image.open(local_path) as image:
+        mime_type = ImageInputDefaultOptions.PASSTHROUGH_FORMATS.get(image.format)
+        if (
+            mime_type is None
+            or getattr(image, "n_frames", 1) > 1
+            or image.mode not in ("RGB", "L")
+            or image.getexif().get(ExifTags.Base.Orientation, 1) != 1
+            or get_resize_scale(*image.size, image_height) < 1
+        ):
+            return None
+    with open(local_path, "rb") as file:
+        return EncodedImage(tiles=[file.read()], mime_type=mime_type)
+
+
+async def iter_image_pages(
+    image_height: Tuple[Optional[int], Optional[int]],
+    local_path: str,
+    temp_dir: str,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    encoding: Optional[ImageEncoding] = None,
+    select_pages: Optional[List[int]] = None,
+    recorder: Optional[MetricsRecorder] = None,
+) -> AsyncIterator[Union[str, bytes, EncodedImage]]:
+    """
+    Reads a PNG, JPEG or TIFF file as pages, one per frame (the pages of a multi-page TIFF), yielded in page order like iter_pdf_images.
+    Frames are decoded, normalized and scaled down in memory (see load_image_frame), without going through a PDF or poppler.
+    A single page PNG or JPEG that needs none of it is sent as is, unless an encoding is given.
+
+    With an encoding, pages are yielded as EncodedImage. Otherwise they are yielded as PNG bytes with in_memory,
+    or written to temp_dir and their paths are yielded.
+    With select_pages (1-indexed, in the order to yield them), only those frames are read.
+    With a recorder, decoding is timed as the rasterization stage and encoding as the encoding stage.
+    """
+    frame_count = await asyncio.to_thread(get_image_frame_count, local_path)
+    if select_pages is None:
+        page_numbers = list(range(1, frame_count + 1))
+    else:
+        validate_page_numbers(select_pages, frame_count)
+        page_numbers = list(select_pages)
+
+    if encoding is None and frame_count == 1:
+        original = await asyncio.to_thread(read_original_image, local_path, image_height)
+        if original is not None:
+            for _ in page_numbers:
+                yield original
+            return
+
+    def read_page(page_number: int) -> Union[str, bytes, EncodedImage]:
+        with timed(recorder, MetricsStage.RASTERIZE, pages=1):
+            page = load_image_frame(local_path, page_number - 1, image_height)
+        with timed(recorder, MetricsStage.ENCODE, pages=1):
+            if encoding:
+                return encode_image(page, encoding)
+            if in_memory:
+                return image_to_bytes(page, PDFConversionDefaultOptions.FORMAT)
+            image_path = os.path.join(temp_dir, f"page-{page_number:05d}.{PDFConversionDefaultOptions.FORMAT}")
+            page.save(image_path, format=PDFConversionDefaultOptions.FORMAT)
+            return image_path
+
+    for page_number in page_numbers:
+        yield await asyncio.to_thread(read_page, page_number)
@@ -0,0 +1,293 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+# Package Imports
+from ..constants import ConcurrencyDefaultOptions
+from ..models import CompletionResponse
+
+
+class TokenBudget:
+    """
+    Token bucket tracking a tokens-per-minute budget for a model.
+    Tokens are reserved up front from an estimate and reconciled once the actual usage is known, so the balance may go negative.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.tokens_per_minute = tokens_per_minute
+        self._available = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        refilled = (now - self._updated_at) * self.tokens_per_minute / 60
+        self._available = min(float(self.tokens_per_minute), self._available + refilled)
+        self._updated_at = now
+
+    async def reserve(self, tokens: float) -> None:
+        """Waits until the budget has room for the given number of tokens and takes them."""
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            self._refill()
+            if self._available >= tokens:
+                self._available -= tokens
+                return
+            await asyncio.sleep((tokens - self._available) * 60 / self.tokens_per_minute)
+
+    def consume(self, tokens: float) -> None:
+        """Takes tokens from the budget without waiting, e.g. to reconcile a reservation with the actual usage."""
+        self._refill()
+        self._available -= tokens
+
+
+## token budgets are shared process wide, so that concurrent runs against the same model draw from one budget
+_token_budgets: Dict[str, TokenBudget] = {}
+
+
+def get_token_budget(model: str, tokens_per_minute: int) -> TokenBudget:
+    """Returns the shared token budget for a model, creating or resizing it as needed."""
+    budget = _token_budgets.get(model)
+    if budget is None:
+        budget = _token_budgets[model] = TokenBudget(tokens_per_minute)
+    budget.tokens_per_minute = tokens_per_minute
+    return budget
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Checks whether an error (or any error it was raised from) is a rate limit or overload error from the provider."""
+    while error is not None:
+        if getattr(error, "status_code", None) in ConcurrencyDefaultOptions.RATE_LIMIT_STATUS_CODES:
+            return True
+        if type(error).__name__ in ("RateLimitError", "ServiceUnavailableError"):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """Extracts the retry-after hint, in seconds, from a provider error or any error it was raised from."""
+    while error is not None:
+        headers = (
+            getattr(error, "litellm_response_headers", None)
+            or getattr(getattr(error, "response", None), "headers", None)
+            or getattr(error, "headers", None)
+        )
+        if headers:
+            if headers.get("retry-after-ms"):
+                try:
+                    return float(headers["retry-after-ms"]) / 1000
+                except ValueError:
+                    pass
+            if headers.get("retry-after"):
+                try:
+                    return float(headers["retry-after"])
+                except ValueError:
+                    try:
+                        return max(0.0, parsedate_to_datetime(headers["retry-after"]).timestamp() - time.time())
+                    except (TypeError, ValueError):
+                        pass
+        error = error.__cause__ or error.__context__
+    return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter for model requests.
+
+    The limit grows by roughly one request per round trip while latencies stay within LATENCY_TOLERANCE of the baseline,
+    and is cut by DECREASE_FACTOR on rate limit or overload errors. Those errors pause new requests for the provider's
+    retry-after hint and the affected page is retried instead of being dropped.
+    An optional tokens-per-minute budget, shared by all limiters for the same model, is enforced as well.
+
+    A limiter can be passed as the concurrency argument of zerox in place of a fixed number.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = ConcurrencyDefaultOptions.MIN_LIMIT,
+        max_limit: int = ConcurrencyDefaultOptions.MAX_LIMIT,
+        model: Optional[str] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_rate_limit_retries: int = ConcurrencyDefaultOptions.MAX_RATE_LIMIT_RETRIES,
+    ):
+        """
+        :param initial_limit: The number of concurrent requests to start with, defaults to 10
+        :type initial_limit: int, optional
+        :param min_limit: The lowest the limit may go, defaults to ConcurrencyDefaultOptions.MIN_LIMIT
+        :type min_limit: int, optional
+        :param max_limit: The highest the limit may go, defaults to ConcurrencyDefaultOptions.MAX_LIMIT
+        :type max_limit: int, optional
+        :param model: The model the tokens_per_minute budget applies to, required with tokens_per_minute
+        :type model: str, optional
+        :param tokens_per_minute: The provider's tokens-per-minute limit for the model, defaults to None (no budget)
+        :type tokens_per_minute: int, optional
+        :param max_rate_limit_retries: How many times a request is retried after a rate limit error, defaults to ConcurrencyDefaultOptions.MAX_RATE_LIMIT_RETRIES
+        :type max_rate_limit_retries: int, optional
+        """
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.token_budget = (
+            get_token_budget(model or "", tokens_per_minute) if tokens_per_minute else None
+        )
+
+        ## number of rate limit or overload errors seen
+        self.rate_limit_errors = 0
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._paused_until = 0.0
+        self._last_decrease_at = 0.0
+        self._baseline_latency: Optional[float] = None
+        self._average_tokens = 0.0
+
+    async def run(self, request: Callable[[], Awaitable[CompletionResponse]]) -> CompletionResponse:
+        """Runs a model request within the limit, retrying it after rate limit or overload errors."""
+        for attempt in range(self.max_rate_limit_retries + 1):
+            await self._acquire()
+            # The slot is given back however the request ends, including when it is cancelled
+            try:
+                reserved_tokens = self._average_tokens
+                if self.token_budget:
+                    await self.token_budget.reserve(reserved_tokens)
+                started_at = time.monotonic()
+                try:
+                    response = await request()
+                except Exception as error:
+                    if not is_rate_limit_error(error) or attempt == self.max_rate_limit_retries:
+                        raise
+                    self._on_rate_limit(started_at, get_retry_after(error), attempt)
+                    continue
+            finally:
+                await self._release()
+
+            self._on_success(
+                time.monotonic() - started_at,
+                response.input_tokens + response.output_tokens,
+                reserved_tokens,
+            )
+            return response
+
+    async def _acquire(self) -> None:
+        while True:
+            # Hold off while the provider asked us to back off
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._in_flight < max(1, int(self.limit)))
+                if self._paused_until > time.monotonic():
+                    continue
+                self._in_flight += 1
+            break
+
+    async def _release(self) -> None:
+        # Counted back before waiting for the condition's lock, so that a second cancellation can't leak the slot
+        self._in_flight -= 1
+        async with self._condition:
+            self._condition.notify_all()
+
+    def _on_success(self, latency: float, tokens: int, reserved_tokens: float) -> None:
+        smoothing = ConcurrencyDefaultOptions.SMOOTHING
+
+        if self.token_budget:
+            self.token_budget.consume(tokens - reserved_tokens)
+        self._average_tokens += smoothing * (tokens - self._average_tokens)
+
+        # Additive increase, about one extra request per round trip while latencies are healthy
+        if self._baseline_latency is None:
+            self._baseline_latency = latency
+        elif latency <= self._baseline_latency * ConcurrencyDefaultOptions.LATENCY_TOLERANCE:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._baseline_latency += smoothing * (latency - self._baseline_latency)
+
+    def _on_rate_limit(self, started_at: float, retry_after: Optional[float], attempt: int) -> None:
+        self.rate_limit_errors += 1
+        now = time.monotonic()
+
+        # Multiplicative decrease, once per burst: requests sent before the last decrease don't count again
+        if started_at > self._last_decrease_at:
+            self.limit = max(float(self.min_limit), self.limit * ConcurrencyDefaultOptions.DECREASE_FACTOR)
+            self._last_decrease_at = now
+
+        if retry_after is None:
+            retry_after = ConcurrencyDefaultOptions.DEFAULT_RETRY_AFTER * 2**attempt
+        self._paused_until = max(self._paused_until, now + retry_after)
+
+        logging.warning(
+            f"Rate limited by the model provider, retrying in {retry_after:.1f}s with concurrency limit {int(self.limit)}"
+        )
+
+
+class FairSemaphore:
+    """
+    Concurrency limit shared by several documents.
+    Free slots are handed out round-robin across the documents waiting for one, so that a large document can't starve the others.
+    Each document takes its share with share(), which is used like an asyncio.Semaphore.
+    """
+
+    def __init__(self, value: int):
+        self.max_limit = value
+        self._available = value
+        ## waiting acquisitions per share, in round-robin order
+        self._waiters: "OrderedDict[int, Deque[asyncio.Future]]" = OrderedDict()
+        self._share_ids = itertools.count()
+
+    def share(self) -> "FairSemaphoreShare":
+        """Returns a new document's share of the semaphore."""
+        return FairSemaphoreShare(self, next(self._share_ids))
+
+    async def _acquire(self, share_id: int) -> None:
+        if self._available > 0 and not self._waiters:
+            self._available -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(share_id, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation, pass it on
+                self._release()
+            else:
+                waiters = self._waiters.get(share_id)
+                if waiters and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[share_id]
+            raise
+
+    def _release(self) -> None:
+        # Hand the slot to the next share in the rotation, which then moves to the back
+        while self._waiters:
+            share_id, waiters = self._waiters.popitem(last=False)
+            future = waiters.popleft()
+            if waiters:
+                self._waiters[share_id] = waiters
+            if not future.done():
+                future.set_result(None)
+                return
+        self._available += 1
+
+
+class FairSemaphoreShare:
+    """A document's share of a FairSemaphore."""
+
+    def __init__(self, semaphore: FairSemaphore, share_id: int):
+        self.max_limit = semaphore.max_limit
+        self._semaphore = semaphore
+        self._share_id = share_id
+
+    async def __aenter__(self) -> None:
+        await self._semaphore._acquire(self._share_id)
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._semaphore._release()
@@ -1,92 +1,578 @@
+import collections
+import contextlib
+import functools
 import logging
 import os
+import time
 import asyncio
-from typing import List, Optional, Tuple
-from pdf2image import convert_from_path
+import aiofiles
+import aiofiles.os as async_os
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
 
 # Package Imports
-from .image import save_image
+from .batching import split_evenly, split_pages
+from .filter import PageClassifier
+from .hedging import HedgedCompletionResponse, RequestHedger
+from .image import encode_image, image_to_bytes
+from .limiter import AdaptiveConcurrencyLimiter, FairSemaphoreShare
+from .rasterize import discard_process_pool, get_process_pool, is_main_module_error, resolve_rasterize_workers
+from .renderers import BasePDFRenderer, get_renderer
+from .retry import get_backoff_delay
 from .text import format_markdown
-from ..constants import PDFConversionDefaultOptions, Messages
-from ..models import litellmmodel
+from .text_layer import extract_text_layer
+from .types import EncodedImage, ImageEncoding, PageFilter, PageResult, TextLayerPage
+from .utils import get_page_runs, iterate_async
+from ..constants import (
+    PDFConversionDefaultOptions,
+    BatchingDefaultOptions,
+    Messages,
+    MetricsStage,
+    RetryDefaultOptions,
+    PageStatus,
+)
+from ..errors import PageNumberOutOfBoundError, RasterizeWorkerError
+from ..models import BaseModel, CompletionResponse
+from ..cache import BaseCache, make_cache_key
+from ..metrics import MetricsRecorder, timed
 
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
 
-async def convert_pdf_to_images(image_density: int, image_height: tuple[Optional[int], int], local_path: str, temp_dir: str) -> List[str]:
+
+async def convert_pdf_to_images(
+    image_density: int,
+    image_height: tuple[Optional[int], int],
+    local_path: str,
+    temp_dir: str,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+) -> List[str]:
     """Converts a PDF file to a series of images in the temp_dir. Returns a list of image paths in page order."""
-    options = {
-        "pdf_path": local_path,
-        "output_folder": temp_dir,
-        "dpi": image_density,
-        "fmt": PDFConversionDefaultOptions.FORMAT,
-        "size": image_height,
-        "thread_count": PDFConversionDefaultOptions.THREAD_COUNT,
-        "use_pdftocairo": PDFConversionDefaultOptions.USE_PDFTOCAIRO,
-        "paths_only": True,
-    }
+    renderer = get_renderer(renderer)
 
     try:
+        page_count = await asyncio.to_thread(get_pdf_page_count, local_path, renderer)
         image_paths = await asyncio.to_thread(
-            convert_from_path, **options
+            renderer.render_to_files,
+            local_path,
+            1,
+            page_count,
+            image_density,
+            image_height,
+            temp_dir,
+            PDFConversionDefaultOptions.THREAD_COUNT,
         )
         return image_paths
     except Exception as err:
         logging.error(f"Error converting PDF to images: {err}")
 
 
+def get_pdf_page_count(local_path: str, renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER) -> int:
+    """
+    Returns the number of pages of a PDF, as read by the renderer.
+    Counts are cached by path, size, modification time and renderer, so a file is only parsed once.
+    """
+    stat = os.stat(local_path)
+    return _get_pdf_page_count(os.path.abspath(local_path), stat.st_size, stat.st_mtime_ns, get_renderer(renderer))
+
+
+@functools.lru_cache(maxsize=PDFConversionDefaultOptions.PAGE_COUNT_CACHE_SIZE)
+def _get_pdf_page_count(local_path: str, size: int, modified_at: int, renderer: BasePDFRenderer) -> int:
+    return renderer.get_page_count(local_path)
+
+
+def validate_page_numbers(select_pages: List[int], page_count: int) -> None:
+    """Raises PageNumberOutOfBoundError if any of the 1-indexed select_pages is not a page of the document."""
+    invalid_page_numbers = [page for page in select_pages if page < 1 or page > page_count]
+    if invalid_page_numbers:
+        raise PageNumberOutOfBoundError(extra_info={"input_pdf_num_pages": page_count,
+                                                    "select_pages": select_pages,
+                                                    "invalid_page_numbers": invalid_page_numbers})
+
+
+def render_page_range(
+    local_path: str,
+    first_page: int,
+    last_page: int,
+    image_density: int,
+    image_height: tuple[Optional[int], int],
+    temp_dir: str,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    encoding: Optional[ImageEncoding] = None,
+    thread_count: int = PDFConversionDefaultOptions.THREAD_COUNT,
+    recorder: Optional[MetricsRecorder] = None,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+) -> List[Union[str, bytes, EncodedImage]]:
+    """
+    Renders a range of pages (1-indexed, inclusive) of a PDF with one conversion, returning them in page order as for iter_pdf_images.
+    Runs in a worker thread, or in a worker process of the rasterization pool.
+    """
+    renderer = get_renderer(renderer)
+    page_count = last_page - first_page + 1
+
+    if in_memory:
+        with timed(recorder, MetricsStage.RASTERIZE, pages=page_count):
+            images = renderer.render(local_path, first_page, last_page, image_density, image_height, thread_count)
+        with timed(recorder, MetricsStage.ENCODE, pages=page_count):
+            if encoding:
+                return [encode_image(image, encoding) for image in images]
+            return [image_to_bytes(image, PDFConversionDefaultOptions.FORMAT) for image in images]
+
+    with timed(recorder, MetricsStage.RASTERIZE, pages=page_count):
+        image_paths = renderer.render_to_files(
+            local_path, first_page, last_page, image_density, image_height, temp_dir, thread_count
+        )
+    if encoding:
+        with timed(recorder, MetricsStage.ENCODE, pages=page_count):
+            return [encode_image(image_path, encoding) for image_path in image_paths]
+    return image_paths
+
+
+async def iter_pdf_images(
+    image_density: int,
+    image_height: tuple[Optional[int], int],
+    local_path: str,
+    temp_dir: str,
+    chunk_size: int = PDFConversionDefaultOptions.CHUNK_SIZE,
+    in_memory: bool = PDFConversionDefaultOptions.IN_MEMORY,
+    encoding: Optional[ImageEncoding] = None,
+    text_layer: bool = False,
+    select_pages: Optional[List[int]] = None,
+    recorder: Optional[MetricsRecorder] = None,
+    workers: Optional[int] = PDFConversionDefaultOptions.RASTERIZE_WORKERS,
+    renderer: Union[str, BasePDFRenderer] = PDFConversionDefaultOptions.RENDERER,
+) -> AsyncIterator[Union[str, bytes, EncodedImage, TextLayerPage]]:
+    """
+    Converts a PDF file to a series of images chunk by chunk, yielding each image in page order as soon as its chunk is rasterized.
+    Rasterization runs in the background, so later chunks are converted while earlier pages are being processed.
+    With select_pages (1-indexed, in the order to yield them), only those pages are rendered, straight from the original file,
+    with one conversion per run of consecutive pages.
+
+    Pages are rendered by the renderer, a name (see PDFRenderer) or a BasePDFRenderer.
+    With in_memory, pages are rendered to memory (through poppler's stdout for the poppler renderer) and yielded as encoded image bytes
+    without touching the disk. Otherwise they are written to temp_dir and their paths are yielded.
+    With an encoding, pages are yielded as EncodedImage, encoded in the background along with the rasterization.
+    With text_layer, pages whose text layer is good enough (see extract_text_layer) are yielded as TextLayerPage and not rasterized.
+    With a recorder, the rasterization, encoding and text layer stages are timed.
+
+    With more than one worker (None for one per available CPU), chunks are rendered and encoded in parallel in a shared pool of worker processes,
+    one chunk ahead per worker, and still yielded in page order. Each worker renders its chunk on its own (with a single poppler process for poppler).
+    """
+    workers = resolve_rasterize_workers(workers)
+    renderer = get_renderer(renderer)
+    reader: Optional["PdfReader"] = None
+
+    def read_text_layer(page_numbers: List[int]) -> Dict[int, TextLayerPage]:
+        pages: Dict[int, TextLayerPage] = {}
+        with timed(recorder, MetricsStage.TEXT_LAYER, pages=len(page_numbers)):
+            for page_number in page_numbers:
+                text = extract_text_layer(reader.pages[page_number - 1], reader)
+                if text is not None:
+                    pages[page_number] = TextLayerPage(text)
+        return pages
+
+    def render_chunk(page_numbers: List[int]) -> List[Union[str, bytes, EncodedImage, TextLayerPage]]:
+        pages: Dict[int, Union[str, bytes, EncodedImage, TextLayerPage]] = {}
+        if reader is not None:
+            pages.update(read_text_layer(page_numbers))
+
+        # Render the runs of consecutive pages that are left, one conversion per run
+        for first_page, last_page in get_page_runs(page_number for page_number in page_numbers if page_number not in pages):
+            images = render_page_range(
+                local_path,
+                first_page,
+                last_page,
+                image_density,
+                image_height,
+                temp_dir,
+                in_memory,
+                encoding,
+                recorder=recorder,
+                renderer=renderer,
+            )
+            pages.update(zip(range(first_page, last_page + 1), images))
+
+        return [pages[page_number] for page_number in page_numbers]
+
+    async def render_chunk_in_processes(page_numbers: List[int]) -> List[Union[str, bytes, EncodedImage, TextLayerPage]]:
+        pages: Dict[int, Union[str, bytes, EncodedImage, TextLayerPage]] = {}
+        if reader is not None:
+            pages.update(await asyncio.to_thread(read_text_layer, page_numbers))
+
+        # The worker processes can't report to the recorder, so rendering and encoding are timed together
+        runs = get_page_runs(page_number for page_number in page_numbers if page_number not in pages)
+        loop = asyncio.get_running_loop()
+        with timed(recorder, MetricsStage.RASTERIZE, pages=len(page_numbers) - len(pages), processes=True):
+            rendered = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        get_process_pool(workers),
+                        functools.partial(
+                            render_page_range,
+                            local_path,
+                            first_page,
+                            last_page,
+                            image_density,
+                            image_height,
+                            temp_dir,
+                            in_memory,
+                            encoding,
+                            PDFConversionDefaultOptions.WORKER_THREAD_COUNT,
+                            renderer=renderer,
+                        ),
+                    )
+                    for first_page, last_page in runs
+                )
+            )
+        for (first_page, last_page), images in zip(runs, rendered):
+            pages.update(zip(range(first_page, last_page + 1), images))
+
+        return [pages[page_number] for page_number in page_numbers]
+
+    # Images in page order, followed by None once the document is done or by the error that stopped conversion.
+    # The queue is bounded so that rasterization doesn't run arbitrarily far ahead of the model calls.
+    image_queue: asyncio.Queue = asyncio.Queue(maxsize=PDFConversionDefaultOptions.PREFETCH_PAGES)
+    # Chunks being rendered in the worker processes, in page order
+    rendering: Deque[asyncio.Future] = collections.deque()
+
+    async def rasterize_chunks():
+        nonlocal reader
+        try:
+            if text_layer:
+                from PyPDF2 import PdfReader
+
+                reader = await asyncio.to_thread(PdfReader, local_path)
+            page_count = await asyncio.to_thread(get_pdf_page_count, local_path, renderer)
+            if select_pages is None:
+                page_numbers = list(range(1, page_count + 1))
+            else:
+                validate_page_numbers(select_pages, page_count)
+                page_numbers = list(select_pages)
+
+            chunks = []
+            start, pages_in_chunk = 0, 1
+            while start < len(page_numbers):
+                chunks.append(page_numbers[start : start + pages_in_chunk])
+                start, pages_in_chunk = start + pages_in_chunk, chunk_size
+
+            if workers == 1:
+                for chunk in chunks:
+                    for image in await asyncio.to_thread(render_chunk, chunk):
+                        await image_queue.put(image)
+            else:
+                # Chunks are rendered up to one per worker ahead, and queued in page order as they complete
+                try:
+                    for chunk in chunks:
+                        rendering.append(asyncio.ensure_future(render_chunk_in_processes(chunk)))
+                        if len(rendering) >= workers:
+                            for image in await rendering.popleft():
+                                await image_queue.put(image)
+                    while rendering:
+                        for image in await rendering.popleft():
+                            await image_queue.put(image)
+                except BrokenProcessPool as error:
+                    # A worker died (e.g. killed for running out of memory), the next document gets a new pool
+                    discard_process_pool(workers)
+                    raise RasterizeWorkerError(Messages.RASTERIZE_WORKER_DIED.format(workers)) from error
+                except RuntimeError as error:
+                    if not is_main_module_error(error):
+                        raise
+                    raise RasterizeWorkerError(Messages.RASTERIZE_WORKERS_MAIN_GUARD.format(workers)) from error
+
+            await image_queue.put(None)
+        except Exception as err:
+            await image_queue.put(err)
+
+    producer = asyncio.create_task(rasterize_chunks())
+    try:
+        while (image := await image_queue.get()) is not None:
+            if isinstance(image, Exception):
+                if not isinstance(image, RasterizeWorkerError):
+                    logging.error(Messages.PDF_CONVERSION_FAILED.format(image))
+                raise image
+            yield image
+    finally:
+        producer.cancel()
+        for chunk in rendering:
+            chunk.cancel()
+
+
 async def process_page(
-    image: str,
-    model: litellmmodel,
+    image: Union[str, bytes, EncodedImage, TextLayerPage],
+    model: BaseModel,
     temp_directory: str = "",
-    input_token_count: int = 0,
-    output_token_count: int = 0,
     prior_page: str = "",
-    semaphore: Optional[asyncio.Semaphore] = None,
-) -> Tuple[str, int, int, str]:
-    """Process a single page of a PDF"""
-
-    # If semaphore is provided, acquire it before processing the page
-    if semaphore:
-        async with semaphore:
-            return await process_page(
-                image,
-                model,
-                temp_directory,
-                input_token_count,
-                output_token_count,
-                prior_page,
-            )
+    semaphore: Optional[Union[asyncio.Semaphore, AdaptiveConcurrencyLimiter, FairSemaphoreShare]] = None,
+    cache: Optional[BaseCache] = None,
+    max_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    recorder: Optional[MetricsRecorder] = None,
+    hedger: Optional[RequestHedger] = None,
+    failed_attempts: int = 0,
+) -> PageResult:
+    """
+    Process a single page of a PDF. The page image is either a path (relative to temp_directory), the encoded image bytes or an EncodedImage.
+    Failed completions are retried up to max_retries times with exponential backoff, after which the page is reported as failed.
+    failed_attempts are attempts already made for the page (e.g. a failed multi-page request), counted against max_retries.
+    A TextLayerPage is returned as is, without a completion request.
+    With a hedger, a slow completion request gets a duplicate and the first response wins (see RequestHedger).
+    """
+    if isinstance(image, TextLayerPage):
+        return PageResult(content=format_markdown(image.text), status=PageStatus.TEXT_LAYER)
 
-    image_path = os.path.join(temp_directory, image)
+    image_path, image_data, mime_type = get_image_source(image, temp_directory)
 
-    # Get the completion from LiteLLM
     try:
-        completion = await model.completion(
+        # Look up the completion in the cache before taking a concurrency slot
+        cache_key = None
+        if cache:
+            image_data, cache_key, cached_completion = await lookup_cache(cache, model, image_path, image_data, prior_page)
+            if cached_completion:
+                return PageResult(content=format_markdown(cached_completion.content), cache_hit=True)
+    except Exception as error:
+        logging.error(f"{Messages.FAILED_TO_PROCESS_IMAGE} Error:{error}")
+        return PageResult(content="", status=PageStatus.FAILED, error=str(error))
+
+    def request_model():
+        # Get the completion from LiteLLM
+        return model.completion(
             image_path=image_path,
             maintain_format=True,
             prior_page=prior_page,
+            image_data=image_data,
+            mime_type=mime_type,
         )
 
-        formatted_markdown = format_markdown(completion.content)
-        input_token_count += completion.input_tokens
-        output_token_count += completion.output_tokens
-        prior_page = formatted_markdown
+    def request_completion():
+        return hedger.run(request_model) if hedger else request_model()
 
-        return formatted_markdown, input_token_count, output_token_count, prior_page
+    started_at = time.monotonic()
+    attempt = failed_attempts
+    queue_wait = 0.0
+    while True:
+        attempt += 1
+        try:
+            completion, queue_wait = await request_in_slot(request_completion, semaphore, recorder)
+            break
 
+        except Exception as error:
+            if attempt > max_retries:
+                logging.error(f"{Messages.FAILED_TO_PROCESS_IMAGE} Error:{error}")
+                return PageResult(
+                    content="",
+                    status=PageStatus.FAILED,
+                    attempts=attempt,
+                    latency=(time.monotonic() - started_at) * 1000,
+                    error=str(error),
+                    image_bytes=await get_image_size(image_path, image_data),
+                )
+
+            delay = get_backoff_delay(attempt, error)
+            logging.warning(f"{Messages.FAILED_TO_PROCESS_IMAGE}, retrying in {delay:.1f}s. Error:{error}")
+            await asyncio.sleep(delay)
+
+    if cache_key:
+        await store_in_cache(cache, cache_key, completion)
+
+    hedged = isinstance(completion, HedgedCompletionResponse)
+    return PageResult(
+        content=format_markdown(completion.content),
+        input_tokens=completion.input_tokens,
+        output_tokens=completion.output_tokens,
+        cached_input_tokens=completion.cached_input_tokens,
+        status=PageStatus.OK if attempt == 1 else PageStatus.RETRIED,
+        attempts=attempt,
+        latency=(time.monotonic() - started_at) * 1000,
+        queue_wait=queue_wait,
+        image_bytes=await get_image_size(image_path, image_data),
+        hedged=hedged,
+        hedge_input_tokens=completion.hedge_input_tokens if hedged else 0,
+        hedge_output_tokens=completion.hedge_output_tokens if hedged else 0,
+    )
+
+
+async def process_page_batch(
+    images: List[Union[str, bytes, EncodedImage]],
+    model: BaseModel,
+    temp_directory: str = "",
+    semaphore: Optional[Union[asyncio.Semaphore, AdaptiveConcurrencyLimiter, FairSemaphoreShare]] = None,
+    cache: Optional[BaseCache] = None,
+    recorder: Optional[MetricsRecorder] = None,
+) -> Tuple[Optional[List[PageResult]], Optional[List[CompletionResponse]]]:
+    """
+    Process several pages of a PDF with a single completion request (see BaseModel.completion_pages), splitting the response back into pages.
+    Token usage is shared evenly by the pages of the request. Cached pages are taken from the cache and left out of the request.
+    Returns (results, None), or (None, ...) if the request fails or its response can't be split into the pages, so that the caller can process
+    the pages one by one. A failed request gives (None, None), and is backed off like a failed single page attempt before returning so that the
+    single page requests don't add to the load right away. A response that can't be split was still billed, it gives (None, token_shares)
+    with each page's share of its tokens (none for cached pages), for the caller to add to the pages.
+    """
+    sources = [get_image_source(image, temp_directory) for image in images]
+    results: List[Optional[PageResult]] = [None] * len(images)
+    cache_keys: List[Optional[str]] = [None] * len(images)
+
+    try:
+        if cache:
+            for index, (image_path, image_data, mime_type) in enumerate(sources):
+                image_data, cache_keys[index], cached_completion = await lookup_cache(cache, model, image_path, image_data)
+                sources[index] = (image_path, image_data, mime_type)
+                if cached_completion:
+                    results[index] = PageResult(content=format_markdown(cached_completion.content), cache_hit=True)
+
+        requested = [index for index, result in enumerate(results) if result is None]
+        if not requested:
+            return results, None
+
+        started_at = time.monotonic()
+        # A single attempt, the pages are retried one by one if it fails
+        completion, queue_wait = await request_in_slot(
+            lambda: model.completion_pages([sources[index] for index in requested]), semaphore, recorder
+        )
+        latency = (time.monotonic() - started_at) * 1000
     except Exception as error:
-        logging.error(f"{Messages.FAILED_TO_PROCESS_IMAGE} Error:{error}")
-        return "", input_token_count, output_token_count, ""
+        delay = get_backoff_delay(1, error)
+        logging.warning(f"{Messages.FAILED_TO_PROCESS_IMAGE}, retrying the pages one by one in {delay:.1f}s. Error:{error}")
+        await asyncio.sleep(delay)
+        return None, None
+
+    def get_token_share(position: int, content: str = "") -> CompletionResponse:
+        return CompletionResponse(
+            content=content,
+            input_tokens=split_evenly(completion.input_tokens, len(requested), position),
+            output_tokens=split_evenly(completion.output_tokens, len(requested), position),
+            cached_input_tokens=split_evenly(completion.cached_input_tokens, len(requested), position),
+        )
+
+    contents = split_pages(completion.content, len(requested))
+    if contents is None:
+        logging.warning(Messages.FAILED_TO_SPLIT_PAGES.format(len(requested)))
+        token_shares = [CompletionResponse(content="", input_tokens=0, output_tokens=0) for _ in images]
+        for position, index in enumerate(requested):
+            token_shares[index] = get_token_share(position)
+        return None, token_shares
+
+    for position, (index, content) in enumerate(zip(requested, contents)):
+        page_completion = get_token_share(position, content)
+        if cache_keys[index]:
+            await store_in_cache(cache, cache_keys[index], page_completion)
+
+        image_path, image_data, _ = sources[index]
+        results[index] = PageResult(
+            content=format_markdown(content),
+            input_tokens=page_completion.input_tokens,
+            output_tokens=page_completion.output_tokens,
+            cached_input_tokens=page_completion.cached_input_tokens,
+            attempts=1,
+            latency=latency,
+            queue_wait=queue_wait,
+            image_bytes=await get_image_size(image_path, image_data),
+            batch_size=len(requested),
+        )
+    return results, None
+
+
+def add_tokens(result: PageResult, usage: Union[PageResult, CompletionResponse]) -> None:
+    """Adds the tokens of an earlier request for the page (e.g. a multi-page response that couldn't be split) to its result."""
+    result.input_tokens += usage.input_tokens
+    result.output_tokens += usage.output_tokens
+    result.cached_input_tokens += usage.cached_input_tokens
+
+
+def get_image_source(
+    image: Union[str, bytes, EncodedImage], temp_directory: str = ""
+) -> Tuple[Optional[str], Optional[Union[bytes, List[bytes]]], str]:
+    """Returns the (image_path, image_data, mime_type) of a page image to request its completion with."""
+    if isinstance(image, str):
+        return os.path.join(temp_directory, image), None, f"image/{PDFConversionDefaultOptions.FORMAT}"
+    if isinstance(image, EncodedImage):
+        return None, image.tiles, image.mime_type
+    return None, image, f"image/{PDFConversionDefaultOptions.FORMAT}"
+
+
+async def lookup_cache(
+    cache: BaseCache,
+    model: BaseModel,
+    image_path: Optional[str],
+    image_data: Optional[Union[bytes, List[bytes]]],
+    prior_page: str = "",
+) -> Tuple[Union[bytes, List[bytes]], str, Optional[CompletionResponse]]:
+    """Looks up the completion of a page in the cache, returns the image data (read from image_path if needed), the cache key and the cached completion."""
+    if image_data is None:
+        async with aiofiles.open(image_path, "rb") as image_file:
+            image_data = await image_file.read()
+    cache_key = make_cache_key(
+        image_data=image_data,
+        model=model.model,
+        system_prompt=model.system_prompt,
+        prior_page=prior_page,
+        kwargs=model.kwargs,
+    )
+    return image_data, cache_key, await cache.get(cache_key)
+
+
+async def store_in_cache(cache: BaseCache, cache_key: str, completion: CompletionResponse) -> None:
+    try:
+        await cache.set(cache_key, completion)
+    except Exception as error:
+        logging.warning(f"Failed to store completion in the cache. Error:{error}")
+
+
+async def request_in_slot(
+    request_completion: Callable[[], Awaitable[CompletionResponse]],
+    semaphore: Optional[Union[asyncio.Semaphore, AdaptiveConcurrencyLimiter, FairSemaphoreShare]] = None,
+    recorder: Optional[MetricsRecorder] = None,
+) -> Tuple[CompletionResponse, float]:
+    """
+    Requests a completion within a concurrency slot of the semaphore or limiter, if one is given.
+    Returns the completion and the milliseconds spent waiting for the slot, including any rate limit back off of the limiter.
+    """
+    requested_at = time.perf_counter()
+    queue_wait = 0.0
+
+    async def timed_request() -> CompletionResponse:
+        nonlocal requested_at, queue_wait
+        # Every attempt the limiter makes is timed on its own, the time before it is queue wait
+        started_at = time.perf_counter()
+        waited = (started_at - requested_at) * 1000
+        queue_wait += waited
+        start_time = time.time() if recorder else 0.0
+        if recorder:
+            recorder.record(MetricsStage.QUEUE_WAIT, start_time - waited / 1000, waited)
+        try:
+            return await request_completion()
+        finally:
+            requested_at = time.perf_counter()
+            if recorder:
+                recorder.record(MetricsStage.COMPLETION, start_time, (requested_at - started_at) * 1000)
+
+    if isinstance(semaphore, AdaptiveConcurrencyLimiter):
+        # The limiter adapts the concurrency and retries the request after rate limit errors
+        completion = await semaphore.run(timed_request)
+    else:
+        # If semaphore is provided, acquire it before requesting the completion
+        async with semaphore or contextlib.nullcontext():
+            completion = await timed_request()
+    return completion, queue_wait
+
+
+async def get_image_size(image_path: Optional[str], image_data: Optional[Union[bytes, memoryview, List[bytes]]]) -> int:
+    """Returns the size in bytes of a page image, as sent to the model."""
+    if image_data is None:
+        return await async_os.path.getsize(image_path)
+    if isinstance(image_data, list):
+        return sum(len(tile) for tile in image_data)
+    return len(image_data)
 
 
 async def process_pages_in_batches(
-    images: List[str],
+    images: List[Union[str, bytes, EncodedImage]],
     concurrency: int,
-    model: litellmmodel,
+    model: BaseModel,
     temp_directory: str = "",
-    input_token_count: int = 0,
-    output_token_count: int = 0,
     prior_page: str = "",
-):
+    cache: Optional[BaseCache] = None,
+    max_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    hedger: Optional[RequestHedger] = None,
+) -> List[PageResult]:
     # Create a semaphore to limit the number of concurrent tasks
     semaphore = asyncio.Semaphore(concurrency)
 
@@ -96,13 +582,327 @@ async def process_pages_in_batches(
             image,
             model,
             temp_directory,
-            input_token_count,
-            output_token_count,
             prior_page,
             semaphore,
+            cache,
+            max_retries,
+            hedger=hedger,
         )
         for image in images
     ]
 
     # Wait for all tasks to complete
     return await asyncio.gather(*tasks)
+
+
+async def process_pages_as_completed(
+    images: Union[
+        Iterable[Union[str, bytes, EncodedImage, TextLayerPage]], AsyncIterable[Union[str, bytes, EncodedImage, TextLayerPage]]
+    ],
+    concurrency: Union[int, AdaptiveConcurrencyLimiter, FairSemaphoreShare],
+    model: BaseModel,
+    temp_directory: str = "",
+    cache: Optional[BaseCache] = None,
+    max_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    completed_pages: Optional[Dict[int, str]] = None,
+    context_pages: Optional[Callable[[int], List[int]]] = None,
+    page_filter: Optional[PageFilter] = None,
+    pages_per_request: int = BatchingDefaultOptions.PAGES_PER_REQUEST,
+    recorder: Optional[MetricsRecorder] = None,
+    hedger: Optional[RequestHedger] = None,
+) -> AsyncIterator[Tuple[int, PageResult]]:
+    """
+    Process pages in parallel, yielding (index, result) tuples as soon as each page's completion lands.
+    images may be an async iterable (e.g. iter_pdf_images), in which case each page is scheduled as soon as it is produced.
+    concurrency is either a fixed number of concurrent requests, an AdaptiveConcurrencyLimiter or a share of a FairSemaphore.
+    Pages that still fail after their retries are re-queued once more at the end of the batch.
+    Pages in completed_pages (markdown by index, e.g. from a resumed job) are skipped.
+    With context_pages (see get_context_pages), each page waits for the markdown of its context pages and gets it as the prior page.
+    With a page_filter, blank pages are returned without a completion request and near-duplicate pages reuse the completion of the earlier page.
+    With pages_per_request above 1, consecutive pages are sent together (see process_page_batch), falling back to one page per request
+    for batches whose response can't be split. Batching is not combined with context_pages.
+    With a recorder, the page filter, the queue wait and the completion requests are timed.
+    With a hedger, slow single page completion requests get a duplicate (see RequestHedger), multi-page requests are not hedged.
+    """
+    completed_pages = completed_pages or {}
+    classifier = PageClassifier(page_filter, temp_directory) if page_filter else None
+    if context_pages:
+        pages_per_request = 1
+
+    # Create a semaphore to limit the number of concurrent tasks, unless a limiter or a shared semaphore was given
+    if isinstance(concurrency, int):
+        semaphore = asyncio.Semaphore(concurrency)
+        max_concurrency = concurrency
+    else:
+        semaphore = concurrency
+        max_concurrency = concurrency.max_limit
+
+    # Limit how many pages are pulled from images ahead of the model calls, so that pending page images don't pile up in memory
+    scheduling_window = asyncio.Semaphore(max_concurrency * pages_per_request + PDFConversionDefaultOptions.PREFETCH_PAGES)
+
+    # Completed (index, result) tuples, followed by None once every page is done or by the error that stopped scheduling
+    completed: asyncio.Queue = asyncio.Queue()
+    tasks: List[asyncio.Task] = []
+
+    failed_pages: List[Tuple[int, Union[str, bytes, EncodedImage], str, PageResult]] = []
+
+    # Markdown of every page once it is first processed, for the pages that get it as context
+    page_markdown: Dict[int, asyncio.Future] = {}
+
+    def get_page_markdown(index: int) -> asyncio.Future:
+        if index not in page_markdown:
+            page_markdown[index] = asyncio.get_running_loop().create_future()
+            if index in completed_pages:
+                page_markdown[index].set_result(completed_pages[index])
+        return page_markdown[index]
+
+    # First results of the pages sent to the model, for the duplicates of them
+    page_results: Dict[int, asyncio.Future] = {}
+
+    def get_page_result(index: int) -> asyncio.Future:
+        if index not in page_results:
+            page_results[index] = asyncio.get_running_loop().create_future()
+        return page_results[index]
+
+    async def process_indexed_page(
+        index: int,
+        image: Union[str, bytes, EncodedImage],
+        failed_attempts: int = 0,
+        token_share: Optional[CompletionResponse] = None,
+    ):
+        try:
+            prior_page = ""
+            if context_pages:
+                context = [await get_page_markdown(context_index) for context_index in context_pages(index)]
+                prior_page = "\n\n".join(markdown for markdown in context if markdown)
+
+            result = await process_page(
+                image,
+                model,
+                temp_directory,
+                prior_page=prior_page,
+                semaphore=semaphore,
+                cache=cache,
+                max_retries=max_retries,
+                recorder=recorder,
+                hedger=hedger,
+                failed_attempts=failed_attempts,
+            )
+            if token_share:
+                add_tokens(result, token_share)
+            complete_page(index, image, prior_page, result)
+        finally:
+            release_page(index)
+
+    async def process_batched_pages(batch: List[Tuple[int, Union[str, bytes, EncodedImage]]]):
+        results, token_shares = await process_page_batch(
+            [image for _, image in batch], model, temp_directory, semaphore, cache, recorder
+        )
+        if results is None and token_shares is None:
+            # The pages are processed one by one instead, the failed multi-page request counting as their first attempt
+            await asyncio.gather(*(process_indexed_page(index, image, failed_attempts=1) for index, image in batch))
+            return
+        if results is None:
+            # The response couldn't be split into pages, the pages are processed one by one and carry the tokens it cost
+            await asyncio.gather(
+                *(
+                    process_indexed_page(index, image, token_share=token_share)
+                    for (index, image), token_share in zip(batch, token_shares)
+                )
+            )
+            return
+        for (index, image), result in zip(batch, results):
+            try:
+                complete_page(index, image, "", result)
+            finally:
+                release_page(index)
+
+    def complete_page(index: int, image: Union[str, bytes, EncodedImage], prior_page: str, result: PageResult):
+        if context_pages:
+            # Pages waiting on a failed page go ahead without its markdown rather than wait for the re-queue
+            get_page_markdown(index).set_result(result.content)
+        if classifier:
+            get_page_result(index).set_result(result)
+
+        if result.status == PageStatus.FAILED:
+            failed_pages.append((index, image, prior_page, result))
+        else:
+            completed.put_nowait((index, result))
+
+    def release_page(index: int):
+        if context_pages and not get_page_markdown(index).done():
+            get_page_markdown(index).set_result("")
+        if classifier and not get_page_result(index).done():
+            get_page_result(index).set_result(None)
+        scheduling_window.release()
+
+    def complete_filtered_page(index: int, result: PageResult):
+        if context_pages:
+            get_page_markdown(index).set_result(result.content)
+        completed.put_nowait((index, result))
+        scheduling_window.release()
+
+    async def process_duplicate_page(index: int, image: Union[str, bytes, EncodedImage], original_index: int):
+        original = await get_page_result(original_index)
+        if original is None or original.status == PageStatus.FAILED:
+            # There is no completion to reuse, so the page is processed on its own
+            await process_indexed_page(index, image)
+            return
+        complete_filtered_page(
+            index, PageResult(content=original.content, status=PageStatus.DUPLICATE, duplicate_of=original_index)
+        )
+
+    async def requeue_failed_page(
+        index: int, image: Union[str, bytes, EncodedImage], prior_page: str, failed_result: PageResult
+    ):
+        result = await process_page(
+            image,
+            model,
+            temp_directory,
+            prior_page=prior_page,
+            semaphore=semaphore,
+            cache=cache,
+            max_retries=max_retries,
+            recorder=recorder,
+            hedger=hedger,
+        )
+        result.attempts += failed_result.attempts
+        result.latency += failed_result.latency
+        add_tokens(result, failed_result)
+        if result.status == PageStatus.OK:
+            result.status = PageStatus.RETRIED
+        completed.put_nowait((index, result))
+
+    async def schedule_pages():
+        try:
+            index = 0
+            batch: List[Tuple[int, Union[str, bytes, EncodedImage]]] = []
+            image_iterator = aiter(iterate_async(images))
+            while True:
+                await scheduling_window.acquire()
+                try:
+                    image = await anext(image_iterator)
+                except StopAsyncIteration:
+                    break
+                if index in completed_pages:
+                    scheduling_window.release()
+                    index += 1
+                    continue
+
+                status, original_index = None, None
+                if classifier and not isinstance(image, TextLayerPage):
+                    with timed(recorder, MetricsStage.FILTER):
+                        status, original_index = await asyncio.to_thread(classifier.classify, index, image)
+                if status == PageStatus.BLANK:
+                    complete_filtered_page(index, PageResult(content="", status=PageStatus.BLANK))
+                elif status == PageStatus.DUPLICATE:
+                    if any(batch_index == original_index for batch_index, _ in batch):
+                        # Send the original now, duplicates waiting on it could otherwise fill the window before its batch fills up
+                        tasks.append(asyncio.create_task(process_batched_pages(batch)))
+                        batch = []
+                    tasks.append(asyncio.create_task(process_duplicate_page(index, image, original_index)))
+                elif pages_per_request > 1 and not isinstance(image, TextLayerPage):
+                    batch.append((index, image))
+                    if len(batch) == pages_per_request:
+                        tasks.append(asyncio.create_task(process_batched_pages(batch)))
+                        batch = []
+                else:
+                    tasks.append(asyncio.create_task(process_indexed_page(index, image)))
+                index += 1
+
+            if batch:
+                tasks.append(asyncio.create_task(process_batched_pages(batch)))
+            await asyncio.gather(*tasks)
+
+            # Give pages that failed all their retries one more chance, now that the rest of the batch is done
+            requeued_tasks = [
+                asyncio.create_task(requeue_failed_page(index, image, prior_page, result))
+                for index, image, prior_page, result in failed_pages
+            ]
+            tasks.extend(requeued_tasks)
+            await asyncio.gather(*requeued_tasks)
+
+            completed.put_nowait(None)
+        except Exception as err:
+            completed.put_nowait(err)
+
+    scheduler = asyncio.create_task(schedule_pages())
+    try:
+        while (item := await completed.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Cancel whatever is still in flight if the consumer stops early, and wait for it to stop before the caller cleans up
+        scheduler.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(scheduler, *tasks, return_exceptions=True)
+
+
+async def process_pages_in_order(
+    images: Union[
+        Iterable[Union[str, bytes, EncodedImage, TextLayerPage]], AsyncIterable[Union[str, bytes, EncodedImage, TextLayerPage]]
+    ],
+    model: BaseModel,
+    temp_directory: str = "",
+    cache: Optional[BaseCache] = None,
+    limiter: Optional[Union[AdaptiveConcurrencyLimiter, FairSemaphoreShare]] = None,
+    max_retries: int = RetryDefaultOptions.MAX_RETRIES,
+    completed_pages: Optional[Dict[int, str]] = None,
+    page_filter: Optional[PageFilter] = None,
+    recorder: Optional[MetricsRecorder] = None,
+    hedger: Optional[RequestHedger] = None,
+) -> AsyncIterator[Tuple[int, PageResult]]:
+    """
+    Process pages one at a time, passing each page's markdown as context to the next one.
+    Each request takes a slot of the limiter, or of a document's share of a FairSemaphore, if one is given.
+    Pages in completed_pages (markdown by index, e.g. from a resumed job) are skipped, their markdown is still passed on as context.
+    With a page_filter, blank pages are returned without a completion request and don't change the context,
+    and near-duplicate pages reuse the completion of the earlier page.
+    """
+    completed_pages = completed_pages or {}
+    classifier = PageClassifier(page_filter, temp_directory) if page_filter else None
+    page_results: Dict[int, PageResult] = {}
+
+    prior_page = ""
+    index = 0
+    async for image in iterate_async(images):
+        if index in completed_pages:
+            prior_page = completed_pages[index]
+            index += 1
+            continue
+
+        status, original_index = None, None
+        if classifier and not isinstance(image, TextLayerPage):
+            with timed(recorder, MetricsStage.FILTER):
+                status, original_index = await asyncio.to_thread(classifier.classify, index, image)
+        if status == PageStatus.DUPLICATE and page_results[original_index].status == PageStatus.FAILED:
+            # There is no completion to reuse, so the page is processed on its own
+            status = None
+
+        if status == PageStatus.BLANK:
+            yield index, PageResult(content="", status=PageStatus.BLANK)
+            index += 1
+            continue
+        if status == PageStatus.DUPLICATE:
+            result = PageResult(
+                content=page_results[original_index].content, status=PageStatus.DUPLICATE, duplicate_of=original_index
+            )
+        else:
+            result = await process_page(
+                image,
+                model,
+                temp_directory,
+                prior_page=prior_page,
+                semaphore=limiter,
+                cache=cache,
+                max_retries=max_retries,
+                recorder=recorder,
+                hedger=hedger,
+            )
+            if classifier:
+                page_results[index] = result
+        prior_page = result.content
+        yield index, result
+        index += 1
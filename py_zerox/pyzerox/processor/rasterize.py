@@ -0,0 +1,51 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional
+
+## process pools by number of workers, shared by every document so that worker processes are only started once
+_process_pools: Dict[int, ProcessPoolExecutor] = {}
+_process_pools_lock = threading.Lock()
+
+
+def get_available_cpus() -> int:
+    """Returns the number of CPUs this process may run on, which can be fewer than the machine has (e.g. in containers)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_rasterize_workers(workers: Optional[int]) -> int:
+    """Returns the number of rasterization workers, one per available CPU for None."""
+    return max(1, get_available_cpus() if workers is None else workers)
+
+
+def get_process_pool(workers: int) -> Executor:
+    """
+    Returns the shared process pool with the given number of workers, starting it on first use.
+    Workers are spawned rather than forked, as forking a process with running threads (e.g. the event loop's executor) is unsafe.
+    """
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            pool = _process_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return pool
+
+
+def is_main_module_error(error: BaseException) -> bool:
+    """
+    Whether an error is multiprocessing refusing to start worker processes from a spawned process that is importing the main module,
+    which happens when zerox is called at the top level of a script without an `if __name__ == "__main__":` guard.
+    """
+    return isinstance(error, RuntimeError) and "bootstrapping phase" in str(error)
+
+
+def discard_process_pool(workers: int) -> None:
+    """Drops a broken process pool, so that the next document starts a new one."""
+    with _process_pools_lock:
+        pool = _process_pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,190 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Union
+from PIL import Image
+
+# Package Imports
+from ..constants import PDFConversionDefaultOptions, PDFRenderer
+from ..constants.messages import Messages
+from ..errors import InvalidPDFRenderer
+
+
+class BasePDFRenderer(ABC):
+    """
+    Base class for PDF renderers, which render ranges of pages of a PDF to images.
+    Renderers are pickled to the rasterization worker processes, so they should be cheap to copy.
+    """
+
+    @abstractmethod
+    def get_page_count(self, local_path: str) -> int:
+        raise NotImplementedError("Subclasses must implement this method")
+
+    @abstractmethod
+    def render(
+        self,
+        local_path: str,
+        first_page: int,
+        last_page: int,
+        image_density: int,
+        image_height: Tuple[Optional[int], Optional[int]],
+        thread_count: int = PDFConversionDefaultOptions.THREAD_COUNT,
+    ) -> List[Image.Image]:
+        """
+        Renders a range of pages (1-indexed, inclusive) to images in page order.
+
+        :param image_density: The DPI to render at, when image_height doesn't give the size.
+        :type image_density: int
+        :param image_height: The (width, height) of the images, either may be None to keep the aspect ratio of the page.
+        :type image_height: Tuple[Optional[int], Optional[int]]
+        :param thread_count: How many threads or processes the renderer may use, if it can render in parallel.
+        :type thread_count: int
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def render_to_files(
+        self,
+        local_path: str,
+        first_page: int,
+        last_page: int,
+        image_density: int,
+        image_height: Tuple[Optional[int], Optional[int]],
+        output_folder: str,
+        thread_count: int = PDFConversionDefaultOptions.THREAD_COUNT,
+    ) -> List[str]:
+        """Renders a range of pages to image files in output_folder, returning their paths in page order."""
+        image_paths = []
+        for page_number, image in enumerate(
+            self.render(local_path, first_page, last_page, image_density, image_height, thread_count), start=first_page
+        ):
+            image_path = os.path.join(output_folder, f"page-{page_number:05d}.{PDFConversionDefaultOptions.FORMAT}")
+            image.save(image_path, format=PDFConversionDefaultOptions.FORMAT)
+            image_paths.append(image_path)
+        return image_paths
+
+
+class PopplerRenderer(BasePDFRenderer):
+    """Renders pages with poppler's pdftoppm/pdftocairo through pdf2image, one subprocess per conversion."""
+
+    def get_page_count(self, local_path: str) -> int:
+        from pdf2image import pdfinfo_from_path
+
+        return pdfinfo_from_path(local_path)["Pages"]
+
+    def render(self, local_path, first_page, last_page, image_density, image_height, thread_count=PDFConversionDefaultOptions.THREAD_COUNT):
+        from pdf2image import convert_from_path
+
+        # pdftocairo always goes through a temporary folder, pdftoppm can stream raw pixmaps over stdout
+        return convert_from_path(
+            pdf_path=local_path,
+            first_page=first_page,
+            last_page=last_page,
+            dpi=image_density,
+            size=image_height,
+            thread_count=thread_count,
+            fmt="ppm",
+            use_pdftocairo=False,
+        )
+
+    def render_to_files(self, local_path, first_page, last_page, image_density, image_height, output_folder, thread_count=PDFConversionDefaultOptions.THREAD_COUNT):
+        from pdf2image import convert_from_path
+
+        return convert_from_path(
+            pdf_path=local_path,
+            first_page=first_page,
+            last_page=last_page,
+            dpi=image_density,
+            size=image_height,
+            thread_count=thread_count,
+            output_folder=output_folder,
+            fmt=PDFConversionDefaultOptions.FORMAT,
+            use_pdftocairo=PDFConversionDefaultOptions.USE_PDFTOCAIRO,
+            paths_only=True,
+        )
+
+
+## pdfium is not thread safe, so calls into it are serialized within a process
+_pdfium_lock = threading.Lock()
+
+
+class PdfiumRenderer(BasePDFRenderer):
+    """
+    Renders pages in process with PDFium (the pypdfium2 package, installed with the pdfium extra) straight to in-memory images,
+    without a subprocess or temporary files. Renders one page at a time, combine it with rasterize_workers to render in parallel.
+    """
+
+    def get_page_count(self, local_path: str) -> int:
+        pdfium = import_pdfium()
+        with _pdfium_lock:
+            document = pdfium.PdfDocument(local_path)
+            try:
+                return len(document)
+            finally:
+                document.close()
+
+    def render(self, local_path, first_page, last_page, image_density, image_height, thread_count=PDFConversionDefaultOptions.THREAD_COUNT):
+        pdfium = import_pdfium()
+        images = []
+        with _pdfium_lock:
+            document = pdfium.PdfDocument(local_path)
+            try:
+                for page_index in range(first_page - 1, last_page):
+                    page = document[page_index]
+                    try:
+                        width, height = page.get_size()
+                        image = page.render(scale=get_render_scale(width, height, image_density, image_height)).to_pil()
+                    finally:
+                        page.close()
+                    target_width, target_height = image_height if isinstance(image_height, tuple) else (None, None)
+                    if target_width and target_height:
+                        ## both sides were given, the page is stretched to them as poppler does
+                        image = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+                    images.append(image)
+            finally:
+                document.close()
+        return images
+
+
+def get_render_scale(
+    page_width: float, page_height: float, image_density: int, image_height: Optional[Union[int, Tuple[Optional[int], Optional[int]]]]
+) -> float:
+    """Returns the scale from PDF points (1/72 inch) to pixels for a page, following pdf2image's size semantics."""
+    if isinstance(image_height, int):
+        ## a single number is the size of the longer side
+        return image_height / max(page_width, page_height)
+    target_width, target_height = image_height if image_height else (None, None)
+    if target_height:
+        return target_height / page_height
+    if target_width:
+        return target_width / page_width
+    return image_density / 72
+
+
+def import_pdfium():
+    """Imports pypdfium2, which is only needed by the pdfium renderer."""
+    try:
+        import pypdfium2
+    except ImportError as error:
+        raise ImportError(Messages.PDFIUM_NOT_INSTALLED) from error
+    return pypdfium2
+
+
+## renderers by name, to be selected with renderer
+_renderers: Dict[str, BasePDFRenderer] = {
+    PDFRenderer.POPPLER: PopplerRenderer(),
+    PDFRenderer.PDFIUM: PdfiumRenderer(),
+}
+
+
+def register_renderer(name: str, renderer: BasePDFRenderer) -> None:
+    """Registers a renderer under a name, to be selected with renderer. It must be picklable to render in worker processes."""
+    _renderers[name] = renderer
+
+
+def get_renderer(renderer: Union[str, BasePDFRenderer]) -> BasePDFRenderer:
+    """Returns the renderer registered under a name, or the renderer itself if one is given."""
+    if isinstance(renderer, BasePDFRenderer):
+        return renderer
+    if renderer not in _renderers:
+        raise InvalidPDFRenderer(Messages.INVALID_PDF_RENDERER.format(renderer, ", ".join(_renderers)))
+    return _renderers[renderer]
@@ -0,0 +1,20 @@
+import random
+from typing import Optional
+
+# Package Imports
+from .limiter import get_retry_after
+from ..constants import RetryDefaultOptions
+
+
+def get_backoff_delay(attempt: int, error: Optional[BaseException] = None) -> float:
+    """
+    Returns the delay in seconds before retrying after the given (1-indexed) failed attempt.
+    Uses exponential backoff with full jitter, and never retries sooner than the provider's retry-after hint.
+    """
+    backoff = min(RetryDefaultOptions.MAX_DELAY, RetryDefaultOptions.BASE_DELAY * 2 ** (attempt - 1))
+    delay = random.uniform(0, backoff)
+
+    retry_after = get_retry_after(error) if error is not None else None
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
@@ -0,0 +1,74 @@
+import logging
+from typing import Optional, TYPE_CHECKING
+
+# Package Imports
+from ..constants import TextLayerDefaultOptions
+
+if TYPE_CHECKING:
+    from PyPDF2 import PageObject, PdfReader
+
+
+def extract_text_layer(page: "PageObject", reader: "PdfReader") -> Optional[str]:
+    """
+    Returns the text layer of a PDF page if it can be used instead of a model call, None if the page has to go to the model:
+    when it has little or garbled text, large images (e.g. a scan) or many ruled lines (e.g. tables and charts).
+    """
+    try:
+        if count_image_pixels(page.get("/Resources")) > TextLayerDefaultOptions.MAX_IMAGE_PIXELS:
+            return None
+
+        text = page.extract_text()
+        if not is_good_text(text):
+            return None
+
+        contents = page.get_contents()
+        if contents is not None:
+            from PyPDF2.generic import ContentStream
+
+            operations = ContentStream(contents, reader).operations
+            ruling_operations = sum(operator in (b"re", b"l") for _, operator in operations)
+            if ruling_operations > TextLayerDefaultOptions.MAX_RULING_OPERATIONS:
+                return None
+    except Exception as error:
+        # Pages PyPDF2 can't read are left to the model
+        logging.warning(f"Failed to read the text layer of a page. Error:{error}")
+        return None
+
+    return "\n".join(line.strip() for line in text.strip().splitlines())
+
+
+def is_good_text(text: str) -> bool:
+    """Judges whether extracted text is long enough and looks like real words rather than a garbled font encoding."""
+    text = text.strip()
+    if len(text) < TextLayerDefaultOptions.MIN_CHARACTERS:
+        return False
+
+    printable = sum(character.isprintable() or character in "\n\t" for character in text) - text.count("�")
+    if printable / len(text) < TextLayerDefaultOptions.MIN_PRINTABLE_RATIO:
+        return False
+
+    words = text.split()
+    real_words = sum(
+        len(word) <= TextLayerDefaultOptions.MAX_WORD_LENGTH and any(character.isalnum() for character in word)
+        for word in words
+    )
+    return real_words / len(words) >= TextLayerDefaultOptions.MIN_WORD_RATIO
+
+
+def count_image_pixels(resources, depth: int = 0) -> int:
+    """Counts the pixels of the images in a page's resources, including images nested in form XObjects."""
+    if resources is None or depth > TextLayerDefaultOptions.MAX_XOBJECT_DEPTH:
+        return 0
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return 0
+
+    pixels = 0
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            pixels += int(xobject.get("/Width", 0)) * int(xobject.get("/Height", 0))
+        elif subtype == "/Form":
+            pixels += count_image_pixels(xobject.get("/Resources"), depth + 1)
+    return pixels
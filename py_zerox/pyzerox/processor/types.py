@@ -0,0 +1,154 @@
+from dataclasses import dataclass, field, replace
+from typing import List, Optional
+
+# Package Imports
+from ..constants import HedgingDefaultOptions, ImageEncodingDefaultOptions, PageFilterDefaultOptions, Messages, PageStatus
+from ..errors import UnsupportedImageFormat
+
+
+@dataclass
+class PageResult:
+    """
+    Dataclass to store the result of processing a single page.
+    """
+
+    content: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    ## input tokens read from the provider's prompt cache
+    cached_input_tokens: int = 0
+    cache_hit: bool = False
+    status: str = PageStatus.OK
+    ## number of completion requests made for the page, 0 for cache hits
+    attempts: int = 0
+    ## milliseconds from the first completion request to the final result
+    latency: float = 0.0
+    ## milliseconds the successful completion request waited for a concurrency slot
+    queue_wait: float = 0.0
+    error: Optional[str] = None
+    ## size of the page image sent to the model, 0 for cache hits
+    image_bytes: int = 0
+    ## index of the page whose completion a duplicate page reuses
+    duplicate_of: Optional[int] = None
+    ## number of pages sent in the same completion request
+    batch_size: int = 1
+    ## whether a duplicate completion request was sent because the first one was slow
+    hedged: bool = False
+    ## tokens of the duplicate request that lost the race (an upper bound when it was cancelled)
+    hedge_input_tokens: int = 0
+    hedge_output_tokens: int = 0
+
+
+@dataclass
+class ImageEncoding:
+    """
+    Dataclass to configure how page images are encoded before they are sent to the model.
+
+    :param format: The image format, one of "png", "jpeg" or "webp", defaults to "png"
+    :type format: str, optional
+    :param quality: The quality (1-100) of the lossy formats, defaults to 85
+    :type quality: int, optional
+    :param grayscale: Whether to convert pages to grayscale, defaults to False
+    :type grayscale: bool, optional
+    :param max_pixels: The largest image to send in pixels, larger pages are downscaled (or tiled). Defaults to None, the budget of the model in ImageEncodingDefaultOptions.MAX_PIXELS_BY_MODEL if it is known, else no limit
+    :type max_pixels: int, optional
+    :param tile: Whether to split pages larger than max_pixels into horizontal tiles that are sent together, instead of downscaling them, defaults to False
+    :type tile: bool, optional
+    """
+
+    format: str = ImageEncodingDefaultOptions.FORMAT
+    quality: int = ImageEncodingDefaultOptions.QUALITY
+    grayscale: bool = False
+    max_pixels: Optional[int] = None
+    tile: bool = False
+
+    def __post_init__(self):
+        self.format = self.format.lower()
+        if self.format not in ImageEncodingDefaultOptions.MIME_TYPES:
+            raise UnsupportedImageFormat(Messages.UNSUPPORTED_IMAGE_FORMAT.format(self.format))
+
+    @property
+    def mime_type(self) -> str:
+        return ImageEncodingDefaultOptions.MIME_TYPES[self.format]
+
+    def for_model(self, model: Optional[str]) -> "ImageEncoding":
+        """Returns a copy with max_pixels set to the model's budget, unless it was given explicitly."""
+        if self.max_pixels is not None:
+            return self
+
+        model_name = (model or "").lower()
+        for pattern, max_pixels in ImageEncodingDefaultOptions.MAX_PIXELS_BY_MODEL:
+            if pattern in model_name:
+                return replace(self, max_pixels=max_pixels)
+        return self
+
+
+@dataclass
+class PageFilter:
+    """
+    Dataclass to configure the detection of blank and near-duplicate pages before any completion is requested.
+
+    :param skip_blank: Whether to skip pages without content, which are returned empty with status "blank", defaults to True
+    :type skip_blank: bool, optional
+    :param dedupe: Whether to reuse the completion of an earlier near-identical page of the document, marking the page with status "duplicate", defaults to True
+    :type dedupe: bool, optional
+    :param blank_stddev: Pages whose grayscale thumbnail has a pixel standard deviation below this are blank, defaults to 4.0
+    :type blank_stddev: float, optional
+    :param max_hash_distance: Pages whose perceptual hashes differ in at most this many bits are compared pixel by pixel, defaults to 6
+    :type max_hash_distance: int, optional
+    :param max_pixel_difference: Pages whose thumbnails differ by less than this mean absolute pixel value are duplicates, defaults to 1.5
+    :type max_pixel_difference: float, optional
+    """
+
+    skip_blank: bool = True
+    dedupe: bool = True
+    blank_stddev: float = PageFilterDefaultOptions.BLANK_STDDEV
+    max_hash_distance: int = PageFilterDefaultOptions.MAX_HASH_DISTANCE
+    max_pixel_difference: float = PageFilterDefaultOptions.MAX_PIXEL_DIFFERENCE
+
+
+@dataclass
+class HedgingPolicy:
+    """
+    Dataclass to configure hedged completion requests: a request that is slower than most gets a duplicate, and the first response wins.
+
+    :param percentile: Percentile of the recently observed completion latencies after which a duplicate request is sent, defaults to 0.95
+    :type percentile: float, optional
+    :param max_hedge_rate: Largest share of the completion requests that get a duplicate, defaults to 0.05
+    :type max_hedge_rate: float, optional
+    :param min_samples: Completions to observe before any request is hedged, defaults to 20
+    :type min_samples: int, optional
+    :param min_delay: Shortest wait in seconds before a duplicate request is sent, defaults to 1.0
+    :type min_delay: float, optional
+    :param window: Recent completion latencies the percentile is taken over, defaults to 200
+    :type window: int, optional
+    """
+
+    percentile: float = HedgingDefaultOptions.PERCENTILE
+    max_hedge_rate: float = HedgingDefaultOptions.MAX_HEDGE_RATE
+    min_samples: int = HedgingDefaultOptions.MIN_SAMPLES
+    min_delay: float = HedgingDefaultOptions.MIN_DELAY
+    window: int = HedgingDefaultOptions.WINDOW
+
+
+@dataclass
+class TextLayerPage:
+    """
+    Dataclass to store a page whose text layer is used in place of a page image.
+    """
+
+    text: str
+
+
+@dataclass
+class EncodedImage:
+    """
+    Dataclass to store an encoded page image, as one or more tiles in page order.
+    """
+
+    tiles: List[bytes] = field(default_factory=list)
+    mime_type: str = "image/png"
+
+    @property
+    def size(self) -> int:
+        return sum(len(tile) for tile in self.tiles)
@@ -1,38 +1,152 @@
+import contextlib
 import os
 import re
-from typing import Optional, Union, Iterable
+from typing import AsyncIterable, AsyncIterator, Awaitable, Container, List, Optional, Tuple, TypeVar, Union, Iterable, TYPE_CHECKING
 from urllib.parse import urlparse
 import aiofiles
-import aiohttp
-from PyPDF2 import PdfReader, PdfWriter
+import aiofiles.os as async_os
 from ..constants.messages import Messages
 
 # Package Imports
-from ..errors.exceptions import ResourceUnreachableException, PageNumberOutOfBoundError
+from ..constants import DownloadDefaultOptions
+from ..errors.exceptions import (
+    FileTooLarge,
+    FileUnavailable,
+    ResourceUnreachableException,
+    PageNumberOutOfBoundError,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+T = TypeVar("T")
+
+
+def create_http_session() -> "aiohttp.ClientSession":
+    """Creates an HTTP session with a connection pool, to be reused across downloads and closed by the caller."""
+    ## aiohttp is slow to import, it is only needed to download files
+    import aiohttp
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=DownloadDefaultOptions.CONNECTION_LIMIT,
+            limit_per_host=DownloadDefaultOptions.CONNECTION_LIMIT_PER_HOST,
+        ),
+        timeout=aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=DownloadDefaultOptions.CONNECT_TIMEOUT,
+            sock_read=DownloadDefaultOptions.READ_TIMEOUT,
+        ),
+    )
 
 
 async def download_file(
     file_path: str,
     temp_dir: str,
+    session: Optional["aiohttp.ClientSession"] = None,
+    max_size_bytes: Optional[int] = DownloadDefaultOptions.MAX_SIZE_BYTES,
 ) -> Optional[str]:
-    """Downloads a file from a URL or local path to a temporary directory."""
+    """
+    Downloads a file from a URL to a temporary directory, or returns the path of a local file to use it in place.
+
+    :param file_path: The URL or local path of the file.
+    :type file_path: str
+    :param temp_dir: The directory to download the file to.
+    :type temp_dir: str
+    :param session: The HTTP session to download with, defaults to None (a session is created for the download)
+    :type session: aiohttp.ClientSession, optional
+    :param max_size_bytes: Downloads larger than this are aborted with FileTooLarge, defaults to DownloadDefaultOptions.MAX_SIZE_BYTES
+    :type max_size_bytes: int, optional
+    :return: The local path of the file.
+    """
+
+    if not is_valid_url(file_path):
+        # Local files are read where they are, nothing writes to them
+        if not await async_os.path.isfile(file_path):
+            raise FileUnavailable()
+        return os.path.abspath(file_path)
 
     local_pdf_path = os.path.join(temp_dir, os.path.basename(file_path))
-    if is_valid_url(file_path):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(file_path) as response:
-                if response.status != 200:
-                    raise ResourceUnreachableException()
-                async with aiofiles.open(local_pdf_path, "wb") as f:
-                    await f.write(await response.read())
-    else:
-        async with aiofiles.open(file_path, "rb") as src, aiofiles.open(
-            local_pdf_path, "wb"
-        ) as dst:
-            await dst.write(await src.read())
+    async with contextlib.AsyncExitStack() as stack:
+        if session is None:
+            session = await stack.enter_async_context(create_http_session())
+        response = await stack.enter_async_context(session.get(file_path))
+        if response.status != 200:
+            raise ResourceUnreachableException(Messages.FILE_UNREACHAGBLE.format(response.status))
+        if max_size_bytes is not None and (response.content_length or 0) > max_size_bytes:
+            raise FileTooLarge(Messages.FILE_TOO_LARGE.format(max_size_bytes))
+
+        # Stream the response to disk chunk by chunk instead of buffering the whole file
+        try:
+            downloaded_bytes = 0
+            async with aiofiles.open(local_pdf_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(DownloadDefaultOptions.CHUNK_SIZE):
+                    downloaded_bytes += len(chunk)
+                    if max_size_bytes is not None and downloaded_bytes > max_size_bytes:
+                        raise FileTooLarge(Messages.FILE_TOO_LARGE.format(max_size_bytes))
+                    await f.write(chunk)
+        except BaseException:
+            if await async_os.path.exists(local_pdf_path):
+                await async_os.remove(local_pdf_path)
+            raise
+
     return local_pdf_path
 
 
+async def iterate_async(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Iterates over a regular or an async iterable alike."""
+
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def iterate_after(
+    items: Union[Iterable[T], AsyncIterable[T]], awaitable: Optional[Awaitable]
+) -> AsyncIterator[T]:
+    """
+    Iterates over items, but holds back the first item until the awaitable is done.
+    Producing the first item overlaps with the awaitable, and any error it raises is raised before an item is handed out.
+    """
+
+    async for item in iterate_async(items):
+        if awaitable is not None:
+            await awaitable
+            awaitable = None
+        yield item
+
+    if awaitable is not None:
+        await awaitable
+
+
+async def fill_skipped(
+    items: Union[Iterable[T], AsyncIterable[T]], skipped: Container[int], count: int
+) -> AsyncIterator[Optional[T]]:
+    """
+    Yields count items: None at the skipped indices and the next of items at the others.
+    Lines up a stream that left out the skipped items with the indices of the full stream.
+    """
+
+    iterator = aiter(iterate_async(items))
+    for index in range(count):
+        yield None if index in skipped else await anext(iterator)
+
+
+def get_page_runs(page_numbers: Iterable[int]) -> List[Tuple[int, int]]:
+    """Coalesces page numbers into (first_page, last_page) runs of consecutive pages, in the given order."""
+
+    runs: List[Tuple[int, int]] = []
+    for page_number in page_numbers:
+        if runs and page_number == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page_number)
+        else:
+            runs.append((page_number, page_number))
+    return runs
+
+
 def is_valid_url(string: str) -> bool:
     """Checks if a string is a valid URL."""
 
@@ -77,6 +191,8 @@ def create_selected_pages_pdf(original_pdf_path: str, select_pages: Union[int, I
         # Sort the pages for consistency
         select_pages = sorted(list(select_pages))
 
+    from PyPDF2 import PdfReader, PdfWriter
+
     with open(original_pdf_path, "rb") as orig_pdf, open(selected_pages_pdf_path, "wb") as new_pdf:
 
         # Read the original PDF
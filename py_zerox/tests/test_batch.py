@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from PIL import Image
+
+from pyzerox import zerox_batch, zerox_stream
+from pyzerox.errors import DuplicateOutputFile
+from pyzerox.models import BaseModel, CompletionResponse
+from pyzerox.processor import FairSemaphore, create_http_session
+
+
+class Model(BaseModel):
+    cancelled = []
+    large_page_started = None
+
+    def validate_access(self):
+        pass
+
+    def validate_model(self):
+        pass
+
+    async def completion(self, image_data, mime_type, **kwargs):
+        if len(image_data[0] if isinstance(image_data, list) else image_data) > 2000:
+            Model.large_page_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                Model.cancelled.append(True)
+                raise
+        # The small document finishes once the large one is waiting on the model
+        await Model.large_page_started.wait()
+        return CompletionResponse(content="# Page", input_tokens=1, output_tokens=1)
+
+
+def test_documents_with_the_same_name_are_refused(tmp_path):
+    async def run():
+        file_paths = [str(tmp_path / "a" / "report.pdf"), str(tmp_path / "b" / "report.pdf")]
+        return [item async for item in zerox_batch(file_paths, model=Model(model="mock"), output_dir=str(tmp_path))]
+
+    with pytest.raises(DuplicateOutputFile):
+        asyncio.run(run())
+
+
+def test_unfinished_documents_are_stopped_when_the_caller_stops(tmp_path):
+    small_path, large_path = str(tmp_path / "small.png"), str(tmp_path / "large.png")
+    Image.new("L", (100, 100)).save(small_path)
+    # Noise doesn't compress, so the page of the large document is slow to complete
+    Image.effect_noise((600, 600), 100).save(large_path)
+
+    async def run():
+        Model.large_page_started = asyncio.Event()
+        session = create_http_session()
+        try:
+            batch = zerox_batch([small_path, large_path], model=Model(model="mock"), http_session=session)
+            file_path, _ = await anext(batch)
+            await batch.aclose()
+            # The large document was cancelled, and had stopped by the time the batch was closed
+            assert Model.cancelled == [True]
+            return file_path
+        finally:
+            await session.close()
+
+    assert asyncio.run(run()) == small_path
+
+
+def test_serial_maintain_format_uses_the_shared_budget(tmp_path):
+    png_path = str(tmp_path / "page.png")
+    Image.new("L", (100, 100)).save(png_path)
+    semaphore = FairSemaphore(1)
+
+    async def run():
+        # There is no large page to wait for
+        Model.large_page_started = asyncio.Event()
+        Model.large_page_started.set()
+        other_document = semaphore.share()
+        # Another document holds the only slot, the page has to wait for it
+        await other_document.__aenter__()
+        pages = asyncio.create_task(
+            anext(zerox_stream(file_path=png_path, model=Model(model="mock"), maintain_format=True, concurrency=semaphore.share()))
+        )
+        await asyncio.sleep(0.2)
+        assert not pages.done()
+        await other_document.__aexit__(None, None, None)
+        return await asyncio.wait_for(pages, timeout=5)
+
+    assert asyncio.run(run()).content == "# Page"
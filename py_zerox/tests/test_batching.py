@@ -0,0 +1,75 @@
+import asyncio
+
+from pyzerox.models import CompletionResponse
+from pyzerox.processor import process_pages_as_completed, split_pages
+
+
+def test_split_pages_by_delimiters():
+    content = "Here you go:\n**<<<PAGE 1>>>**\n# Title\n\n### <<<page 2>>>\nBody text\n<<<PAGE 3>>>\n"
+    assert split_pages(content, 3) == ["# Title", "Body text", ""]
+
+    # Missing, repeated or out of order pages are never guessed
+    assert split_pages("<<<PAGE 1>>>\na\n<<<PAGE 3>>>\nc", 3) is None
+    assert split_pages("<<<PAGE 2>>>\nb\n<<<PAGE 1>>>\na", 2) is None
+    assert split_pages("inline <<<PAGE 1>>> delimiter", 1) is None
+
+
+def test_pages_per_request_with_fallback():
+    class Model:
+        requests = []
+
+        async def completion_pages(self, pages):
+            Model.requests.append([image for _, image, _ in pages])
+            if len(pages) == 2:
+                return CompletionResponse(content="both pages without delimiters", input_tokens=10, output_tokens=4)
+            content = "\n".join(f"<<<PAGE {number}>>>\n{image.decode()}" for number, (_, image, _) in enumerate(pages, 1))
+            return CompletionResponse(content=content, input_tokens=10, output_tokens=4)
+
+        async def completion(self, image_data, **kwargs):
+            Model.requests.append([image_data])
+            return CompletionResponse(content=image_data.decode(), input_tokens=7, output_tokens=1)
+
+    images = [f"page {index}".encode() for index in range(5)]
+
+    async def run():
+        results = process_pages_as_completed(images, 4, Model(), pages_per_request=3)
+        return dict([item async for item in results])
+
+    results = asyncio.run(run())
+    assert [results[index].content for index in range(5)] == [f"page {index}" for index in range(5)]
+    # The first three pages share a request and its tokens, the last two fall back to a request each
+    assert [results[index].batch_size for index in range(5)] == [3, 3, 3, 1, 1]
+    assert sum(results[index].input_tokens for index in range(3)) == 10
+    assert sorted(map(len, Model.requests)) == [1, 1, 2, 3]
+    # The response that couldn't be split was still billed, its tokens are shared by the pages requested again
+    assert results[3].input_tokens + results[4].input_tokens == 10 + 2 * 7
+    assert [(results[index].status, results[index].attempts) for index in (3, 4)] == [("ok", 1), ("ok", 1)]
+
+
+def test_failed_multi_page_request_backs_off_before_the_fallback(monkeypatch):
+    from pyzerox.processor import pdf
+
+    delays = []
+
+    def get_backoff_delay(attempt, error=None):
+        delays.append((attempt, str(error)))
+        return 0
+
+    monkeypatch.setattr(pdf, "get_backoff_delay", get_backoff_delay)
+
+    class Model:
+        async def completion_pages(self, pages):
+            raise ConnectionError("rate limited")
+
+        async def completion(self, image_data, **kwargs):
+            return CompletionResponse(content=image_data.decode(), input_tokens=7, output_tokens=1)
+
+    images = [f"page {index}".encode() for index in range(2)]
+
+    async def run():
+        return dict([item async for item in process_pages_as_completed(images, 4, Model(), pages_per_request=2)])
+
+    results = asyncio.run(run())
+    # One back off for the multi-page request before its pages are requested one by one, as their second attempt
+    assert delays == [(1, "rate limited")]
+    assert [(results[index].status, results[index].attempts) for index in range(2)] == [("retried", 2), ("retried", 2)]
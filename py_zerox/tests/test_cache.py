@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+import pytest
+
+from pyzerox.cache import DirectoryCache, SQLiteCache, make_cache_key
+from pyzerox.models import CompletionResponse
+
+
+def make_cache(backend, tmp_path, max_size_bytes):
+    if backend == "directory":
+        return DirectoryCache(str(tmp_path / "cache"), max_size_bytes=max_size_bytes)
+    return SQLiteCache(str(tmp_path / "cache.db"), max_size_bytes=max_size_bytes)
+
+
+@pytest.mark.parametrize("backend", ["directory", "sqlite"])
+def test_cache_roundtrip(backend, tmp_path):
+    cache = make_cache(backend, tmp_path, max_size_bytes=1024 * 1024)
+
+    async def run():
+        assert await cache.get("missing") is None
+        await cache.set("abc", CompletionResponse(content="# Page", input_tokens=10, output_tokens=2))
+        return await cache.get("abc")
+
+    cached = asyncio.run(run())
+    assert cached.content == "# Page"
+    assert cached.input_tokens == 10
+    assert cached.cache_hit
+
+
+@pytest.mark.parametrize("backend", ["directory", "sqlite"])
+def test_cache_evicts_least_recently_used(backend, tmp_path):
+    ## each entry is a little over 100 bytes, so only two fit
+    cache = make_cache(backend, tmp_path, max_size_bytes=250)
+    response = CompletionResponse(content="x" * 50, input_tokens=1, output_tokens=1)
+
+    async def run():
+        await cache.set("aa1", response)
+        await cache.set("bb2", response)
+        if backend == "directory":
+            ## file modification times may have coarse resolution
+            os.utime(os.path.join(cache.directory, "aa", "aa1.json"), (0, 0))
+            os.utime(os.path.join(cache.directory, "bb", "bb2.json"), (1, 1))
+        await cache.get("aa1")
+        await cache.set("cc3", response)
+        return [await cache.get(key) is not None for key in ("aa1", "bb2", "cc3")]
+
+    assert asyncio.run(run()) == [True, False, True]
+
+
+def test_cache_key_ignores_credentials():
+    key = make_cache_key(b"image", "gpt-4o-mini", "prompt", "", {"temperature": 0, "api_key": "a"})
+    assert key == make_cache_key(b"image", "gpt-4o-mini", "prompt", "", {"temperature": 0, "api_key": "b"})
+    assert key != make_cache_key(b"image", "gpt-4o-mini", "prompt", "", {"temperature": 1, "api_key": "a"})
+    assert key != make_cache_key(b"image", "gpt-4o-mini", "prompt", "previous page", {"temperature": 0})
+
+
+def test_replaced_entry_is_counted_once(tmp_path):
+    cache = DirectoryCache(str(tmp_path / "cache"), max_size_bytes=1024 * 1024)
+    response = CompletionResponse(content="x" * 50, input_tokens=1, output_tokens=1)
+
+    async def run():
+        await cache.set("aa1", response)
+        for _ in range(5):
+            await cache.set("bb2", response)
+
+    asyncio.run(run())
+    ## the running total matches the entries on disk, so eviction doesn't start early
+    assert cache._size_bytes == sum(size for _, size, _ in cache._list_entries())
@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import io
+
+import pdf2image
+from PIL import Image
+
+from pyzerox import zerox
+from pyzerox.core.checkpoint import JobManifest
+from pyzerox.core.types import Page
+from pyzerox.models import BaseModel, CompletionResponse
+from pyzerox.processor import pdf
+
+## the module, which the zerox function shadows as an attribute of pyzerox.core
+core_zerox = importlib.import_module("pyzerox.core.zerox")
+
+
+def test_job_manifest_resumes_completed_pages(tmp_path):
+    async def run():
+        manifest = JobManifest(str(tmp_path), "job", "doc.pdf")
+        assert await manifest.open() == {}
+        await manifest.append(0, Page(content="# One", content_length=5, page=1, input_tokens=10))
+        await manifest.append(2, Page(content="# Three", content_length=7, page=3))
+        await manifest.close()
+
+        # A line cut short by a crash is ignored
+        with open(manifest.path, "a", encoding="utf-8") as manifest_file:
+            manifest_file.write('{"index": 1, "cont')
+
+        resumed = JobManifest(str(tmp_path), "job", "doc.pdf")
+        completed_pages = await resumed.open()
+        await resumed.append(1, Page(content="# Two", content_length=5, page=2))
+        await resumed.close()
+
+        other_input = JobManifest(str(tmp_path), "job", "other.pdf")
+        other_pages = await other_input.open()
+        await other_input.close()
+        return completed_pages, other_pages
+
+    completed_pages, other_pages = asyncio.run(run())
+    assert sorted(completed_pages) == [0, 2]
+    assert completed_pages[0].input_tokens == 10
+    # The manifest of another input is started over
+    assert other_pages == {}
+
+
+def test_job_manifest_pages_after_torn_line(tmp_path):
+    async def run():
+        manifest = JobManifest(str(tmp_path), "a/b", "doc.pdf")
+        await manifest.open()
+        await manifest.append(0, Page(content="# One", content_length=5, page=1))
+        await manifest.close()
+        with open(manifest.path, "a", encoding="utf-8") as manifest_file:
+            manifest_file.write('{"index": 1')
+
+        resumed = JobManifest(str(tmp_path), "a/b", "doc.pdf")
+        await resumed.open()
+        await resumed.append(1, Page(content="# Two", content_length=5, page=2))
+        await resumed.close()
+
+        final = JobManifest(str(tmp_path), "a/b", "doc.pdf")
+        pages = await final.open()
+        await final.close()
+        return pages
+
+    assert sorted(asyncio.run(run())) == [0, 1]
+
+
+def test_resumed_job_only_renders_missing_pages(monkeypatch, tmp_path):
+    conversions = []
+
+    def convert_from_path(first_page, last_page, **kwargs):
+        conversions.append((first_page, last_page))
+        return [Image.new("L", (100, 100), page * 10) for page in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 5)
+    monkeypatch.setattr(core_zerox, "get_pdf_page_count", lambda local_path, renderer: 5)
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\n")
+
+    class Model(BaseModel):
+        failing_page = 3
+
+        def validate_access(self):
+            pass
+
+        def validate_model(self):
+            pass
+
+        async def completion(self, image_data, mime_type, **kwargs):
+            with Image.open(io.BytesIO(image_data)) as image:
+                page = image.getpixel((0, 0)) // 10
+            if page == Model.failing_page:
+                raise TimeoutError("model timed out")
+            return CompletionResponse(content=f"page {page}", input_tokens=1, output_tokens=1)
+
+    def run():
+        return asyncio.run(
+            zerox(file_path=str(pdf_path), model=Model(model="mock"), job_id="job", checkpoint_dir=str(tmp_path / "jobs"), max_page_retries=0)
+        )
+
+    assert [page.status for page in run().pages] == ["ok", "ok", "failed", "ok", "ok"]
+    conversions.clear()
+    Model.failing_page = None
+
+    output = run()
+    # Only the page that failed is rendered again
+    assert conversions == [(3, 3)]
+    assert [page.content for page in output.pages] == [f"page {page}" for page in range(1, 6)]
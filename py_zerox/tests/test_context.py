@@ -0,0 +1,19 @@
+import pytest
+
+from pyzerox.constants import MaintainFormatMode
+from pyzerox.errors import InvalidMaintainFormatMode
+from pyzerox.processor import get_context_pages
+
+
+def test_context_pages_by_mode():
+    serial = get_context_pages(MaintainFormatMode.SERIAL)
+    assert [serial(index) for index in range(3)] == [[], [0], [1]]
+
+    seed = get_context_pages(MaintainFormatMode.SEED, seed_pages=2)
+    assert [seed(index) for index in range(4)] == [[], [0], [0, 1], [0, 1]]
+
+    chunked = get_context_pages(MaintainFormatMode.CHUNKED, chunk_size=3)
+    assert [chunked(index) for index in range(8)] == [[], [0], [0], [2], [2], [2], [5], [5]]
+
+    with pytest.raises(InvalidMaintainFormatMode):
+        get_context_pages("parallel")
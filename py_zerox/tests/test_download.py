@@ -0,0 +1,62 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp import web
+
+from pyzerox.errors import FileTooLarge
+from pyzerox.processor import download_file
+
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def download(handler, tmp_path, max_size_bytes):
+    async def run():
+        runner, base_url = await serve(handler)
+        try:
+            return await download_file(f"{base_url}/report.pdf", str(tmp_path), max_size_bytes=max_size_bytes)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+async def stream_without_length(request):
+    # Chunked, so the size is only known as the body is read
+    response = web.StreamResponse()
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    for _ in range(64):
+        await response.write(b"x" * 16 * 1024)
+    await response.write_eof()
+    return response
+
+
+def test_oversized_download_is_aborted_and_removed(tmp_path):
+    with pytest.raises(FileTooLarge):
+        download(stream_without_length, tmp_path, max_size_bytes=100 * 1024)
+    assert os.listdir(tmp_path) == []
+
+
+def test_oversized_content_length_is_refused(tmp_path):
+    async def handler(request):
+        return web.Response(body=b"x" * 200 * 1024)
+
+    with pytest.raises(FileTooLarge):
+        download(handler, tmp_path, max_size_bytes=100 * 1024)
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_within_the_limit(tmp_path):
+    local_path = download(stream_without_length, tmp_path, max_size_bytes=None)
+    assert local_path == str(tmp_path / "report.pdf")
+    assert os.path.getsize(local_path) == 64 * 16 * 1024
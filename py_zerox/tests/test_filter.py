@@ -0,0 +1,70 @@
+import asyncio
+
+from PIL import Image, ImageDraw
+
+from pyzerox.constants import PageStatus
+from pyzerox.models import CompletionResponse
+from pyzerox.processor import PageClassifier, PageFilter, image_to_bytes, process_pages_as_completed
+
+
+def render_page(text: str, noise: bool = False) -> bytes:
+    page = Image.new("RGB", (800, 1000), "white")
+    draw = ImageDraw.Draw(page)
+    for line in range(20):
+        draw.text((40, 40 + line * 45), f"{text} {line}" * 6, fill="black")
+    if noise:
+        draw.point([(x, 3 * x % 1000) for x in range(0, 800, 7)], fill="gray")
+    return image_to_bytes(page, "png")
+
+
+def test_page_classifier_detects_blank_and_duplicate_pages():
+    blank_scan = Image.new("L", (800, 1000), 250)
+    ImageDraw.Draw(blank_scan).point([(x, 7 * x % 1000) for x in range(0, 800, 3)], fill=200)
+
+    classifier = PageClassifier(PageFilter())
+    assert classifier.classify(0, render_page("Instructions")) == (None, None)
+    assert classifier.classify(1, image_to_bytes(blank_scan, "png")) == (PageStatus.BLANK, None)
+    assert classifier.classify(2, render_page("Schedule A")) == (None, None)
+    # A rescan of the same sheet is a duplicate, a page with the same layout but other text is not
+    assert classifier.classify(3, render_page("Instructions", noise=True)) == (PageStatus.DUPLICATE, 0)
+    assert classifier.classify(4, render_page("Schedule B")) == (None, None)
+
+
+def test_filtered_pages_skip_the_model():
+    class Model:
+        requests = 0
+
+        async def completion(self, **kwargs):
+            Model.requests += 1
+            return CompletionResponse(content=f"page {Model.requests}", input_tokens=1, output_tokens=1)
+
+    blank_page = image_to_bytes(Image.new("RGB", (800, 1000), "white"), "png")
+    images = [render_page("Instructions"), blank_page, render_page("Instructions"), render_page("Schedule A")]
+
+    async def run():
+        return dict([item async for item in process_pages_as_completed(images, 2, Model(), page_filter=PageFilter())])
+
+    results = asyncio.run(run())
+    assert Model.requests == 2
+    assert results[1].status == PageStatus.BLANK and results[1].content == ""
+    assert results[2].status == PageStatus.DUPLICATE and results[2].duplicate_of == 0
+    assert results[2].content == results[0].content
+
+
+def test_duplicates_of_batched_pages_dont_stall():
+    class Model:
+        async def completion_pages(self, pages):
+            content = "\n".join(f"<<<PAGE {number}>>>\n# Instructions" for number in range(1, len(pages) + 1))
+            return CompletionResponse(content=content, input_tokens=1, output_tokens=1)
+
+    # Every page after the first is a duplicate of it, while the first page waits in a batch that never fills
+    page = render_page("Instructions")
+    images = [page] * 60
+
+    async def run():
+        pages = process_pages_as_completed(images, 2, Model(), page_filter=PageFilter(), pages_per_request=4)
+        return dict([item async for item in pages])
+
+    results = asyncio.run(asyncio.wait_for(run(), timeout=30))
+    assert results[0].batch_size == 1
+    assert sum(result.status == PageStatus.DUPLICATE for result in results.values()) == 59
@@ -0,0 +1,55 @@
+import asyncio
+
+from pyzerox.models import CompletionResponse
+from pyzerox.processor import HedgedCompletionResponse, HedgingPolicy, RequestHedger
+
+
+def warm_up(hedger, latency=0.01, samples=20):
+    hedger._latencies.extend([latency] * samples)
+    hedger.requests += samples
+
+
+def test_slow_request_is_hedged_and_cancelled():
+    hedger = RequestHedger(HedgingPolicy(min_delay=0.05, max_hedge_rate=0.5))
+    warm_up(hedger)
+    calls, cancelled = [], []
+
+    async def request():
+        calls.append(len(calls))
+        try:
+            # The original request hangs, the duplicate answers quickly
+            await asyncio.sleep(10 if len(calls) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return CompletionResponse(content=f"response {len(calls)}", input_tokens=100, output_tokens=10)
+
+    response = asyncio.run(asyncio.wait_for(hedger.run(request), timeout=2))
+    assert isinstance(response, HedgedCompletionResponse)
+    assert response.content == "response 2"
+    ## the cancelled request is accounted with the tokens of the winner
+    assert (response.hedge_input_tokens, response.hedge_output_tokens) == (100, 10)
+    assert cancelled == [True]
+    assert hedger.hedged_requests == 1
+
+
+def test_hedge_rate_is_capped():
+    hedger = RequestHedger(HedgingPolicy(min_delay=0.01, max_hedge_rate=0))
+    warm_up(hedger)
+    calls = []
+
+    async def request():
+        calls.append(True)
+        await asyncio.sleep(0.05)
+        return CompletionResponse(content="slow", input_tokens=1, output_tokens=1)
+
+    response = asyncio.run(hedger.run(request))
+    assert type(response) is CompletionResponse
+    assert len(calls) == 1
+
+
+def test_no_hedging_before_enough_samples():
+    hedger = RequestHedger(HedgingPolicy(min_samples=5, min_delay=0))
+    assert hedger.get_delay() is None
+    hedger._latencies.extend([0.1, 0.2, 0.3, 0.4, 2.0])
+    assert hedger.get_delay() == 2.0
@@ -0,0 +1,27 @@
+import io
+
+from PIL import Image
+
+from pyzerox.processor import ImageEncoding, encode_image
+
+
+def test_encode_image_downscales_and_tiles():
+    page = Image.new("RGB", (1000, 2000), "white")
+
+    encoded = encode_image(page, ImageEncoding("jpeg", quality=60, grayscale=True, max_pixels=500_000))
+    assert encoded.mime_type == "image/jpeg"
+    assert len(encoded.tiles) == 1
+    with Image.open(io.BytesIO(encoded.tiles[0])) as image:
+        assert image.mode == "L"
+        assert image.size[0] * image.size[1] <= 500_000
+
+    tiled = encode_image(page, ImageEncoding("webp", max_pixels=500_000, tile=True))
+    assert tiled.mime_type == "image/webp"
+    assert len(tiled.tiles) == 4
+    assert tiled.size == sum(len(tile) for tile in tiled.tiles)
+
+
+def test_image_encoding_uses_model_budget():
+    assert ImageEncoding().for_model("azure/gpt-4o-mini").max_pixels == 768 * 1024
+    assert ImageEncoding(max_pixels=1000).for_model("gpt-4o").max_pixels == 1000
+    assert ImageEncoding().for_model("some-other-model").max_pixels is None
@@ -0,0 +1,80 @@
+import asyncio
+import io
+import os
+
+from PIL import ExifTags, Image
+
+from pyzerox import zerox
+from pyzerox.constants import InputFileType, PageStatus
+from pyzerox.models import BaseModel, CompletionResponse
+from pyzerox.processor import EncodedImage, detect_file_type, iter_image_pages
+
+INPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "shared", "inputs")
+
+
+def read_pages(local_path, **kwargs):
+    async def run():
+        return [page async for page in iter_image_pages((None, 1056), local_path, "", **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_detect_file_type(tmp_path):
+    assert detect_file_type(os.path.join(INPUT_DIR, "0001.png")) == InputFileType.IMAGE
+    assert detect_file_type(os.path.join(INPUT_DIR, "0002.pdf")) == InputFileType.PDF
+    tiff_path = tmp_path / "fax.tif"
+    Image.new("1", (100, 100)).save(tiff_path)
+    assert detect_file_type(str(tiff_path)) == InputFileType.IMAGE
+
+
+def test_multi_page_tiff(tmp_path):
+    tiff_path = str(tmp_path / "fax.tif")
+    frames = [Image.new("1", (1728, 2200), color=1) for _ in range(3)]
+    frames[0].save(tiff_path, save_all=True, append_images=frames[1:], compression="group4")
+
+    pages = read_pages(tiff_path, select_pages=[3, 1])
+    assert len(pages) == 2
+    for page in pages:
+        with Image.open(io.BytesIO(page)) as image:
+            assert image.format == "PNG"
+            assert image.mode == "L"
+            assert image.height == 1056
+
+
+def test_phone_photo_is_made_upright(tmp_path):
+    # Stored landscape, shown portrait (rotated 90 degrees)
+    jpeg_path = str(tmp_path / "photo.jpg")
+    exif = Image.Exif()
+    exif[ExifTags.Base.Orientation] = 6
+    Image.new("RGB", (4032, 3024), "white").save(jpeg_path, exif=exif)
+
+    (page,) = read_pages(jpeg_path)
+    with Image.open(io.BytesIO(page)) as image:
+        assert image.size == (792, 1056)
+
+
+def test_small_image_is_sent_as_is(tmp_path):
+    png_path = str(tmp_path / "receipt.png")
+    Image.new("RGB", (400, 600), "white").save(png_path)
+    with open(png_path, "rb") as png_file:
+        original = png_file.read()
+
+    (page,) = read_pages(png_path)
+    assert page == EncodedImage(tiles=[original], mime_type="image/png")
+
+
+def test_zerox_reads_images_without_pdf_conversion():
+    class Model(BaseModel):
+        def validate_access(self):
+            pass
+
+        def validate_model(self):
+            pass
+
+        async def completion(self, image_data, mime_type, **kwargs):
+            with Image.open(io.BytesIO(image_data[0] if isinstance(image_data, list) else image_data)) as image:
+                return CompletionResponse(content=f"{mime_type} {image.height}", input_tokens=1, output_tokens=1)
+
+    output = asyncio.run(zerox(file_path=os.path.join(INPUT_DIR, "0001.png"), model=Model(model="mock")))
+    assert [page.status for page in output.pages] == [PageStatus.OK]
+    assert output.pages[0].content == "image/png 1056"
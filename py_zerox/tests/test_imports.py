@@ -0,0 +1,22 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def get_loaded_modules(statement):
+    # A fresh interpreter, as the test session has imported everything already
+    script = f"{statement}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    environment = {**os.environ, "PYTHONPATH": ROOT_DIR}
+    process = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=environment, check=True)
+    return set(json.loads(process.stdout.strip().splitlines()[-1]))
+
+
+def test_heavy_dependencies_are_imported_lazily():
+    modules = get_loaded_modules("from pyzerox import zerox, zerox_stream, zerox_batch")
+    assert not {"litellm", "aiohttp", "PyPDF2", "pdf2image", "pypdfium2"} & modules
+
+    modules = get_loaded_modules("import pyzerox")
+    assert "pyzerox.processor" not in modules
@@ -0,0 +1,89 @@
+import asyncio
+
+from pyzerox.models import CompletionResponse
+from pyzerox.processor import AdaptiveConcurrencyLimiter, FairSemaphore
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_fair_semaphore_round_robin():
+    semaphore = FairSemaphore(1)
+    large_document, small_document = semaphore.share(), semaphore.share()
+    order = []
+
+    async def run_page(share, name, release=None):
+        async with share:
+            order.append(name)
+            if release:
+                await release.wait()
+
+    async def run():
+        ## the large document holds the only slot and queues all its pages before the small one queues any
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(run_page(large_document, "large", release))]
+        tasks += [asyncio.create_task(run_page(large_document, "large")) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(run_page(small_document, "small")) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["large", "large", "small", "large", "small", "large"]
+
+
+def test_adaptive_limiter_backs_off_and_retries():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_rate_limit_retries=3)
+    calls = []
+
+    async def request():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            error = RateLimitError("slow down")
+            error.litellm_response_headers = {"retry-after": "0"}
+            raise error
+        return CompletionResponse(content="# Page", input_tokens=10, output_tokens=2)
+
+    response = asyncio.run(limiter.run(request))
+    assert response.content == "# Page"
+    assert len(calls) == 2
+    assert limiter.rate_limit_errors == 1
+    assert limiter.limit == 4
+
+
+def test_adaptive_limiter_grows_while_healthy():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+    async def request():
+        return CompletionResponse(content="", input_tokens=1, output_tokens=1)
+
+    async def run():
+        for _ in range(20):
+            await limiter.run(request)
+
+    asyncio.run(run())
+    assert limiter.limit == 3
+
+
+def test_adaptive_limiter_frees_the_slots_of_cancelled_requests():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=4)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def request():
+        return CompletionResponse(content="", input_tokens=1, output_tokens=1)
+
+    async def run():
+        # A consumer stopping early cancels the requests in flight and those waiting for a slot
+        tasks = [asyncio.create_task(limiter.run(hang)) for _ in range(6)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert limiter._in_flight == 0
+        return await asyncio.wait_for(asyncio.gather(*(limiter.run(request) for _ in range(8))), timeout=5)
+
+    assert len(asyncio.run(run())) == 8
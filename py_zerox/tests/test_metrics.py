@@ -0,0 +1,44 @@
+import asyncio
+
+from pyzerox.constants import MetricsStage
+from pyzerox.metrics import MetricsHook, MetricsRecorder, StageTimingsHook, create_recorder, timed
+from pyzerox.models import CompletionResponse
+from pyzerox.processor import process_pages_as_completed
+
+
+def test_stage_timings_and_queue_wait():
+    class Model:
+        async def completion(self, image_data, **kwargs):
+            await asyncio.sleep(0.02)
+            return CompletionResponse(content=image_data.decode(), input_tokens=1, output_tokens=1)
+
+    class FailingHook(MetricsHook):
+        def on_stage(self, stage, start_time, duration, attributes):
+            raise RuntimeError("exporter is down")
+
+    stage_timings = StageTimingsHook()
+    recorder = MetricsRecorder([FailingHook(), stage_timings])
+    images = [f"page {index}".encode() for index in range(4)]
+
+    async def run():
+        results = process_pages_as_completed(images, 1, Model(), recorder=recorder)
+        return dict([item async for item in results])
+
+    # A failing hook doesn't fail the pages
+    results = asyncio.run(run())
+    assert [results[index].content for index in range(4)] == [f"page {index}" for index in range(4)]
+
+    timings = stage_timings.timings
+    assert timings[MetricsStage.COMPLETION].count == 4
+    assert timings[MetricsStage.COMPLETION].mean >= 20
+    assert timings[MetricsStage.QUEUE_WAIT].count == 4
+    # With a single slot, the pages after the first one wait for the ones before them
+    assert max(result.queue_wait for result in results.values()) >= 40
+
+
+def test_no_hooks_no_recorder():
+    assert create_recorder(None) is None
+    assert create_recorder([]) is None
+    assert create_recorder(MetricsHook()).hooks
+    with timed(None, MetricsStage.DOWNLOAD):
+        pass
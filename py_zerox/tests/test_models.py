@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from pyzerox.errors import InvalidModelBackend, ModelAccessError
+from pyzerox.models import BaseModel, OpenAICompatibleModel, create_model, register_model_backend
+from pyzerox.processor.limiter import get_retry_after, is_rate_limit_error
+
+
+def test_openai_compatible_backend():
+    requests, peers = [], set()
+
+    async def chat_completions(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        payload = await request.json()
+        requests.append((request.headers.get("Authorization"), payload))
+        if payload.get("temperature") == 1:
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "3"})
+        return web.json_response(
+            {
+                "choices": [{"message": {"content": "# Page"}}],
+                "usage": {"prompt_tokens": 1200, "completion_tokens": 30, "prompt_tokens_details": {"cached_tokens": 1024}},
+            }
+        )
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", chat_completions)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        model = create_model(
+            "qwen2-vl",
+            "openai_compatible",
+            base_url=f"http://127.0.0.1:{port}/v1",
+            api_key="local",
+            defer_validation=True,
+            temperature=0,
+        )
+        try:
+            responses = [
+                await model.completion(image_path=None, maintain_format=False, prior_page="", image_data=b"page")
+                for _ in range(3)
+            ]
+            model.kwargs["temperature"] = 1
+            with pytest.raises(Exception) as error:
+                await model.completion(image_path=None, maintain_format=False, prior_page="", image_data=b"page")
+        finally:
+            await model.close()
+            await runner.cleanup()
+        return responses, error.value
+
+    responses, error = asyncio.run(run())
+    assert [response.content for response in responses] == ["# Page"] * 3
+    assert responses[0].cached_input_tokens == 1024
+    authorization, payload = requests[0]
+    assert authorization == "Bearer local"
+    assert payload["model"] == "qwen2-vl" and payload["temperature"] == 0
+    assert payload["messages"][-1]["content"][0]["image_url"]["url"].startswith("data:image/png;base64,")
+    # Every request went over the same pooled connection
+    assert len(peers) == 1
+    # Error responses are recognized by the limiter and the retry backoff
+    assert is_rate_limit_error(error)
+    assert get_retry_after(error) == 3
+
+
+def test_session_of_a_finished_event_loop_is_closed():
+    model = OpenAICompatibleModel(model="qwen2-vl", base_url="http://127.0.0.1:9/v1", check_access=False)
+
+    async def get_session():
+        return await model._get_session()
+
+    # Each asyncio.run is a new event loop, the session of the first one is closed when it is replaced
+    first_session = asyncio.run(get_session())
+    second_session = asyncio.run(get_session())
+    assert first_session is not second_session
+    assert first_session.closed
+    asyncio.run(model.close())
+    assert second_session.closed
+
+
+def test_unreachable_server():
+    with pytest.raises(ModelAccessError):
+        OpenAICompatibleModel(model="qwen2-vl", base_url="http://127.0.0.1:9/v1")
+
+
+def test_model_backend_registry():
+    class EchoModel(BaseModel):
+        def __init__(self, model=None, check_access=True, defer_validation=False, prompt_caching=None, **kwargs):
+            super().__init__(model=model, **kwargs)
+
+        async def completion(self, image_path, maintain_format, prior_page, image_data=None, mime_type="image/png"):
+            raise NotImplementedError
+
+        def validate_access(self):
+            pass
+
+        def validate_model(self):
+            pass
+
+    register_model_backend("echo", EchoModel)
+    assert isinstance(create_model("echo-1", "echo", check_access=False), EchoModel)
+
+    with pytest.raises(InvalidModelBackend):
+        create_model("gpt-4o-mini", "unknown")
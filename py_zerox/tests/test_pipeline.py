@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pdf2image
+import pytest
+
+from pyzerox.processor import iter_pdf_images
+from pyzerox.processor import pdf
+
+
+def iterate(**kwargs):
+    return iter_pdf_images(300, (None, 1056), "doc.pdf", "", chunk_size=4, in_memory=False, workers=1, **kwargs)
+
+
+def test_first_chunk_is_yielded_before_the_document_is_rendered(monkeypatch):
+    rest_of_document = threading.Event()
+    conversions = []
+
+    def convert_from_path(first_page, last_page, **kwargs):
+        if first_page > 1:
+            # Later chunks are only rendered once the first page has been handed out
+            assert rest_of_document.wait(timeout=5)
+        conversions.append((first_page, last_page))
+        return [f"page-{page}.png" for page in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 9)
+
+    async def run():
+        images = iterate()
+        first_image = await anext(images)
+        assert conversions == [(1, 1)]
+        rest_of_document.set()
+        return [first_image] + [image async for image in images]
+
+    try:
+        images = asyncio.run(asyncio.wait_for(run(), timeout=10))
+    finally:
+        rest_of_document.set()
+    assert images == [f"page-{page}.png" for page in range(1, 10)]
+    assert conversions == [(1, 1), (2, 5), (6, 9)]
+
+
+def test_rasterization_error_reaches_the_consumer(monkeypatch):
+    def convert_from_path(first_page, last_page, **kwargs):
+        if first_page > 1:
+            raise pdf2image.exceptions.PDFPageCountError("Unable to get page count")
+        return [f"page-{page}.png" for page in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 9)
+
+    images = []
+
+    async def run():
+        async for image in iterate():
+            images.append(image)
+
+    with pytest.raises(pdf2image.exceptions.PDFPageCountError):
+        asyncio.run(asyncio.wait_for(run(), timeout=10))
+    # Pages rendered before the error are still handed out
+    assert images == ["page-1.png"]
@@ -0,0 +1,36 @@
+import asyncio
+
+import litellm
+
+from pyzerox.models import litellmmodel
+
+
+def test_system_prompt_cache_markers(monkeypatch):
+    monkeypatch.setattr(litellm.utils, "supports_prompt_caching", lambda model: True)
+    requests = []
+
+    async def acompletion(model, messages, **kwargs):
+        requests.append(messages)
+        usage = {"prompt_tokens": 1500, "completion_tokens": 20, "cache_read_input_tokens": 1200}
+        return {"choices": [{"message": {"content": "# Page"}}], "usage": usage}
+
+    monkeypatch.setattr(litellm, "acompletion", acompletion)
+
+    claude = litellmmodel(model="anthropic/claude-sonnet-4-20250514", defer_validation=True)
+    response = asyncio.run(claude.completion(image_path=None, maintain_format=False, prior_page="", image_data=b"page"))
+    assert requests[0][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert response.cached_input_tokens == 1200
+
+    # Models that cache automatically, or with prompt caching turned off, get the plain system prompt
+    for model in (
+        litellmmodel(model="gpt-4o-mini", defer_validation=True),
+        litellmmodel(model="anthropic/claude-sonnet-4-20250514", defer_validation=True, prompt_caching=False),
+    ):
+        asyncio.run(model.completion(image_path=None, maintain_format=False, prior_page="", image_data=b"page"))
+        assert isinstance(requests[-1][0]["content"], str)
+
+
+def test_cached_tokens_from_openai_usage():
+    usage = {"prompt_tokens": 2000, "prompt_tokens_details": {"cached_tokens": 1024}}
+    assert litellmmodel._get_cached_tokens(usage) == 1024
+    assert litellmmodel._get_cached_tokens({"prompt_tokens": 10}) == 0
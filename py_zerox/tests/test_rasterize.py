@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pdf2image
+import pytest
+
+from pyzerox.errors import RasterizeWorkerError
+from pyzerox.processor import iter_pdf_images
+from pyzerox.processor import pdf
+from pyzerox.processor.rasterize import get_available_cpus, resolve_rasterize_workers
+
+
+def test_rasterize_workers_keep_page_order(monkeypatch):
+    conversions, threads = [], set()
+
+    def convert_from_path(first_page, last_page, thread_count, **kwargs):
+        # Later chunks finish first, pages must still come out in order
+        time.sleep(0.05 / first_page)
+        conversions.append((first_page, last_page, thread_count))
+        threads.add(threading.get_ident())
+        return [f"page-{page}.png" for page in range(first_page, last_page + 1)]
+
+    # Worker processes wouldn't see the patched conversion, a thread pool stands in for the process pool
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 30)
+    monkeypatch.setattr(pdf, "get_process_pool", lambda workers: pool)
+
+    async def run():
+        images = iter_pdf_images(300, (None, 1056), "doc.pdf", "", chunk_size=4, in_memory=False, workers=4)
+        return [image async for image in images]
+
+    try:
+        images = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert images == [f"page-{page}.png" for page in range(1, 31)]
+    assert sorted(conversions) == [(1, 1, 1)] + [(first, min(first + 3, 30), 1) for first in range(2, 31, 4)]
+    assert len(threads) > 1
+
+
+def test_resolve_rasterize_workers():
+    assert resolve_rasterize_workers(None) == get_available_cpus()
+    assert resolve_rasterize_workers(3) == 3
+    assert resolve_rasterize_workers(0) == 1
+
+
+def test_rasterize_worker_errors_name_rasterize_workers(monkeypatch):
+    class Pool:
+        def __init__(self, error):
+            self.error = error
+
+        def submit(self, *args, **kwargs):
+            raise self.error
+
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 4)
+    monkeypatch.setattr(pdf, "discard_process_pool", lambda workers: None)
+
+    async def run():
+        return [image async for image in iter_pdf_images(300, (None, 1056), "doc.pdf", "", chunk_size=1, workers=2)]
+
+    # What multiprocessing raises in a spawned worker that imports a script without a main guard
+    bootstrapping_error = RuntimeError("An attempt has been made to start a new process before the current process has finished its bootstrapping phase.")
+    for error, message in [(bootstrapping_error, "__main__"), (BrokenProcessPool(), "stopped unexpectedly")]:
+        monkeypatch.setattr(pdf, "get_process_pool", lambda workers: Pool(error))
+        with pytest.raises(RasterizeWorkerError, match=message) as raised:
+            asyncio.run(run())
+        assert "rasterize_workers=2" in str(raised.value)
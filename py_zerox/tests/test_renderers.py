@@ -0,0 +1,95 @@
+import asyncio
+import io
+import os
+
+import pdf2image
+import pytest
+from PIL import Image
+
+from pyzerox.constants import PDFRenderer
+from pyzerox.errors import InvalidPDFRenderer
+from pyzerox.processor import BasePDFRenderer, PdfiumRenderer, PopplerRenderer, get_pdf_page_count, get_renderer, iter_pdf_images
+from pyzerox.processor import pdf
+from pyzerox.processor.renderers import get_render_scale
+
+PDF_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "shared", "inputs", "0004.pdf")
+
+
+def test_render_scale_follows_pdf2image_size():
+    # US letter, 612 x 792 points
+    assert get_render_scale(612, 792, 300, (None, 1056)) == pytest.approx(1056 / 792)
+    assert get_render_scale(612, 792, 300, (816, None)) == pytest.approx(816 / 612)
+    assert get_render_scale(612, 792, 300, 1584) == pytest.approx(2)
+    assert get_render_scale(612, 792, 144, None) == pytest.approx(2)
+
+
+def test_get_renderer():
+    assert isinstance(get_renderer(PDFRenderer.PDFIUM), PdfiumRenderer)
+    renderer = PdfiumRenderer()
+    assert get_renderer(renderer) is renderer
+    with pytest.raises(InvalidPDFRenderer):
+        get_renderer("ghostscript")
+
+
+def test_pdfium_renders_pages(tmp_path):
+    pytest.importorskip("pypdfium2")
+    assert get_pdf_page_count(PDF_PATH, PDFRenderer.PDFIUM) == 3
+
+    async def run(in_memory):
+        images = iter_pdf_images(
+            300, (None, 1056), PDF_PATH, str(tmp_path), in_memory=in_memory, select_pages=[3, 1], renderer=PDFRenderer.PDFIUM
+        )
+        return [image async for image in images]
+
+    # Pages are rendered in memory, without poppler
+    for image_data in asyncio.run(run(in_memory=True)):
+        with Image.open(io.BytesIO(image_data)) as image:
+            assert image.format == "PNG"
+            assert image.height == 1056
+
+    image_paths = asyncio.run(run(in_memory=False))
+    assert [os.path.basename(image_path) for image_path in image_paths] == ["page-00003.png", "page-00001.png"]
+    with Image.open(image_paths[0]) as image:
+        assert image.height == 1056
+
+
+class StubRenderer(BasePDFRenderer):
+    def get_page_count(self, local_path):
+        return 3
+
+    def render(self, local_path, first_page, last_page, image_density, image_height, thread_count=1):
+        return [Image.new("L", (80, 100), page * 50) for page in range(first_page, last_page + 1)]
+
+
+def test_in_memory_pages_dont_touch_the_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 3)
+
+    async def run(in_memory):
+        images = iter_pdf_images(72, (None, 100), "doc.pdf", str(tmp_path), in_memory=in_memory, renderer=StubRenderer())
+        return [image async for image in images]
+
+    images = asyncio.run(run(in_memory=True))
+    assert os.listdir(tmp_path) == []
+    assert [Image.open(io.BytesIO(image)).getpixel((0, 0)) for image in images] == [50, 100, 150]
+
+    # Without in_memory the pages are written to the temp directory and their paths handed out
+    image_paths = asyncio.run(run(in_memory=False))
+    assert sorted(os.listdir(tmp_path)) == ["page-00001.png", "page-00002.png", "page-00003.png"]
+    assert image_paths == [str(tmp_path / name) for name in sorted(os.listdir(tmp_path))]
+
+
+def test_poppler_renders_in_memory_without_an_output_folder(monkeypatch):
+    calls = []
+
+    def convert_from_path(**kwargs):
+        calls.append(kwargs)
+        return []
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    PopplerRenderer().render("doc.pdf", 1, 2, 300, (None, 1056))
+    PopplerRenderer().render_to_files("doc.pdf", 1, 2, 300, (None, 1056), "/tmp/pages")
+
+    in_memory, to_files = calls
+    # Raw pixmaps over poppler's stdout, rather than image files in a temporary folder
+    assert "output_folder" not in in_memory and in_memory["fmt"] == "ppm" and not in_memory["use_pdftocairo"]
+    assert to_files["output_folder"] == "/tmp/pages" and to_files["paths_only"]
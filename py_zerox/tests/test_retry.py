@@ -0,0 +1,92 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from pyzerox import zerox
+from pyzerox.constants import PageStatus
+from pyzerox.models import BaseModel, CompletionResponse
+from pyzerox.processor import pdf, process_page, process_pages_as_completed
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(pdf, "get_backoff_delay", lambda attempt, error=None: 0)
+
+
+class FlakyModel:
+    """Fails the first `failures[page]` completions of each page, pages being the image bytes."""
+
+    def __init__(self, failures):
+        self.failures = dict(failures)
+        self.calls = []
+
+    async def completion(self, image_data, **kwargs):
+        self.calls.append(image_data)
+        if self.failures.get(image_data, 0) > 0:
+            self.failures[image_data] -= 1
+            raise ConnectionError("connection reset")
+        return CompletionResponse(content=image_data.decode(), input_tokens=5, output_tokens=1)
+
+
+def test_page_is_retried_after_a_transient_error():
+    model = FlakyModel({b"page": 1})
+    result = asyncio.run(process_page(b"page", model, max_retries=2))
+    assert result.status == PageStatus.RETRIED
+    assert result.attempts == 2
+    assert result.content == "page"
+
+
+def test_page_fails_once_retries_run_out():
+    model = FlakyModel({b"page": 10})
+    result = asyncio.run(process_page(b"page", model, max_retries=2))
+    assert result.status == PageStatus.FAILED
+    assert result.attempts == 3
+    assert result.error == "connection reset"
+    assert len(model.calls) == 3
+
+
+def test_failed_page_is_requeued_once():
+    # The second page fails all its attempts, then succeeds when it is re-queued at the end of the batch
+    model = FlakyModel({b"page 1": 3})
+    images = [f"page {index}".encode() for index in range(3)]
+
+    async def run():
+        return [item async for item in process_pages_as_completed(images, 2, model, max_retries=2)]
+
+    results = asyncio.run(run())
+    assert [index for index, _ in results][-1] == 1
+    result = dict(results)[1]
+    assert result.status == PageStatus.RETRIED
+    assert result.attempts == 4
+    assert model.calls.count(b"page 1") == 4
+
+
+def test_failed_page_keeps_its_place(tmp_path):
+    # A three page TIFF, white, grey and black, where the grey page never succeeds
+    tiff_path = str(tmp_path / "scan.tif")
+    frames = [Image.new("L", (200, 300), color=color) for color in (255, 128, 0)]
+    frames[0].save(tiff_path, save_all=True, append_images=frames[1:])
+
+    class Model(BaseModel):
+        def validate_access(self):
+            pass
+
+        def validate_model(self):
+            pass
+
+        async def completion(self, image_data, mime_type, **kwargs):
+            with Image.open(io.BytesIO(image_data[0] if isinstance(image_data, list) else image_data)) as image:
+                color = image.convert("L").getpixel((0, 0))
+            if 64 < color < 192:
+                raise TimeoutError("model timed out")
+            return CompletionResponse(content=f"color {color}", input_tokens=1, output_tokens=1)
+
+    output = asyncio.run(zerox(file_path=tiff_path, model=Model(model="mock"), max_page_retries=1))
+    assert [page.page for page in output.pages] == [1, 2, 3]
+    assert [page.status for page in output.pages] == [PageStatus.OK, PageStatus.FAILED, PageStatus.OK]
+    # The first attempt and one retry, twice over with the re-queue
+    assert output.pages[1].attempts == 4
+    assert output.pages[1].error == "model timed out"
+    assert output.pages[1].content == ""
@@ -0,0 +1,36 @@
+import asyncio
+
+import pdf2image
+import pytest
+
+from pyzerox.errors import PageNumberOutOfBoundError
+from pyzerox.processor import get_page_runs, iter_pdf_images
+from pyzerox.processor import pdf
+
+
+def test_get_page_runs():
+    assert get_page_runs([1, 2, 3, 7, 9, 10]) == [(1, 3), (7, 7), (9, 10)]
+    assert get_page_runs([]) == []
+
+
+def test_select_pages_renders_page_ranges(monkeypatch):
+    conversions = []
+
+    def convert_from_path(first_page, last_page, **kwargs):
+        conversions.append((first_page, last_page))
+        return [f"page-{page}.png" for page in range(first_page, last_page + 1)]
+
+    monkeypatch.setattr(pdf2image, "convert_from_path", convert_from_path)
+    monkeypatch.setattr(pdf, "get_pdf_page_count", lambda local_path, renderer: 2000)
+
+    async def run(select_pages):
+        images = iter_pdf_images(300, (None, 1056), "doc.pdf", "", chunk_size=4, in_memory=False, select_pages=select_pages)
+        return [image async for image in images]
+
+    images = asyncio.run(run([5, 6, 7, 8, 9, 1999]))
+    assert images == ["page-5.png", "page-6.png", "page-7.png", "page-8.png", "page-9.png", "page-1999.png"]
+    # The first chunk is a single page, consecutive pages of a chunk are rendered together
+    assert conversions == [(5, 5), (6, 9), (1999, 1999)]
+
+    with pytest.raises(PageNumberOutOfBoundError):
+        asyncio.run(run([1, 2001]))
@@ -0,0 +1,85 @@
+import asyncio
+import io
+
+from PIL import Image
+
+from pyzerox import zerox_stream
+from pyzerox.models import BaseModel, CompletionResponse
+from pyzerox.processor import process_pages_as_completed
+
+
+class Model(BaseModel):
+    """Answers with the grey level of the page, darker pages answering sooner."""
+
+    def validate_access(self):
+        pass
+
+    def validate_model(self):
+        pass
+
+    async def completion(self, image_data, mime_type, **kwargs):
+        with Image.open(io.BytesIO(image_data[0] if isinstance(image_data, list) else image_data)) as image:
+            color = image.convert("L").getpixel((0, 0))
+        await asyncio.sleep(color / 1000)
+        return CompletionResponse(content=f"color {color}", input_tokens=1, output_tokens=1)
+
+
+def write_tiff(tmp_path, colors):
+    tiff_path = str(tmp_path / "scan.tif")
+    frames = [Image.new("L", (200, 300), color=color) for color in colors]
+    frames[0].save(tiff_path, save_all=True, append_images=frames[1:])
+    return tiff_path
+
+
+def stream(file_path, **kwargs):
+    async def run():
+        return [page async for page in zerox_stream(file_path=file_path, model=Model(model="mock"), **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_pages_are_streamed_in_page_or_completion_order(tmp_path):
+    tiff_path = write_tiff(tmp_path, [240, 160, 80, 0])
+    assert [page.page for page in stream(tiff_path)] == [1, 2, 3, 4]
+    assert [page.page for page in stream(tiff_path, ordered=False)] == [4, 3, 2, 1]
+
+
+def test_markdown_is_written_as_pages_are_yielded(tmp_path):
+    tiff_path = write_tiff(tmp_path, [0, 100, 200])
+    output_dir = tmp_path / "output"
+
+    async def run():
+        written = []
+        async for page in zerox_stream(file_path=tiff_path, model=Model(model="mock"), output_dir=str(output_dir)):
+            written.append((output_dir / "scan.md").read_text())
+        return written
+
+    written = asyncio.run(run())
+    assert written == ["color 0", "color 0\n\ncolor 100", "color 0\n\ncolor 100\n\ncolor 200"]
+
+
+def test_pages_in_flight_are_stopped_when_the_consumer_stops():
+    started, cancelled = asyncio.Event(), []
+
+    class SlowModel:
+        async def completion(self, image_data, **kwargs):
+            if image_data == b"first":
+                # The first page is done once the others are waiting on the model
+                await started.wait()
+                return CompletionResponse(content="first", input_tokens=1, output_tokens=1)
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(image_data)
+                raise
+
+    async def run():
+        results = process_pages_as_completed([b"first", b"second", b"third"], 3, SlowModel())
+        first_page = await anext(results)
+        await results.aclose()
+        # The slow pages were cancelled, and had stopped by the time the stream was closed
+        assert sorted(cancelled) == [b"second", b"third"]
+        return first_page
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5))[0] == 0
@@ -0,0 +1,45 @@
+import io
+
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from pyzerox.processor import extract_text_layer
+
+
+def make_page(lines, drawing: bytes = b""):
+    writer = PdfWriter()
+    page = PageObject.create_blank_page(width=612, height=792)
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)})
+    })
+    text = b"".join(b"BT /F1 10 Tf 40 %d Td (%s) Tj ET\n" % (740 - 14 * row, line.encode()) for row, line in enumerate(lines))
+    contents = DecodedStreamObject()
+    contents.set_data(text + drawing)
+    page[NameObject("/Contents")] = writer._add_object(contents)
+    writer.add_page(page)
+
+    with io.BytesIO() as buffer:
+        writer.write(buffer)
+        reader = PdfReader(io.BytesIO(buffer.getvalue()))
+    return reader.pages[0], reader
+
+
+def test_text_layer_of_born_digital_pages():
+    paragraph = ["Born digital filings carry a clean text layer with every word of the page."] * 6
+
+    page, reader = make_page(paragraph)
+    text = extract_text_layer(page, reader)
+    assert text is not None and text.startswith("Born digital filings")
+
+    # Tables and charts draw many ruled lines, their layout would be lost
+    table, reader = make_page(paragraph, b"".join(b"40 %d 500 12 re S\n" % (400 - 12 * row) for row in range(20)))
+    assert extract_text_layer(table, reader) is None
+
+    # Too little text, e.g. a cover page, a chart or a scan
+    cover, reader = make_page(["Annual Report"])
+    assert extract_text_layer(cover, reader) is None
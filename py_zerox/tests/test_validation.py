@@ -0,0 +1,24 @@
+from pyzerox.models import litellmmodel
+
+
+def test_validation_is_cached_per_credentials(monkeypatch):
+    calls = []
+    monkeypatch.setattr(litellmmodel, "validate_environment", lambda self: calls.append("environment"))
+    monkeypatch.setattr(litellmmodel, "validate_model", lambda self: calls.append("model"))
+    monkeypatch.setattr(litellmmodel, "validate_access", lambda self: calls.append("access"))
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-validation-1")
+
+    litellmmodel(model="gpt-4o-mini")
+    litellmmodel(model="gpt-4o-mini")
+    assert calls == ["environment", "model", "access"]
+
+    # Other credentials are validated again
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-validation-2")
+    litellmmodel(model="gpt-4o-mini")
+    assert len(calls) == 6
+
+    # The access check can be skipped, and validation deferred until validate() is called
+    model = litellmmodel(model="gpt-4o", check_access=False, defer_validation=True)
+    assert len(calls) == 6
+    model.validate()
+    assert calls[6:] == ["environment", "model"]